@@ -24,11 +24,21 @@ if SYSTEM_MODE != "FIELD_ONLY":
 # IMPORTS
 # ============================================================
 
+import heapq
 import math
+import os
 import random
+import threading
 import time
 import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as JobTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import numpy as np  # vector engine only
+except ImportError:
+    np = None
 
 # ============================================================
 # 🧬 GLYPH TABLE (COMPRESSED WEIGHT CARRIERS)
@@ -89,6 +99,7 @@ class KuhulAgent:
         self.energy = 1.0
         self.neighbors = set()
         self.memory = []
+        self.on_signal = None  # active scheduling hook, set by KuhulCluster.run_active
 
     def weight(self):
         """Calculate agent weight from glyph table."""
@@ -96,6 +107,8 @@ class KuhulAgent:
 
     def perceive(self, signal):
         """Receive and process incoming signal."""
+        if self.on_signal is not None:
+            self.on_signal(self)
         self.activation += signal.get("strength", 0) * self.weight()
         self.energy -= 0.01
         self.memory.append(signal)
@@ -186,6 +199,275 @@ class InvariantAgent(KuhulAgent):
         else:
             super().perceive(signal)
 
+# ============================================================
+# 🕸️ TOPOLOGY (SPARSE ADJACENCY)
+# ============================================================
+
+TOPOLOGIES = ("full", "ring", "knn", "small_world", "hub")
+
+
+class Neighbors:
+    """
+    Read-only view of one agent's row in the cluster adjacency (CSR).
+    Iterates neighbor agents straight from the shared index array.
+    """
+
+    __slots__ = ("agents", "targets", "lo", "hi")
+
+    def __init__(self, agents, targets, lo, hi):
+        self.agents = agents
+        self.targets = targets
+        self.lo = lo
+        self.hi = hi
+
+    def __iter__(self):
+        agents = self.agents
+        for j in self.targets[self.lo:self.hi]:
+            yield agents[j]
+
+    def __len__(self):
+        return self.hi - self.lo
+
+    def __contains__(self, agent):
+        return any(n is agent for n in self)
+
+
+def full_adjacency(n):
+    """Full mesh as CSR (offsets, targets) without building an edge list."""
+    offsets = array("i", (i * (n - 1) for i in range(n + 1))) if n > 1 else array("i", [0] * (n + 1))
+    targets = array("i")
+    for i in range(n):
+        targets.extend(range(i))
+        targets.extend(range(i + 1, n))
+    return offsets, targets
+
+
+def build_adjacency(n, edges):
+    """
+    Undirected edge pairs -> CSR (offsets, targets) as compact int arrays.
+    Self loops and duplicate edges are dropped; every row is in ascending order.
+    """
+    pairs = set()
+    for i, j in edges:
+        if i != j:
+            pairs.add((i, j) if i < j else (j, i))
+    offsets = array("i", [0]) * (n + 1)
+    for i, j in pairs:
+        offsets[i + 1] += 1
+        offsets[j + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    targets = array("i", [0]) * offsets[n]
+    fill = offsets[:n]
+    for i, j in sorted(pairs):
+        targets[fill[i]] = j
+        fill[i] += 1
+        targets[fill[j]] = i
+        fill[j] += 1
+    return offsets, targets
+
+
+def ring_edges(nodes, k):
+    """Ring lattice over `nodes`: each linked to k // 2 successors (degree k)."""
+    n = len(nodes)
+    for pos in range(n):
+        for d in range(1, min(max(1, k // 2), n - 1) + 1):
+            yield nodes[pos], nodes[(pos + d) % n]
+
+
+def knn_edges(weights, k):
+    """Each node linked to its k nearest by glyph weight (two-pointer walk over the sorted weights)."""
+    n = len(weights)
+    order = sorted(range(n), key=lambda i: (weights[i], i))
+    w = [weights[i] for i in order]
+    for pos, i in enumerate(order):
+        lo, hi = pos - 1, pos + 1
+        for _ in range(min(k, n - 1)):
+            if hi >= n or (lo >= 0 and w[pos] - w[lo] <= w[hi] - w[pos]):
+                yield i, order[lo]
+                lo -= 1
+            else:
+                yield i, order[hi]
+                hi += 1
+
+
+def small_world_edges(n, k, p, seed):
+    """Watts–Strogatz: ring lattice, each edge rewired with probability p (seeded)."""
+    rng = random.Random(seed)
+    for i, j in ring_edges(range(n), k):
+        if n > 2 and rng.random() < p:
+            j = rng.randrange(n - 1)
+            j += j >= i  # any node but i
+        yield i, j
+
+
+def hub_edges(agents, k):
+    """Pattern agents on a ring; every event / invariant agent is a hub linked to all agents."""
+    hubs = [i for i, a in enumerate(agents) if a.role in ("event", "invariant")]
+    spokes = [i for i, a in enumerate(agents) if a.role not in ("event", "invariant")]
+    yield from ring_edges(spokes, k)
+    for h in hubs:
+        for j in range(len(agents)):
+            yield h, j
+
+# ============================================================
+# ⚡ VECTOR FIELD ENGINE (ARRAYS OVER THE ADJACENCY)
+# ============================================================
+
+ENGINES = ("object", "vector")
+
+
+class FieldEngine:
+    """
+    Array engine for a linked cluster, same results as the object engine.
+    Activation, energy and glyph weights are numpy vectors. Agents still take
+    their turns in order, so each decides on every update made earlier in the
+    tick, but an emission lands on the sender's whole CSR row as one array op.
+    The row is only split where an invariant rejects the signal: its -10 block
+    goes out at that point, exactly as InvariantAgent.perceive sends it.
+    Invariant rules see the same signal dicts as on the object engine.
+    Signal memory is not kept.
+    """
+
+    def __init__(self, cluster):
+        if np is None:
+            raise RuntimeError("vector engine needs numpy")
+        agents = cluster.order
+        for a in agents:
+            if type(a) not in (KuhulAgent, EventAgent, InvariantAgent):
+                raise ValueError(f"vector engine cannot run agent type: {type(a).__name__}")
+        self.agents = agents
+        self.n = len(agents)
+        self.indptr = cluster.offsets.tolist()
+        self.src = np.frombuffer(cluster.targets, dtype=np.int32).astype(np.intp)
+        self.weight = np.array([a.weight() for a in agents], dtype=np.float64)
+        self.is_event = [type(a) is EventAgent for a in agents]
+
+        # per sender row: link entries into invariants, whose rule sees each signal
+        guarded = np.array([type(a) is InvariantAgent for a in agents], dtype=bool)
+        hits = np.flatnonzero(guarded[self.src])
+        rows = np.searchsorted(np.asarray(self.indptr), hits, side="right") - 1
+        self.checks = {}
+        for i, e in zip(rows.tolist(), hits.tolist()):
+            self.checks.setdefault(i, []).append(e)
+        self.load()
+
+    def load(self):
+        """Read activation / energy from the agent objects."""
+        self.activation = np.array([a.activation for a in self.agents], dtype=np.float64)
+        self.energy = np.array([a.energy for a in self.agents], dtype=np.float64)
+
+    def store(self):
+        """Write activation / energy back to the agent objects."""
+        for a, act, en in zip(self.agents, self.activation.tolist(), self.energy.tolist()):
+            a.activation = act
+            a.energy = en
+
+    def signal(self, i):
+        """The signal agent i emits (KuhulAgent.emit / EventAgent.emit)."""
+        a = self.agents[i]
+        if self.is_event[i]:
+            return {
+                "type": "event",
+                "entity": a.event["entity"],
+                "key": a.event["key"],
+                "value": a.event["value"],
+                "strength": 10.0,
+                "confidence": 1.0
+            }
+        return {
+            "from": a.id,
+            "role": a.role,
+            "strength": self.activation.item(i),
+            "glyphs": a.glyphs,
+            "time": time.time()
+        }
+
+    def step(self):
+        """One tick: every agent decides / acts in turn (KuhulAgent.tick)."""
+        act = self.activation
+        energy = self.energy
+        for i in range(self.n):
+            a = act.item(i)
+            if a > 1.0 or not energy.item(i) < 0.2:
+                self.deliver(i, None, 10.0 if self.is_event[i] else a)
+                act[i] *= 0.6
+            else:
+                energy[i] += 0.05
+
+    def deliver(self, i, signal, strength):
+        """Send agent i's signal (built on demand) to its neighbors in row order."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        checks = self.checks.get(i, ())
+        if checks and signal is None:
+            signal = self.signal(i)  # built before anyone perceives, as emit() does
+        for e in checks:
+            j = int(self.src[e])
+            if self.agents[j].rule(signal):
+                continue
+            self.perceive(lo, e, strength)
+            self.deliver(j, {"type": "invariant_violation", "strength": -10.0}, -10.0)
+            lo = e + 1
+        self.perceive(lo, hi, strength)
+
+    def perceive(self, lo, hi, strength):
+        """Link entries lo:hi perceive one signal (each receiver appears once)."""
+        if lo < hi:
+            rows = self.src[lo:hi]
+            self.activation[rows] += strength * self.weight[rows]
+            self.energy[rows] -= 0.01
+
+    def run(self, ticks, watch=None):
+        """Step up to `ticks` times; stops early once `watch` reports convergence. -> ticks run."""
+        with np.errstate(invalid="ignore", over="ignore"):
+            for t in range(ticks):
+                self.step()
+                if watch is not None and watch.update(self.total()):
+                    return t + 1
+        return ticks
+
+    def total(self):
+        """Activation sum in agent order (as the object engine adds it up)."""
+        return sum(self.activation.tolist())
+
+# ============================================================
+# ⏱️ SCHEDULING + CONVERGENCE
+# ============================================================
+
+SCHEDULES = ("all", "active")
+
+
+class Convergence:
+    """
+    Early-exit criterion: confidence (as collapse() computes it) moved by
+    less than epsilon for `patience` consecutive ticks.
+    """
+
+    def __init__(self, epsilon, patience, agents):
+        self.epsilon = float(epsilon)
+        self.patience = max(1, int(patience))
+        self.agents = max(agents, 1)
+        self.last = None
+        self.quiet = 0
+
+    def update(self, total):
+        conf = math.tanh(total / self.agents)
+        last = self.last
+        self.last = conf
+        if last is None:
+            return False
+        same = (conf != conf and last != last) or abs(conf - last) < self.epsilon  # nan stays nan
+        self.quiet = self.quiet + 1 if same else 0
+        return self.quiet >= self.patience
+
+
+def recover(agent, skipped):
+    """Replay `skipped` idle turns: energy += 0.05 while below the 0.2 idle threshold."""
+    for _ in range(skipped):
+        if agent.energy >= 0.2:
+            break
+        agent.energy += 0.05
+
 # ============================================================
 # 🌐 CLUSTER BRAIN (NO CENTRAL MODEL)
 # ============================================================
@@ -199,6 +481,12 @@ class KuhulCluster:
     def __init__(self):
         self.agents = {}
         self.clock = 0
+        self.topology = None
+        self.order = []
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        self.engine = None
+        self.converged = False
 
     def spawn_patterns(self, tokens):
         """Spawn pattern agents from π tokens."""
@@ -216,29 +504,172 @@ class KuhulCluster:
         a = InvariantAgent(f"inv_{len(self.agents)}", rule)
         self.agents[a.id] = a
 
-    def link(self):
-        """Create full mesh connectivity between all agents."""
+    def link(self, topology="full", k=4, p=0.1, seed=0):
+        """
+        Connect agents, stored as CSR adjacency (offsets / targets int arrays).
+        full: every pair (O(n²) edges) · ring: k // 2 successors each side ·
+        knn: k nearest by glyph weight · small_world: ring rewired with probability p ·
+        hub: patterns on a ring, event / invariant agents linked to everyone.
+        """
         agents = list(self.agents.values())
-        for a in agents:
-            a.neighbors.clear()
-        for i in range(len(agents)):
-            for j in range(i + 1, len(agents)):
-                agents[i].neighbors.add(agents[j])
-                agents[j].neighbors.add(agents[i])
-
-    def run(self, ticks=50):
-        """Run cluster for specified number of ticks."""
+        n = len(agents)
+        if topology == "full":
+            offsets, targets = full_adjacency(n)
+        elif topology == "ring":
+            offsets, targets = build_adjacency(n, ring_edges(range(n), k))
+        elif topology == "knn":
+            offsets, targets = build_adjacency(n, knn_edges([a.weight() for a in agents], k))
+        elif topology == "small_world":
+            offsets, targets = build_adjacency(n, small_world_edges(n, k, p, seed))
+        elif topology == "hub":
+            offsets, targets = build_adjacency(n, hub_edges(agents, k))
+        else:
+            raise ValueError(f"unknown topology: {topology!r}")
+        self.topology = topology
+        self.order = agents
+        self.offsets = offsets
+        self.targets = targets
+        self.engine = None
+        for i, a in enumerate(agents):
+            a.neighbors = Neighbors(agents, targets, offsets[i], offsets[i + 1])
+
+    def edges(self):
+        """Undirected link count."""
+        return len(self.targets) // 2
+
+    def run(self, ticks=50, engine="object", schedule="all", epsilon=None, patience=5):
+        """
+        Run cluster for up to `ticks` ticks.
+        engine="object" ticks agents in turn; engine="vector" runs the linked
+        cluster as arrays (FieldEngine) and writes the state back.
+        schedule="active" (object engine) only ticks agents with something to do.
+        epsilon: stop once confidence moved less than epsilon for `patience`
+        ticks in a row; collapse() reports the ticks actually run.
+        """
+        if schedule not in SCHEDULES:
+            raise ValueError(f"unknown schedule: {schedule!r}")
+        watch = Convergence(epsilon, patience, len(self.agents)) if epsilon is not None else None
+        self.converged = False
+        if engine == "vector":
+            if len(self.order) != len(self.agents):
+                raise ValueError("link() the cluster before a vector run")
+            if self.engine is None:
+                self.engine = FieldEngine(self)
+            else:
+                self.engine.load()
+            used = self.engine.run(ticks, watch)
+            self.engine.store()
+            self.clock += used
+            self.converged = used < ticks
+            return
+        if engine != "object":
+            raise ValueError(f"unknown engine: {engine!r}")
+        self.engine = None
+        if schedule == "active":
+            self.run_active(ticks, watch)
+            return
         for _ in range(ticks):
             for a in self.agents.values():
                 a.tick()
             self.clock += 1
+            if watch is not None and watch.update(sum(a.activation for a in self.agents.values())):
+                self.converged = True
+                return
+
+    def run_active(self, ticks, watch=None):
+        """
+        Active-set object run, same result as schedule="all".
+        Idle agents (activation <= 1, energy < 0.2) can only regain energy, so
+        they sleep until the tick their energy recovers; a perceived signal
+        wakes them early, with the missed idle turns replayed first.
+        Every other agent takes its turn as usual, in agent order.
+        """
+        agents = list(self.agents.values())
+        n = len(agents)
+        index = {id(a): i for i, a in enumerate(agents)}
+        seen = [-1] * n  # last tick each agent's turn was accounted for
+        asleep = [False] * n
+        wake_tick = [0] * n
+        wake_at = {}  # tick -> agents due to wake
+        current = list(range(n))  # this tick's turns, ascending
+        ahead = []  # heap: agents woken mid-tick whose turn is still ahead
+        after = []  # next tick's turns
+        turn = [0, -1]  # tick, agent whose turn it is
+
+        def on_signal(a):
+            j = index[id(a)]
+            if not asleep[j]:
+                return
+            t, i = turn
+            asleep[j] = False
+            passed = j < i  # its turn this tick is already over
+            recover(a, t - seen[j] - 1 + passed)
+            seen[j] = t if passed else t - 1
+            if passed:
+                after.append(j)
+            else:
+                heapq.heappush(ahead, j)
+
+        for a in agents:
+            a.on_signal = on_signal
+        done = 0
+        try:
+            for t in range(ticks):
+                turn[0] = t
+                for j in wake_at.pop(t, ()):
+                    if asleep[j] and wake_tick[j] == t:
+                        asleep[j] = False
+                        current.append(j)
+                current.sort()
+                p, m = 0, len(current)
+                while True:
+                    if ahead and (p == m or ahead[0] < current[p]):
+                        i = heapq.heappop(ahead)
+                    elif p < m:
+                        i = current[p]
+                        p += 1
+                    else:
+                        break
+                    turn[1] = i
+                    a = agents[i]
+                    if seen[i] < t - 1:
+                        recover(a, t - seen[i] - 1)
+                    seen[i] = t
+                    a.tick()
+                    if a.activation > 1.0 or a.energy >= 0.2:
+                        after.append(i)
+                        continue
+                    # idle from here: sleep until energy is back to 0.2
+                    k, e = 0, a.energy
+                    while e < 0.2:
+                        e += 0.05
+                        k += 1
+                    asleep[i] = True
+                    wake_tick[i] = t + k + 1
+                    wake_at.setdefault(t + k + 1, []).append(i)
+                turn[1] = n
+                current[:] = after
+                after.clear()
+                done = t + 1
+                self.clock += 1
+                if watch is not None and watch.update(sum(a.activation for a in agents)):
+                    self.converged = True
+                    break
+        finally:
+            for i, a in enumerate(agents):
+                a.on_signal = None
+                if asleep[i]:
+                    recover(a, done - 1 - seen[i])
 
     def collapse(self):
         """
         Collapse field to answer.
         Answer = aggregated events, confidence = normalized activation.
         """
-        total = sum(a.activation for a in self.agents.values())
+        if self.engine is not None and self.engine.n == len(self.agents):
+            total = self.engine.total()
+        else:
+            total = sum(a.activation for a in self.agents.values())
         events = [a.event for a in self.agents.values() if a.role == "event"]
 
         return {
@@ -248,25 +679,161 @@ class KuhulCluster:
             ) if events else "No grounded events",
             "confidence": math.tanh(total / max(len(self.agents), 1)),
             "agents": len(self.agents),
-            "ticks": self.clock
+            "ticks": self.clock,
+            "converged": self.converged
         }
 
     def reset(self):
         """Reset cluster for new query."""
         self.agents = {}
         self.clock = 0
+        self.topology = None
+        self.order = []
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        self.engine = None
+        self.converged = False
 
 # ============================================================
 # 🌍 π CLUSTER API (BROWSER / GHOST READY)
 # ============================================================
 
+# Request limits: every admitted run finishes well inside request_timeout
+MAX_STEPS = 1024   # pattern agents
+MAX_EVENTS = 1024  # event agents
+MAX_TICKS = 1000
+MAX_K = 64
+MAX_WORK = 10_000_000  # signal deliveries per run (~1.5 µs each on the object engine)
+
+def no_perpetual_motion(signal):
+    """Default invariant rule (anti-hallucination)."""
+    return signal.get("entity") != "perpetual_motion"
+
+def _bounded(data, key, default, lo, hi):
+    value = data.get(key, default)
+    if type(value) is not int or not lo <= value <= hi:
+        raise ValueError(f"{key} must be an integer in [{lo}, {hi}]: {value!r}")
+    return value
+
+def _choice(data, key, default, options):
+    value = data.get(key, default)
+    if type(value) is not str or value not in options:
+        raise ValueError(f"unknown {key}: {value!r}")
+    return value
+
+def links_per_tick(topology, agents, hubs, k):
+    """
+    Upper bound on signal deliveries in one tick: every directed link, plus
+    one invariant block broadcast (only one event entity can be rejected).
+    full: agents² · sparse: edges from the topology's degree.
+    """
+    n = agents
+    ring = 2 * max(1, k // 2)
+    if topology == "full":
+        links = n * (n - 1)
+    elif topology in ("ring", "small_world"):
+        links = n * ring
+    elif topology == "knn":
+        links = n * 2 * k
+    else:  # hub
+        links = (n - hubs) * ring + hubs * 2 * n
+    return min(links, n * (n - 1)) + n
+
+def check_request(data):
+    """
+    Reject malformed or oversized requests (ValueError -> HTTP 400)
+    before they take a worker slot.
+    Total work (signal deliveries over all ticks) is capped at MAX_WORK, so a
+    started run, which cannot be cancelled, still ends well inside the timeout.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("request body must be a JSON object")
+    if not isinstance(data.get("query", ""), str):
+        raise ValueError("query must be a string")
+    events = data.get("events", [])
+    if not isinstance(events, list) or len(events) > MAX_EVENTS:
+        raise ValueError(f"events must be a list of at most {MAX_EVENTS} items")
+    for e in events:
+        if not isinstance(e, dict) or not all(key in e for key in ("entity", "key", "value")):
+            raise ValueError(f"each event must be an object with entity, key and value: {e!r}")
+    steps = _bounded(data, "steps", 24, 0, MAX_STEPS)
+    ticks = _bounded(data, "ticks", 50, 0, MAX_TICKS)
+    k = _bounded(data, "k", 4, 1, MAX_K)
+    _bounded(data, "patience", 5, 1, MAX_TICKS)
+    for key in ("p", "epsilon"):
+        value = data.get(key)
+        if value is not None and (type(value) not in (int, float) or not math.isfinite(value)):
+            raise ValueError(f"{key} must be a finite number: {value!r}")
+    seed = data.get("seed", 0)
+    if seed is not None and type(seed) not in (int, str):
+        raise ValueError(f"seed must be an integer, a string or null: {seed!r}")
+    topology = _choice(data, "topology", "full", TOPOLOGIES)
+    _choice(data, "engine", "object", ENGINES)
+    _choice(data, "schedule", "all", SCHEDULES)
+
+    hubs = len({f"e_{e['entity']}" for e in events}) + 1  # event agents are keyed by entity
+    work = links_per_tick(topology, steps + hubs, hubs, k) * ticks
+    if work > MAX_WORK:
+        raise ValueError(f"request too large: {work} signal deliveries (limit {MAX_WORK}); "
+                         "lower steps, ticks or k, or use a sparse topology")
+
+
+def infer(data):
+    """
+    One inference request on its own cluster.
+    Runs on the server's worker pool, so nothing here is shared between requests.
+    Raises ValueError for client errors (limits, unknown topology/engine/schedule).
+    """
+    check_request(data)
+    query = data.get("query", "")
+    tokens = pi_emit(query, steps=data.get("steps", 24))
+    cluster = KuhulCluster()
+
+    # Spawn pattern agents from tokens
+    cluster.spawn_patterns(tokens)
+
+    # Spawn event agents for grounded facts
+    for e in data.get("events", []):
+        cluster.spawn_event(e)
+
+    # Spawn default invariant (anti-hallucination)
+    cluster.spawn_invariant(no_perpetual_motion)
+
+    # Link agents (full mesh unless a sparse topology is requested)
+    cluster.link(
+        topology=data.get("topology", "full"),
+        k=data.get("k", 4),
+        p=data.get("p", 0.1),
+        seed=data.get("seed", 0)
+    )
+
+    # Run cluster cognition
+    cluster.run(
+        ticks=data.get("ticks", 50),
+        engine=data.get("engine", "object"),
+        schedule=data.get("schedule", "all"),
+        epsilon=data.get("epsilon"),
+        patience=data.get("patience", 5)
+    )
+
+    # Collapse to answer
+    result = cluster.collapse()
+    result["tokens"] = tokens
+    result["query"] = query
+    return result
+
+
 class PiClusterAPI(BaseHTTPRequestHandler):
     """
     HTTP API for K'UHUL π cluster inference.
     Browser-callable, Ghost-compatible.
+    HTTP/1.1 keep-alive; cluster runs go to the server's worker pool, so
+    health checks and other clients are answered while a query runs.
+    "engine" selects the cluster engine (same answer from both).
     """
 
-    cluster = KuhulCluster()
+    protocol_version = "HTTP/1.1"
+    timeout = 30  # idle keep-alive connections are closed after this many seconds
 
     def log_message(self, format, *args):
         """Custom log format."""
@@ -278,71 +845,132 @@ class PiClusterAPI(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "POST, GET, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
     def do_GET(self):
-        """Health check endpoint."""
+        """Health check endpoint (never waits on the worker pool)."""
         self.respond({
             "status": "active",
             "runtime": "K'UHUL π MERGED FIELD CLUSTER",
             "version": "1.0.0",
             "mode": SYSTEM_MODE,
-            "glyphs": list(GLYPH_TABLE.keys())
+            "glyphs": list(GLYPH_TABLE.keys()),
+            "workers": self.server.workers,
+            "inflight": self.server.inflight,
+            "capacity": self.server.capacity
         })
 
     def do_POST(self):
         """Process inference request."""
         try:
-            length = int(self.headers.get("Content-Length", 0))
+            length = int(self.headers.get("Content-Length", 0) or 0)
+        except ValueError:
+            self.close_connection = True
+            self.respond({"error": "invalid Content-Length"}, status=400)
+            return
+        if length > self.server.max_body:
+            self.close_connection = True  # body left unread
+            self.respond({"error": "request body too large"}, status=413)
+            return
+        try:
             data = json.loads(self.rfile.read(length))
-
-            query = data.get("query", "")
-            tokens = pi_emit(query, steps=data.get("steps", 24))
-
-            # Reset cluster for new query
-            self.cluster.reset()
-
-            # Spawn pattern agents from tokens
-            self.cluster.spawn_patterns(tokens)
-
-            # Spawn event agents for grounded facts
-            for e in data.get("events", []):
-                self.cluster.spawn_event(e)
-
-            # Spawn default invariant (anti-hallucination)
-            self.cluster.spawn_invariant(
-                lambda s: s.get("entity") != "perpetual_motion"
-            )
-
-            # Link agents into mesh
-            self.cluster.link()
-
-            # Run cluster cognition
-            self.cluster.run(ticks=data.get("ticks", 50))
-
-            # Collapse to answer
-            result = self.cluster.collapse()
-            result["tokens"] = tokens
-            result["query"] = query
-
-            self.respond(result)
-
+        except ValueError as e:
+            self.respond({"error": f"invalid JSON: {e}"}, status=400)
+            return
+        try:
+            check_request(data)
+        except ValueError as e:
+            self.respond({"error": str(e)}, status=400)
+            return
+
+        # Admission control: full queue -> 503 straight away
+        job = self.server.submit(data)
+        if job is None:
+            self.respond({"error": "cluster busy"}, status=503,
+                         headers={"Retry-After": str(self.server.retry_after)})
+            return
+        try:
+            result = job.result(timeout=self.server.request_timeout)
+        except JobTimeout:
+            job.cancel()  # frees the slot if still queued; a started run ends within MAX_WORK
+            self.respond({"error": "cluster run timed out"}, status=504)
+            return
+        except ValueError as e:
+            self.respond({"error": str(e)}, status=400)
+            return
         except Exception as e:
             self.respond({"error": str(e)}, status=500)
+            return
+        self.respond(result)
 
-    def respond(self, obj, status=200):
+    def respond(self, obj, status=200, headers=None):
         """Send JSON response with CORS headers."""
+        body = json.dumps(obj, indent=2).encode()
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
         self.end_headers()
-        self.wfile.write(json.dumps(obj, indent=2).encode())
+        self.wfile.write(body)
+
+
+class PiClusterServer(ThreadingHTTPServer):
+    """
+    Concurrent π cluster server.
+    One thread per connection for HTTP I/O; CPU-heavy cluster runs go to a
+    bounded worker pool (processes by default, threads with pool="thread").
+    At most workers + queue requests are admitted; the rest get 503.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, workers=None, queue=None, pool="process",
+                 request_timeout=60.0, max_body=1 << 20, retry_after=1):
+        super().__init__(address, PiClusterAPI)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.capacity = self.workers + (self.workers * 4 if queue is None else max(0, queue))
+        self.request_timeout = request_timeout
+        self.max_body = max_body
+        self.retry_after = retry_after
+        self.inflight = 0
+        self.lock = threading.Lock()
+        if pool == "process":
+            self.pool = ProcessPoolExecutor(self.workers)
+        elif pool == "thread":
+            self.pool = ThreadPoolExecutor(self.workers)
+        else:
+            raise ValueError(f"unknown pool: {pool!r}")
+
+    def submit(self, data):
+        """Queue one inference on the pool; None when the admission limit is reached."""
+        with self.lock:
+            if self.inflight >= self.capacity:
+                return None
+            self.inflight += 1
+        try:
+            job = self.pool.submit(infer, data)
+        except Exception:
+            self.done(None)
+            raise
+        job.add_done_callback(self.done)
+        return job
+
+    def done(self, job):
+        with self.lock:
+            self.inflight -= 1
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
 
 # ============================================================
 # 🚀 BOOT
 # ============================================================
 
-def run(port=8081):
+def run(port=8081, workers=None, queue=None, pool="process"):
     """Start K'UHUL π cluster API server."""
     print("""
 ╔═══════════════════════════════════════════════════════════════════════════════╗
@@ -360,13 +988,16 @@ def run(port=8081):
     print(f"💚 GET  /  — Health check")
     print()
 
-    server = HTTPServer(("", port), PiClusterAPI)
+    server = PiClusterServer(("", port), workers=workers, queue=queue, pool=pool)
+    print(f"⚙️  {server.workers} {pool} workers, {server.capacity} admitted requests max")
 
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n🛑 K'UHUL π cluster shutdown")
         server.shutdown()
+    finally:
+        server.server_close()
 
 # ============================================================
 # ENTRY POINT
@@ -375,4 +1006,5 @@ def run(port=8081):
 if __name__ == "__main__":
     import sys
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8081
-    run(port)
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    run(port, workers)
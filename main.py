@@ -1,108 +1,102 @@
 from __future__ import annotations
-import json, sys
-from typing import Any, Dict, List
+import argparse, sys, time
+from typing import Any, Dict, List, Optional
 
-from pi_types import PiWorldSpec, PiBody, PiConstraint
+from pi_types import PiEvent, PiKernelConfig
 from pi_kernel import PiKernel
+from pi_frames import FRAME_FORMATS, PiFrameWriter
+from pi_bundle import (bundle_tree, load_bundle, load_cached, parse_bodies, parse_constraints, parse_world,
+                       validate_bundle)
 
-def load_bundle(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def parse_world(bundle: Dict[str, Any]) -> PiWorldSpec:
-    w = (bundle.get("%pi", {}) or {}).get("world", {}) or {}
-
-    gravity = tuple(w.get("gravity", [0, 9.81, 0]))
-    air = w.get("air", {}) or {}
-    time = w.get("time", {}) or {}
-    solver = w.get("solver", {}) or {}
-
-    fields = w.get("fields", []) or []
-
-    return PiWorldSpec(
-        gravity=(float(gravity[0]), float(gravity[1]), float(gravity[2])),
-        air_density=float(air.get("density", 1.225)),
-        air_viscosity=float(air.get("viscosity", 0.000018)),
-        dt=float(time.get("dt", 1.0/60.0)),
-        substeps=int(time.get("substeps", 1)),
-        integrator=str(solver.get("integrator", "semi_implicit")),
-        solver_iterations=int(solver.get("iterations", 8)),
-        fields=fields
-    )
-
-def parse_bodies(bundle: Dict[str, Any]) -> List[PiBody]:
-    arr = (bundle.get("%pi", {}) or {}).get("bodies", []) or []
-    out: List[PiBody] = []
-    for b in arr:
-        mat = b.get("material", {}) or {}
-        out.append(PiBody(
-            id=str(b.get("id")),
-            mass=float(b.get("mass", 1.0)),
-            position=tuple(b.get("position", [0,0,0])),
-            velocity=tuple(b.get("velocity", [0,0,0])),
-            rotation=tuple(b.get("rotation", [0,0,0,1])),
-            shape=str(b.get("shape", "box")),
-            size=tuple(b.get("size", [1,1,0.1])),
-            friction=float(mat.get("friction", 0.45)),
-            restitution=float(mat.get("restitution", 0.08)),
-            drag=float(mat.get("drag", 0.02)),
-            flags=list(b.get("flags", [])),
-            role=str(b.get("@role", "ui.node")),
-            bind_dom=b.get("@bind_dom"),
-            dom_key=b.get("@dom_key")
-        ))
-    return out
-
-def parse_constraints(bundle: Dict[str, Any]) -> List[PiConstraint]:
-    arr = (bundle.get("%pi", {}) or {}).get("constraints", []) or []
-    out: List[PiConstraint] = []
-    for c in arr:
-        out.append(PiConstraint(
-            id=str(c.get("id")),
-            type=str(c.get("type")),
-            a=str(c.get("a")),
-            b=str(c.get("b")),
-            params=dict(c.get("params", {}) or {})
-        ))
-    return out
-
-def main() -> int:
-    if len(sys.argv) < 2:
-        print("usage: python main.py <bundle.json> [ticks]")
-        return 2
-
-    bundle_path = sys.argv[1]
-    ticks = int(sys.argv[2]) if len(sys.argv) >= 3 else 1
-
-    bundle = load_bundle(bundle_path)
-
+def build_kernel(bundle: Dict[str, Any], config: Optional[PiKernelConfig] = None) -> PiKernel:
     world = parse_world(bundle)
     bodies = parse_bodies(bundle)
     constraints = parse_constraints(bundle)
-    tree = bundle.get("⟁tree", {"⟁node": "body", "⟁children": []})
-
-    kernel = PiKernel(world, bodies, constraints, tree)
+    return PiKernel(world, bodies, constraints, bundle_tree(bundle), config)
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="π-KUHUL headless runner")
+    ap.add_argument("bundle", help="π bundle JSON")
+    ap.add_argument("ticks", nargs="?", type=int, default=1)
+    ap.add_argument("--out", default="-", help="output file (default: stdout)")
+    ap.add_argument("--format", choices=FRAME_FORMATS, default="ndjson", help="ndjson lines or PIFS v1 binary records")
+    ap.add_argument("--every", type=int, default=1, help="emit every Nth tick (the final tick is always emitted)")
+    ap.add_argument("--final-only", action="store_true", help="emit only the final state and hash")
+    ap.add_argument("--projection", choices=("full", "delta"), default="full",
+                    help="per-tick projection when every tick is emitted")
+    ap.add_argument("--backend", choices=("python", "soa"), default="python")
+    ap.add_argument("--seal-mode", choices=("json", "merkle"), default="json")
+    ap.add_argument("--hash-encoding", choices=("json", "binary"), default="json")
+    ap.add_argument("--seal-every", type=int, default=1)
+    ap.add_argument("--sleep", action="store_true", help="let islands at rest sleep")
+    ap.add_argument("--field-mode", choices=("exact", "lattice"), default="exact",
+                    help="lattice: bake fields into a voxel grid (soa backend, approximate)")
+    ap.add_argument("--lattice-resolution", type=int, default=32)
+    ap.add_argument("--cache", action="store_true",
+                    help="load through the compiled bundle cache ($PI_BUNDLE_CACHE or ~/.cache/pi-kuhul/bundles)")
+    ap.add_argument("--validate", action="store_true", help="check the bundle against π-bundle.schema.json first")
+    ap.add_argument("--no-impulse", action="store_true", help="skip the demo impulse on the first body")
+    ap.add_argument("--no-summary", action="store_true", help="no ticks/sec summary on stderr")
+    return ap
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    ticks = max(0, args.ticks)
+    every = 0 if args.final_only else max(1, args.every)
+
+    # sparse output: skip per-tick projection, emitted frames carry a full keyframe instead
+    sparse = every != 1
+    config = PiKernelConfig(
+        backend=args.backend,
+        seal_mode=args.seal_mode,
+        hash_encoding=args.hash_encoding,
+        seal_every=args.seal_every,
+        sleep=args.sleep,
+        field_mode=args.field_mode,
+        lattice_resolution=args.lattice_resolution,
+        projection_mode="none" if sparse else args.projection
+    )
+    if args.cache:
+        kernel = load_cached(args.bundle, validate=args.validate).build_kernel(config)
+    else:
+        bundle = load_bundle(args.bundle)
+        if args.validate:
+            validate_bundle(bundle)
+        kernel = build_kernel(bundle, config)
+    bodies = kernel.bodies
 
     # Example: inject a deterministic impulse into first body (kernel-owned)
-    # (Step 2 will formalize this mapping; here we keep it minimal.)
-    if bodies:
-        kernel.enqueue_event({
-            "type": "impulse",
-            "target": bodies[0].id,
-            "payload": {"impulse": [0, 2, 0]}
-        } if isinstance({}, dict) else None)
-
-    for _ in range(ticks):
-        res = kernel.tick_once()
-        # emit projection as JSON for CSS-VER consumers
-        print(json.dumps({
-            "epoch": res.epoch,
-            "tick": res.tick,
-            "tick_hash": res.tick_hash,
-            "projection": res.projection.bodies,
-            "intents": [e.__dict__ for e in kernel.symbolic_intents]  # safe: intent list only
-        }, ensure_ascii=False))
-
+    if bodies and not args.no_impulse:
+        kernel.enqueue_event(PiEvent(type="impulse", target=bodies[0].id, payload={"impulse": [0, 2, 0]}))
+
+    stream = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    writer = PiFrameWriter(stream, args.format)
+    t0 = time.perf_counter()
+    res = None
+    try:
+        # intents are static (symbolic scan at load): emitted once, ahead of the frames
+        writer.header([e.__dict__ for e in kernel.symbolic_intents], bodies)
+        for t in range(ticks):
+            if t == ticks - 1:
+                kernel.request_seal()  # with seal_every > 1 the final hash must still cover the final state
+            res = kernel.tick_once()
+            if not sparse:
+                writer.frame(res)
+            elif every and res.tick % every == 0:
+                writer.frame(res, kernel.full_projection())
+        if res is not None and sparse and not (every and res.tick % every == 0):
+            writer.frame(res, kernel.full_projection())
+    finally:
+        writer.close()
+        if stream is not sys.stdout.buffer:
+            stream.close()
+    elapsed = time.perf_counter() - t0
+
+    if not args.no_summary:
+        rate = ticks / elapsed if elapsed > 0 else 0.0
+        final = res.tick_hash if res is not None else kernel.prev_hash
+        print(f"π run: {ticks} ticks, {writer.frames} frames in {elapsed:.3f}s ({rate:.1f} ticks/s) "
+              f"final {final}", file=sys.stderr)
     return 0
 
 if __name__ == "__main__":
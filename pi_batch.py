@@ -0,0 +1,132 @@
+from __future__ import annotations
+import argparse, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterator, List, Optional
+
+from pi_types import PiKernelConfig
+from main import build_kernel, load_bundle
+from pi_bundle import load_cached, validate_bundle
+
+@dataclass(frozen=True)
+class PiBatchJob:
+    """
+    One independent world: bundle path + how long to run it.
+    every > 0 keeps a full projection every N ticks (final tick included).
+    """
+    bundle: str
+    ticks: int
+    every: int = 0
+    config: PiKernelConfig = field(default_factory=PiKernelConfig)
+    cache: bool = False  # load through the compiled bundle cache
+    validate: bool = False  # check against π-bundle.schema.json before running
+
+def run_job(job: PiBatchJob) -> Dict[str, Any]:
+    """
+    Load the bundle in this process, run it, return hashes/frames/timings.
+    Errors are reported in the result so one bad bundle does not stop a batch.
+    """
+    out: Dict[str, Any] = {"bundle": job.bundle, "ticks": 0, "final_hash": None, "frames": [], "error": None}
+    t0 = time.perf_counter()
+    try:
+        config = job.config
+        if config.projection_mode != "none":
+            # only selected frames leave the worker: skip per-tick projection
+            config = replace(config, projection_mode="none")
+        if job.cache:
+            kernel = load_cached(job.bundle, validate=job.validate).build_kernel(config)
+        else:
+            bundle = load_bundle(job.bundle)
+            if job.validate:
+                validate_bundle(bundle)
+            kernel = build_kernel(bundle, config)
+        t1 = time.perf_counter()
+        res = None
+        for t in range(job.ticks):
+            if t == job.ticks - 1:
+                kernel.request_seal()  # final_hash covers the final state whatever seal_every is
+            res = kernel.tick_once()
+            if job.every > 0 and (res.tick % job.every == 0 or res.tick == job.ticks):
+                out["frames"].append({"tick": res.tick, "tick_hash": res.tick_hash,
+                                      "projection": kernel.full_projection().bodies})
+        t2 = time.perf_counter()
+        out["ticks"] = kernel.tick
+        out["epoch"] = kernel.epoch
+        out["final_hash"] = res.tick_hash if res is not None else kernel.prev_hash
+        out["load_seconds"] = t1 - t0
+        out["run_seconds"] = t2 - t1
+    except Exception as e:  # reported per world
+        out["error"] = f"{type(e).__name__}: {e}"
+    out["pid"] = os.getpid()
+    return out
+
+def run_batch(jobs: List[PiBatchJob], workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Results stream back in job order (deterministic), whatever the completion order.
+    workers=1 runs in-process (no pool).
+    """
+    n = workers or os.cpu_count() or 1
+    if n <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield run_job(job)
+        return
+    n = min(n, len(jobs))
+    # a few chunks per worker: amortises IPC while keeping the tail balanced
+    chunk = max(1, len(jobs) // (n * 4))
+    with ProcessPoolExecutor(max_workers=n) as pool:
+        for res in pool.map(run_job, jobs, chunksize=chunk):
+            yield res
+
+def expand_bundles(paths: List[str]) -> List[str]:
+    """
+    Files as given; directories -> their *.json files (sorted).
+    """
+    out: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            out.extend(os.path.join(p, f) for f in sorted(os.listdir(p)) if f.endswith(".json"))
+        else:
+            out.append(p)
+    return out
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="π-KUHUL multi-world batch runner")
+    ap.add_argument("bundles", nargs="+", help="bundle files or directories of *.json bundles")
+    ap.add_argument("--ticks", type=int, default=60)
+    ap.add_argument("--workers", type=int, default=0, help="process count (default: all cores)")
+    ap.add_argument("--every", type=int, default=0, help="keep a full projection every N ticks (0 = none)")
+    ap.add_argument("--out", default="-", help="NDJSON results file (default: stdout)")
+    ap.add_argument("--backend", choices=("python", "soa"), default="python")
+    ap.add_argument("--seal-mode", choices=("json", "merkle"), default="json")
+    ap.add_argument("--hash-encoding", choices=("json", "binary"), default="json")
+    ap.add_argument("--seal-every", type=int, default=1)
+    ap.add_argument("--sleep", action="store_true")
+    ap.add_argument("--cache", action="store_true", help="load bundles through the compiled bundle cache")
+    ap.add_argument("--validate", action="store_true", help="check bundles against π-bundle.schema.json first")
+    args = ap.parse_args(argv)
+
+    config = PiKernelConfig(backend=args.backend, seal_mode=args.seal_mode, hash_encoding=args.hash_encoding,
+                            seal_every=args.seal_every, sleep=args.sleep)
+    jobs = [PiBatchJob(p, max(0, args.ticks), max(0, args.every), config, args.cache, args.validate)
+            for p in expand_bundles(args.bundles)]
+
+    stream = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    t0 = time.perf_counter()
+    worlds = ticks = failed = 0
+    try:
+        for res in run_batch(jobs, args.workers or None):
+            worlds += 1
+            ticks += res["ticks"]
+            failed += res["error"] is not None
+            stream.write(json.dumps(res, ensure_ascii=False, separators=(",", ":")) + "\n")
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    elapsed = time.perf_counter() - t0
+    rate = ticks / elapsed if elapsed > 0 else 0.0
+    print(f"π batch: {worlds} worlds ({failed} failed), {ticks} ticks in {elapsed:.3f}s ({rate:.1f} world-ticks/s)",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
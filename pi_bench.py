@@ -0,0 +1,295 @@
+from __future__ import annotations
+import argparse, json, math, platform, random, sys, time, tracemalloc
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pi_types import PiKernelConfig
+from pi_kernel import PiKernel
+from main import build_kernel
+
+TOPOLOGIES = ("none", "chain", "grid", "random", "star")
+FIELD_TYPES = ("wind", "attraction_well", "mixed")
+STEPS = ("step_fields", "step_symbolic_forces", "step_constraints", "step_integrate",
+         "step_solve_positions", "step_projection", "step_seal")
+
+@dataclass(frozen=True)
+class PiBenchCase:
+    """
+    Synthetic world parameters (deterministic for a given seed).
+    """
+    name: str
+    bodies: int = 200
+    springs: int = 200
+    topology: str = "chain"
+    fields: int = 2
+    field_type: str = "attraction_well"
+    substeps: int = 1
+    static_fraction: float = 0.05
+    solver_mode: str = "force"
+    seed: int = 1
+    ticks: int = 60
+
+CASES: Dict[str, PiBenchCase] = {c.name: c for c in (
+    PiBenchCase("small"),
+    PiBenchCase("medium", bodies=2000, springs=3000, topology="grid", fields=8, field_type="mixed", substeps=2),
+    PiBenchCase("large", bodies=20000, springs=20000, topology="random", fields=16, ticks=10),
+    PiBenchCase("idle", bodies=5000, springs=0, topology="none", fields=0, static_fraction=0.9, ticks=30),
+    PiBenchCase("pbd", bodies=1000, springs=1500, topology="grid", fields=2, solver_mode="pbd"),
+)}
+
+# -------------------- Synthetic bundles --------------------
+
+def _pairs(case: PiBenchCase, rnd: random.Random) -> List[Tuple[int, int]]:
+    n = case.bodies
+    if n < 2 or case.springs <= 0 or case.topology == "none":
+        return []
+    out: List[Tuple[int, int]] = []
+    if case.topology == "chain":
+        out = [(i, i + 1) for i in range(n - 1)]
+    elif case.topology == "grid":
+        w = max(1, int(math.sqrt(n)))
+        for i in range(n):
+            if (i + 1) % w and i + 1 < n:
+                out.append((i, i + 1))
+            if i + w < n:
+                out.append((i, i + w))
+    elif case.topology == "star":
+        hub = 0
+        for i in range(1, n):
+            if i % 32 == 0:
+                hub = i
+                continue
+            out.append((hub, i))
+    elif case.topology == "random":
+        while len(out) < case.springs:
+            a, b = rnd.randrange(n), rnd.randrange(n)
+            if a != b:
+                out.append((a, b))
+    else:
+        raise ValueError(f"unknown π bench topology: {case.topology!r}")
+    return out[:case.springs]
+
+def _field(kind: str, extent: float, rnd: random.Random) -> Dict[str, Any]:
+    if kind == "wind":
+        lo = [rnd.uniform(0, extent * 0.5), rnd.uniform(0, extent * 0.5), -1.0]
+        return {"field_type": "wind", "parameters": {
+            "direction": [rnd.uniform(-1, 1), rnd.uniform(-1, 1), 0.0], "strength": 0.2,
+            "bounds": {"origin": lo, "size": [extent * 0.5, extent * 0.5, 2.0]}}}
+    return {"field_type": "attraction_well", "parameters": {
+        "position": [rnd.uniform(0, extent), rnd.uniform(0, extent), 0.0], "strength": 0.3,
+        "radius": extent * 0.1, "falloff_power": rnd.choice([1.0, 2.0])}}
+
+def generate_bundle(case: PiBenchCase) -> Dict[str, Any]:
+    """
+    %pi bundle accepted by main.parse_world / parse_bodies / parse_constraints.
+    Springs start at their rest length, so worlds stay bounded over long runs.
+    """
+    if case.field_type not in FIELD_TYPES:
+        raise ValueError(f"unknown π bench field type: {case.field_type!r}")
+    rnd = random.Random(case.seed)
+    n = case.bodies
+    extent = max(10.0, math.sqrt(n) * 2.0)
+    w = max(1, int(math.sqrt(n)))
+
+    bodies: List[Dict[str, Any]] = []
+    pos: List[List[float]] = []
+    for i in range(n):
+        p = [(i % w) * 2.0 + rnd.uniform(-0.2, 0.2), (i // w) * 2.0 + rnd.uniform(-0.2, 0.2), 0.0]
+        pos.append(p)
+        b: Dict[str, Any] = {"id": f"b{i}", "mass": rnd.uniform(0.5, 2.0), "position": p,
+                             "material": {"drag": rnd.uniform(0.0, 0.05)}, "@dom_key": f"k{i}"}
+        if rnd.random() < case.static_fraction:
+            b["flags"] = ["static"]
+        bodies.append(b)
+
+    constraints: List[Dict[str, Any]] = []
+    for k, (a, c) in enumerate(_pairs(case, rnd)):
+        d = math.sqrt(sum((pos[a][j] - pos[c][j]) ** 2 for j in range(3)))
+        constraints.append({"id": f"s{k}", "type": "spring", "a": f"b{a}", "b": f"b{c}",
+                            "params": {"rest_length": d, "stiffness": rnd.uniform(4.0, 40.0), "damping": 0.5}})
+
+    fields = []
+    for k in range(case.fields):
+        kind = case.field_type if case.field_type != "mixed" else ("wind", "attraction_well")[k % 2]
+        fields.append(_field(kind, extent, rnd))
+
+    return {
+        "%pi": {
+            "world": {"gravity": [0, 9.81, 0], "air": {"density": 0.2}, "time": {"substeps": case.substeps},
+                      "solver": {"mode": case.solver_mode}, "fields": fields},
+            "bodies": bodies,
+            "constraints": constraints,
+        },
+        "⟁tree": {"⟁node": "body", "⟁children": []},
+    }
+
+# -------------------- Measurement --------------------
+
+def _instrument(kernel: PiKernel, totals: Dict[str, float]) -> None:
+    """
+    Time the locked steps by shadowing them on the instance (tick_once calls self.step_*).
+    """
+    for name in STEPS:
+        fn = getattr(kernel, name)
+
+        def timed(*args: Any, _fn: Callable[..., Any] = fn, _name: str = name) -> Any:
+            t = time.perf_counter()
+            try:
+                return _fn(*args)
+            finally:
+                totals[_name] += time.perf_counter() - t
+        setattr(kernel, name, timed)
+
+def run_case(case: PiBenchCase, config: Optional[PiKernelConfig] = None) -> Dict[str, Any]:
+    """
+    Three runs of case.ticks ticks on fresh kernels: plain timing, per-step
+    breakdown, and tracemalloc peak (build + run).
+    """
+    bundle = generate_bundle(case)
+    config = config or PiKernelConfig()
+
+    t0 = time.perf_counter()
+    kernel = build_kernel(bundle, config)
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(case.ticks):
+        res = kernel.tick_once()
+    run_s = time.perf_counter() - t0
+
+    totals = {name: 0.0 for name in STEPS}
+    kernel = build_kernel(bundle, config)
+    _instrument(kernel, totals)
+    for _ in range(case.ticks):
+        kernel.tick_once()
+
+    tracemalloc.start()
+    try:
+        kernel = build_kernel(bundle, config)
+        for _ in range(case.ticks):
+            kernel.tick_once()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ticks = max(1, case.ticks)
+    return {
+        "case": asdict(case),
+        "ticks_per_sec": case.ticks / run_s if run_s > 0 else 0.0,
+        "ms_per_tick": run_s * 1000.0 / ticks,
+        "build_ms": build_s * 1000.0,
+        "step_ms_per_tick": {name: totals[name] * 1000.0 / ticks for name in STEPS},
+        "hash_ms_per_tick": totals["step_seal"] * 1000.0 / ticks,
+        "peak_bytes": peak,
+        "final_hash": res.tick_hash if case.ticks else None,
+    }
+
+def run_suite(names: List[str], config: Optional[PiKernelConfig] = None, ticks: Optional[int] = None) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name in names:
+        case = CASES.get(name)
+        if case is None:
+            raise ValueError(f"unknown π bench case: {name!r}")
+        if ticks is not None:
+            case = replace(case, ticks=ticks)
+        results[name] = run_case(case, config)
+    try:
+        import numpy
+        numpy_version: Optional[str] = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "meta": {"python": platform.python_version(), "numpy": numpy_version, "machine": platform.machine(),
+                 "config": asdict(config or PiKernelConfig())},
+        "cases": results,
+    }
+
+def config_mismatch(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Kernel config keys that differ from the baseline run (empty = same config).
+    """
+    # JSON round trip: a stored baseline has lists where a fresh run has tuples
+    cur = json.loads(json.dumps(results.get("meta", {}).get("config")))
+    base = json.loads(json.dumps(baseline.get("meta", {}).get("config")))
+    if base is None or cur is None:
+        return ["config: not recorded"] if cur != base else []
+    return [f"config.{k}: {base.get(k)!r} -> {cur.get(k)!r}"
+            for k in sorted(set(cur) | set(base)) if cur.get(k) != base.get(k)]
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10) -> List[str]:
+    """
+    Regressions vs a stored baseline: ticks/sec down or peak memory up by more
+    than `tolerance`, or a changed final hash for the same case. Final hashes
+    are only compared when the kernel config matches (see config_mismatch()).
+    """
+    out: List[str] = []
+    same_config = not config_mismatch(results, baseline)
+    for name, cur in results.get("cases", {}).items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        if cur["ticks_per_sec"] < base["ticks_per_sec"] * (1.0 - tolerance):
+            out.append(f"{name}: ticks/sec {cur['ticks_per_sec']:.1f} < baseline {base['ticks_per_sec']:.1f}")
+        if cur["peak_bytes"] > base["peak_bytes"] * (1.0 + tolerance):
+            out.append(f"{name}: peak memory {cur['peak_bytes']} > baseline {base['peak_bytes']}")
+        if same_config and cur["case"] == base["case"] and cur["final_hash"] != base["final_hash"]:
+            out.append(f"{name}: final hash changed ({base['final_hash']} -> {cur['final_hash']})")
+    return out
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="π-KUHUL kernel benchmarks")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    g = sub.add_parser("gen", help="write a synthetic bundle")
+    g.add_argument("out")
+    g.add_argument("--bodies", type=int, default=200)
+    g.add_argument("--springs", type=int, default=200)
+    g.add_argument("--topology", choices=TOPOLOGIES, default="chain")
+    g.add_argument("--fields", type=int, default=2)
+    g.add_argument("--field-type", choices=FIELD_TYPES, default="attraction_well")
+    g.add_argument("--substeps", type=int, default=1)
+    g.add_argument("--static-fraction", type=float, default=0.05)
+    g.add_argument("--solver-mode", choices=("force", "pbd"), default="force")
+    g.add_argument("--seed", type=int, default=1)
+
+    r = sub.add_parser("run", help="run benchmark cases")
+    r.add_argument("--cases", default=",".join(CASES), help="comma-separated: " + ",".join(CASES))
+    r.add_argument("--ticks", type=int, default=None, help="override ticks per case")
+    r.add_argument("--backend", choices=("python", "soa"), default="python")
+    r.add_argument("--seal-mode", choices=("json", "merkle"), default="json")
+    r.add_argument("--hash-encoding", choices=("json", "binary"), default="json")
+    r.add_argument("--sleep", action="store_true")
+    r.add_argument("--out", default=None, help="write results JSON here")
+    r.add_argument("--baseline", default=None, help="compare against a stored results JSON")
+    r.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "gen":
+        case = PiBenchCase("custom", bodies=args.bodies, springs=args.springs, topology=args.topology,
+                           fields=args.fields, field_type=args.field_type, substeps=args.substeps,
+                           static_fraction=args.static_fraction, solver_mode=args.solver_mode, seed=args.seed)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(generate_bundle(case), f, ensure_ascii=False)
+        return 0
+
+    config = PiKernelConfig(backend=args.backend, seal_mode=args.seal_mode, hash_encoding=args.hash_encoding,
+                            sleep=args.sleep)
+    results = run_suite([c for c in args.cases.split(",") if c], config, args.ticks)
+    for name, res in results["cases"].items():
+        print(f"{name:>8}: {res['ticks_per_sec']:9.1f} ticks/s  {res['ms_per_tick']:8.2f} ms/tick  "
+              f"seal {res['hash_ms_per_tick']:7.2f} ms  peak {res['peak_bytes'] / 1e6:7.1f} MB", file=sys.stderr)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for line in config_mismatch(results, baseline):
+            print("CONFIG MISMATCH " + line + " (final hashes not compared)", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
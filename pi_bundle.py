@@ -0,0 +1,706 @@
+from __future__ import annotations
+import argparse, hashlib, json, os, struct, sys
+from array import array
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from pi_types import PiWorldSpec, PiBody, PiConstraint, PiKernelConfig
+from pi_kernel import PiKernel
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "π-bundle.schema.json")
+DEFAULT_TREE: Dict[str, Any] = {"⟁node": "body", "⟁children": []}
+
+# bundles at least this large compile through the streaming parser
+STREAM_BYTES = 64 << 20
+
+# ---------------------------------------------------------------- parsing (%pi dict -> kernel inputs)
+
+def load_bundle(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def parse_world_spec(w: Dict[str, Any]) -> PiWorldSpec:
+    w = w or {}
+    gravity = tuple(w.get("gravity", [0, 9.81, 0]))
+    air = w.get("air", {}) or {}
+    time = w.get("time", {}) or {}
+    solver = w.get("solver", {}) or {}
+
+    fields = w.get("fields", []) or []
+
+    return PiWorldSpec(
+        gravity=(float(gravity[0]), float(gravity[1]), float(gravity[2])),
+        air_density=float(air.get("density", 1.225)),
+        air_viscosity=float(air.get("viscosity", 0.000018)),
+        dt=float(time.get("dt", 1.0/60.0)),
+        substeps=int(time.get("substeps", 1)),
+        integrator=str(solver.get("integrator", "semi_implicit")),
+        solver_iterations=int(solver.get("iterations", 8)),
+        solver_mode=str(solver.get("mode", "force")),
+        fields=fields
+    )
+
+def parse_body(b: Dict[str, Any]) -> PiBody:
+    mat = b.get("material", {}) or {}
+    return PiBody(
+        id=str(b.get("id")),
+        mass=float(b.get("mass", 1.0)),
+        position=tuple(b.get("position", [0,0,0])),
+        velocity=tuple(b.get("velocity", [0,0,0])),
+        rotation=tuple(b.get("rotation", [0,0,0,1])),
+        shape=str(b.get("shape", "box")),
+        size=tuple(b.get("size", [1,1,0.1])),
+        friction=float(mat.get("friction", 0.45)),
+        restitution=float(mat.get("restitution", 0.08)),
+        drag=float(mat.get("drag", 0.02)),
+        flags=list(b.get("flags", [])),
+        role=str(b.get("@role", "ui.node")),
+        bind_dom=b.get("@bind_dom"),
+        dom_key=b.get("@dom_key")
+    )
+
+def parse_constraint(c: Dict[str, Any]) -> PiConstraint:
+    return PiConstraint(
+        id=str(c.get("id")),
+        type=str(c.get("type")),
+        a=str(c.get("a")),
+        b=str(c.get("b")),
+        params=dict(c.get("params", {}) or {})
+    )
+
+def _pi(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    return bundle.get("%pi", {}) or {}
+
+def parse_world(bundle: Dict[str, Any]) -> PiWorldSpec:
+    return parse_world_spec(_pi(bundle).get("world", {}))
+
+def parse_bodies(bundle: Dict[str, Any]) -> List[PiBody]:
+    return [parse_body(b) for b in _pi(bundle).get("bodies", []) or []]
+
+def parse_constraints(bundle: Dict[str, Any]) -> List[PiConstraint]:
+    return [parse_constraint(c) for c in _pi(bundle).get("constraints", []) or []]
+
+def bundle_tree(bundle: Dict[str, Any]) -> Any:
+    return bundle.get("⟁tree", DEFAULT_TREE)
+
+# ---------------------------------------------------------------- schema (the draft 2020-12 subset our schemas use)
+
+_SCHEMA: Optional[Dict[str, Any]] = None
+
+def load_schema() -> Dict[str, Any]:
+    global _SCHEMA
+    if _SCHEMA is None:
+        with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+            _SCHEMA = json.load(f)
+    return _SCHEMA
+
+def _resolve(root: Dict[str, Any], ref: str) -> Dict[str, Any]:
+    if not ref.startswith("#"):
+        raise ValueError(f"unsupported π schema $ref: {ref!r}")
+    node: Any = root
+    for part in ref[1:].split("/")[1:]:
+        node = node[part.replace("~1", "/").replace("~0", "~")]
+    return node
+
+def _json_type(v: Any) -> str:
+    if v is None:
+        return "null"
+    if isinstance(v, bool):
+        return "boolean"
+    if isinstance(v, int):
+        return "integer"
+    if isinstance(v, float):
+        return "number"
+    if isinstance(v, str):
+        return "string"
+    return "array" if isinstance(v, list) else "object" if isinstance(v, dict) else type(v).__name__
+
+def _is_type(v: Any, t: str) -> bool:
+    jt = _json_type(v)
+    return jt == t or (t == "number" and jt == "integer")
+
+def schema_errors(value: Any, schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None,
+                  path: str = "$", limit: int = 20) -> List[str]:
+    """
+    Validate against a JSON schema; returns at most `limit` messages (empty = valid).
+    Iterative, so deep ⟁trees do not hit the recursion limit.
+    Keywords: $ref (local), type, enum, required, properties, items, minItems, maxItems,
+    minimum, exclusiveMinimum, oneOf, anyOf. Annotations are ignored.
+    """
+    root = schema if root is None else root
+    errors: List[str] = []
+    stack = [(value, schema, path)]
+    while stack and len(errors) < limit:
+        v, s, p = stack.pop()
+        while "$ref" in s:
+            s = _resolve(root, s["$ref"])
+        t = s.get("type")
+        if t is not None:
+            ts = t if isinstance(t, list) else [t]
+            if not any(_is_type(v, x) for x in ts):
+                errors.append(f"{p}: expected {' or '.join(ts)}, got {_json_type(v)}")
+                continue
+        if "enum" in s and v not in s["enum"]:
+            errors.append(f"{p}: {v!r} is not one of {s['enum']}")
+        for key in ("oneOf", "anyOf"):
+            alts = s.get(key)
+            if alts:
+                found = [schema_errors(v, a, root, p, limit) for a in alts]
+                hits = sum(1 for e in found if not e)
+                if hits == 0:
+                    # report the alternative that got past the type check, if any
+                    deep = [e for e in found if not e[0].startswith(f"{p}: expected ")]
+                    errors.extend(deep[0] if deep else [f"{p}: does not match {key}"])
+                elif key == "oneOf" and hits > 1:
+                    errors.append(f"{p}: matches more than one oneOf alternative")
+        if isinstance(v, dict):
+            for r in s.get("required", ()):
+                if r not in v:
+                    errors.append(f"{p}: missing {r!r}")
+            props = s.get("properties", {})
+            for k in reversed(list(props)):
+                if k in v:
+                    stack.append((v[k], props[k], f"{p}.{k}"))
+        elif isinstance(v, list):
+            if len(v) < s.get("minItems", 0):
+                errors.append(f"{p}: expected at least {s['minItems']} items, got {len(v)}")
+            if "maxItems" in s and len(v) > s["maxItems"]:
+                errors.append(f"{p}: expected at most {s['maxItems']} items, got {len(v)}")
+            items = s.get("items")
+            if items is not None:
+                for i in range(len(v) - 1, -1, -1):
+                    stack.append((v[i], items, f"{p}[{i}]"))
+        elif _is_type(v, "number"):
+            if "minimum" in s and v < s["minimum"]:
+                errors.append(f"{p}: {v!r} < minimum {s['minimum']}")
+            if "exclusiveMinimum" in s and v <= s["exclusiveMinimum"]:
+                errors.append(f"{p}: {v!r} <= exclusiveMinimum {s['exclusiveMinimum']}")
+    return errors[:limit]
+
+def _raise_invalid(errors: List[str]) -> None:
+    if errors:
+        raise ValueError("π bundle does not match π-bundle.schema.json:\n  " + "\n  ".join(errors))
+
+def validate_bundle(bundle: Any) -> None:
+    _raise_invalid(schema_errors(bundle, load_schema()))
+
+# ---------------------------------------------------------------- compiled form
+
+# PIBC v1 (little-endian), sections 8-byte aligned (same layout rules as PICK checkpoints):
+#   header  magic "PIBC", u16 version, u16 reserved, u32 bodies, 32s source sha256,
+#           then 5 x (u64 offset, u64 length):
+#   NUM     f64 column-major (BODY_COLS x bodies): p.xyz v.xyz rot.xyzw size.xyz mass friction restitution drag
+#   INTS    u32 body rows whose NUM value was an int in the source (ints hash as ints), column by column
+#   CNUM    f64 constraint params: per layout (distinct params key list), one column per key
+#   CINTS   u32 positions within each CNUM column that held ints
+#   META    UTF-8 JSON: world, body / constraint string columns (repetitive ones as table + index),
+#           layouts, int counts per column, tree, exact / cexact (bodies / params f64 cannot hold)
+COMPILED_MAGIC = b"PIBC"
+COMPILED_VERSION = 1
+BODY_COLS = 17
+
+_HEADER = struct.Struct("<4sHHI32s")
+_SECTION = struct.Struct("<QQ")
+_SECTIONS = 5
+_EXACT_INT = 1 << 53
+
+STRING_COLS = ("id", "shape", "flags", "role", "bind_dom", "dom_key")
+CONSTRAINT_COLS = ("id", "type", "a", "b")
+_ENCODED_COLS = ("shape", "flags", "role", "type")  # few distinct values: stored as table + index
+
+def _le(a: array) -> array:
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+def _encode(values: List[Any]) -> Dict[str, List[Any]]:
+    seen: Dict[Any, int] = {}
+    table: List[Any] = []
+    index: List[int] = []
+    for v in values:
+        key = tuple(v) if isinstance(v, list) else v
+        k = seen.get(key)
+        if k is None:
+            k = seen[key] = len(table)
+            table.append(v)
+        index.append(k)
+    return {"table": table, "index": index}
+
+def _decode(col: Dict[str, List[Any]]) -> List[Any]:
+    return list(map(col["table"].__getitem__, col["index"]))
+
+def _exact_in_f64(values: Any) -> bool:
+    return all(type(v) is float or (type(v) is int and -_EXACT_INT <= v <= _EXACT_INT) for v in values)
+
+def _int_rows(col: List[Any]) -> List[int]:
+    return [r for r, v in enumerate(col) if type(v) is int]
+
+def _with_ints(col: List[float], rows: List[int]) -> List[Any]:
+    """
+    Column with its int entries restored (a fresh list when anything changes).
+    """
+    if len(rows) == len(col):
+        return list(map(int, col))
+    if rows:
+        col = list(col)
+        for r in rows:
+            col[r] = int(col[r])
+    return col
+
+@dataclass
+class PiCompiledBundle:
+    """
+    Parsed bundle as flat columns; bodies()/constraint_list()/build_kernel() give fresh state.
+    """
+    digest: str  # sha256 of the source bundle bytes
+    world: PiWorldSpec
+    cols: List[List[float]]  # BODY_COLS columns
+    int_rows: List[List[int]]  # per column: rows holding ints
+    strings: Dict[str, List[Any]]  # STRING_COLS -> one value per body
+    cstrings: Dict[str, List[Any]]  # CONSTRAINT_COLS -> one value per constraint
+    clayout: List[int]  # per constraint: layout index, -1 = params in cexact
+    layouts: List[List[str]]  # params keys, in source order
+    lcols: List[List[List[float]]]  # per layout, per key: values of its constraints
+    lints: List[List[List[int]]]  # per layout, per key: positions holding ints
+    tree: Any
+    exact: Dict[int, List[Any]] = field(default_factory=dict)  # row -> [position, velocity, rotation, size]
+    cexact: Dict[int, Dict[str, Any]] = field(default_factory=dict)  # constraint -> params
+
+    @property
+    def n_bodies(self) -> int:
+        return len(self.strings["id"])
+
+    def bodies(self) -> List[PiBody]:
+        c = [_with_ints(col, rows) for col, rows in zip(self.cols, self.int_rows)]
+        st = self.strings
+        # vectors are zipped column-wise: no per-row slicing
+        out = [PiBody(bid, m, p, v, r, shape, s, fr, rs, dr, flags, role, bind_dom, dom_key)
+               for bid, shape, flags, role, bind_dom, dom_key, p, v, r, s, m, fr, rs, dr in zip(
+                   st["id"], st["shape"], st["flags"], st["role"], st["bind_dom"], st["dom_key"],
+                   zip(c[0], c[1], c[2]), zip(c[3], c[4], c[5]), zip(c[6], c[7], c[8], c[9]),
+                   zip(c[10], c[11], c[12]), c[13], c[14], c[15], c[16])]
+        for i, ex in self.exact.items():
+            b = out[i]
+            b.position, b.velocity, b.rotation, b.size = (tuple(x) for x in ex)
+        return out
+
+    def constraint_list(self) -> List[PiConstraint]:
+        groups: List[List[int]] = [[] for _ in self.layouts]
+        for i, k in enumerate(self.clayout):
+            if k >= 0:
+                groups[k].append(i)
+        params: List[Any] = [None] * len(self.clayout)
+        for keys, rows, cols, ints in zip(self.layouts, groups, self.lcols, self.lints):
+            if not keys:
+                for i in rows:
+                    params[i] = {}
+                continue
+            values = zip(*[_with_ints(col, r) for col, r in zip(cols, ints)])
+            for i, vals in zip(rows, values):
+                params[i] = dict(zip(keys, vals))
+        for i, p in self.cexact.items():
+            params[i] = dict(p)
+        st = self.cstrings
+        return [PiConstraint(id=cid, type=ctype, a=a, b=b, params=p)
+                for cid, ctype, a, b, p in zip(st["id"], st["type"], st["a"], st["b"], params)]
+
+    def build_kernel(self, config: Optional[PiKernelConfig] = None) -> PiKernel:
+        return PiKernel(replace(self.world), self.bodies(), self.constraint_list(), self.tree, config)
+
+class _Compiler:
+    """
+    Accumulates parsed bodies/constraints one at a time (shared by the dict and streaming paths).
+    """
+    def __init__(self) -> None:
+        self.cols = [array("d") for _ in range(BODY_COLS)]
+        self.int_rows: List[List[int]] = [[] for _ in range(BODY_COLS)]
+        self.strings: Dict[str, List[Any]] = {k: [] for k in STRING_COLS}
+        self.exact: Dict[int, List[Any]] = {}
+        self.cstrings: Dict[str, List[Any]] = {k: [] for k in CONSTRAINT_COLS}
+        self.clayout: List[int] = []
+        self.layouts: Dict[Tuple[str, ...], int] = {}
+        self.lrows: List[List[List[Any]]] = []  # per layout: params values, row by row
+        self.cexact: Dict[int, Dict[str, Any]] = {}
+
+    def body(self, b: PiBody) -> None:
+        st = self.strings
+        i = len(st["id"])
+        vecs = (b.position, b.velocity, b.rotation, b.size)
+        row = [*b.position, *b.velocity, *b.rotation, *b.size, b.mass, b.friction, b.restitution, b.drag]
+        if len(row) != BODY_COLS or not _exact_in_f64(row):
+            self.exact[i] = [list(x) for x in vecs]
+            row = [0.0] * 13 + [b.mass, b.friction, b.restitution, b.drag]
+        for j, (col, v) in enumerate(zip(self.cols, row)):
+            col.append(v)
+            if type(v) is int:
+                self.int_rows[j].append(i)
+        for k, v in zip(STRING_COLS, (b.id, b.shape, list(b.flag_names), b.role, b.bind_dom, b.dom_key)):
+            st[k].append(v)
+
+    def constraint(self, c: PiConstraint) -> None:
+        st = self.cstrings
+        i = len(self.clayout)
+        for k, v in zip(CONSTRAINT_COLS, (c.id, c.type, c.a, c.b)):
+            st[k].append(v)
+        values = list(c.params.values())
+        if not _exact_in_f64(values):
+            self.cexact[i] = c.params
+            self.clayout.append(-1)
+            return
+        k = self.layouts.setdefault(tuple(c.params), len(self.layouts))
+        if k == len(self.lrows):
+            self.lrows.append([])
+        self.lrows[k].append(values)
+        self.clayout.append(k)
+
+    def finish(self, digest: str, world: PiWorldSpec, tree: Any) -> PiCompiledBundle:
+        lcols: List[List[List[float]]] = []
+        lints: List[List[List[int]]] = []
+        for keys, rows in zip(self.layouts, self.lrows):
+            cols = [list(col) for col in zip(*rows)] if keys else []
+            lints.append([_int_rows(col) for col in cols])
+            lcols.append([[float(v) for v in col] for col in cols])
+        return PiCompiledBundle(digest, world, [c.tolist() for c in self.cols], self.int_rows, self.strings,
+                                self.cstrings, self.clayout, [list(k) for k in self.layouts], lcols, lints,
+                                tree, self.exact, self.cexact)
+
+def compile_bundle(bundle: Dict[str, Any], digest: str = "", validate: bool = True) -> PiCompiledBundle:
+    if validate:
+        validate_bundle(bundle)
+    comp = _Compiler()
+    for b in _pi(bundle).get("bodies", []) or []:
+        comp.body(parse_body(b))
+    for c in _pi(bundle).get("constraints", []) or []:
+        comp.constraint(parse_constraint(c))
+    return comp.finish(digest, parse_world(bundle), bundle_tree(bundle))
+
+# ---------------------------------------------------------------- streaming parse
+
+class _JsonStream:
+    """
+    Incremental JSON reader over a text stream: walks objects/arrays by hand and
+    raw_decodes leaf values, so only one element is materialised at a time.
+    """
+    def __init__(self, f: TextIO, chunk: int = 1 << 20) -> None:
+        self.f = f
+        self.chunk = chunk
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._dec = json.JSONDecoder()
+
+    def _fill(self, n: int) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(n)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Next non-whitespace char ("" at end of input); does not consume it.
+        """
+        while True:
+            buf, p, n = self.buf, self.pos, len(self.buf)
+            while p < n and buf[p] in " \t\r\n":
+                p += 1
+            self.pos = p
+            if p < n:
+                return buf[p]
+            if not self._fill(self.chunk):
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"π bundle stream: expected {ch!r}, got {got or 'end of input'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                v, end = self._dec.raw_decode(self.buf, self.pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return v
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # grow geometrically so a large value is re-scanned O(log n) times
+            self._fill(max(self.chunk, len(self.buf) - self.pos))
+
+    def _next(self, close: str) -> bool:
+        c = self.peek()
+        self.pos += 1
+        if c == close:
+            return False
+        if c != ",":
+            raise ValueError(f"π bundle stream: expected ',' or {close!r}, got {c or 'end of input'!r}")
+        return True
+
+    def members(self) -> Iterator[str]:
+        """
+        Object keys; the caller consumes each value (value/members/items) before the next key.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if not self._next("}"):
+                return
+
+    def items(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if not self._next("]"):
+                return
+
+_STREAMED = {"bodies": (parse_body, "body"), "constraints": (parse_constraint, "constraint")}
+
+def compile_stream(f: TextIO, digest: str = "", validate: bool = True) -> PiCompiledBundle:
+    """
+    Compile without building the whole object tree: bodies and constraints are
+    parsed (and validated) one element at a time; everything else is decoded whole.
+    """
+    s = _JsonStream(f)
+    comp = _Compiler()
+    root = load_schema() if validate else {}
+    skeleton: Dict[str, Any] = {}
+    for key in s.members():
+        if key != "%pi" or s.peek() != "{":
+            skeleton[key] = s.value()
+            continue
+        pi: Dict[str, Any] = {}
+        skeleton[key] = pi
+        for k in s.members():
+            if k not in _STREAMED or s.peek() != "[":
+                pi[k] = s.value()
+                continue
+            parse, ref = _STREAMED[k]
+            add = comp.body if k == "bodies" else comp.constraint
+            item_schema = {"$ref": f"#/$defs/{ref}"}
+            for i, item in enumerate(s.items()):
+                if validate:
+                    _raise_invalid(schema_errors(item, item_schema, root, f"$.%pi.{k}[{i}]"))
+                add(parse(item))
+            pi[k] = []
+    if s.peek():
+        raise ValueError("π bundle stream: trailing data after the bundle object")
+    if validate:
+        validate_bundle(skeleton)
+    return comp.finish(digest, parse_world(skeleton), bundle_tree(skeleton))
+
+# ---------------------------------------------------------------- files + cache
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def compile_file(path: str, validate: bool = True, stream: Optional[bool] = None,
+                 digest: Optional[str] = None) -> PiCompiledBundle:
+    """
+    stream=None picks the streaming parser for bundles of STREAM_BYTES or more.
+    """
+    digest = digest or file_digest(path)
+    if stream is None:
+        stream = os.path.getsize(path) >= STREAM_BYTES
+    if stream:
+        with open(path, "r", encoding="utf-8") as f:
+            return compile_stream(f, digest, validate)
+    return compile_bundle(load_bundle(path), digest, validate)
+
+def write_compiled(cb: PiCompiledBundle, path: str) -> int:
+    meta = {
+        "world": asdict(cb.world),
+        "bodies": {k: _encode(v) if k in _ENCODED_COLS else v for k, v in cb.strings.items()},
+        "int_counts": [len(r) for r in cb.int_rows],
+        "constraints": {k: _encode(v) if k in _ENCODED_COLS else v for k, v in cb.cstrings.items()},
+        "layout": cb.clayout,
+        "layouts": cb.layouts,
+        "layout_int_counts": [[len(r) for r in ints] for ints in cb.lints],
+        "tree": cb.tree,
+        "exact": [[i] + v for i, v in sorted(cb.exact.items())],
+        "cexact": [[i, p] for i, p in sorted(cb.cexact.items())],
+    }
+    num, ints, cnum, cints = array("d"), array("I"), array("d"), array("I")
+    for col, rows in zip(cb.cols, cb.int_rows):
+        num.extend(col)
+        ints.extend(rows)
+    for cols, lints in zip(cb.lcols, cb.lints):
+        for col, rows in zip(cols, lints):
+            cnum.extend(col)
+            cints.extend(rows)
+    blobs = [_le(num).tobytes(), _le(ints).tobytes(), _le(cnum).tobytes(), _le(cints).tobytes(),
+             json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")]
+
+    offset = _align(_HEADER.size + _SECTION.size * _SECTIONS)
+    table = []
+    for blob in blobs:
+        table.append((offset, len(blob)))
+        offset = _align(offset + len(blob))
+
+    # pid-unique temp name: batch workers may fill the same cache entry concurrently
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, 0, cb.n_bodies, bytes.fromhex(cb.digest or "0" * 64)))
+        for off, n in table:
+            f.write(_SECTION.pack(off, n))
+        for (off, n), blob in zip(table, blobs):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(blob)
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+def _split(values: List[Any], sizes: List[int]) -> List[List[Any]]:
+    out = []
+    k = 0
+    for m in sizes:
+        out.append(values[k:k + m])
+        k += m
+    return out
+
+def read_compiled(path: str, digest: Optional[str] = None) -> PiCompiledBundle:
+    """
+    digest, when given, must match the recorded source hash (stale cache entries raise ValueError).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        magic, version, _, n, src = _HEADER.unpack_from(data, 0)
+        table = [_SECTION.unpack_from(data, _HEADER.size + k * _SECTION.size) for k in range(_SECTIONS)]
+    except struct.error:
+        raise ValueError("truncated π compiled bundle") from None
+    if magic != COMPILED_MAGIC:
+        raise ValueError("not a π compiled bundle")
+    if version != COMPILED_VERSION:
+        raise ValueError(f"unsupported π compiled bundle version: {version}")
+    if digest is not None and src.hex() != digest:
+        raise ValueError("π compiled bundle does not match its source")
+    if any(off + ln > len(data) for off, ln in table):
+        raise ValueError("truncated π compiled bundle")
+
+    sections = []
+    for (off, ln), code in zip(table[:4], ("d", "I", "d", "I")):
+        a = array(code)
+        a.frombytes(data[off:off + ln])
+        sections.append(_le(a).tolist())
+    num, ints, cnum, cints = sections
+    off, ln = table[4]
+    meta = json.loads(data[off:off + ln].decode("utf-8"))
+
+    strings = {k: _decode(v) if k in _ENCODED_COLS else v for k, v in meta["bodies"].items()}
+    cstrings = {k: _decode(v) if k in _ENCODED_COLS else v for k, v in meta["constraints"].items()}
+    clayout = meta["layout"]
+    layouts = meta["layouts"]
+    sizes = [0] * len(layouts)
+    for k in clayout:
+        if k >= 0:
+            sizes[k] += 1
+    col_sizes = [m for keys, m in zip(layouts, sizes) for _ in keys]
+    int_counts = [c for counts in meta["layout_int_counts"] for c in counts]
+    if (any(len(strings[k]) != n for k in STRING_COLS) or len(num) != n * BODY_COLS
+            or len(ints) != sum(meta["int_counts"]) or any(len(cstrings[k]) != len(clayout) for k in CONSTRAINT_COLS)
+            or len(cnum) != sum(col_sizes) or len(cints) != sum(int_counts)):
+        raise ValueError("corrupt π compiled bundle")
+    ccols = _split(cnum, col_sizes)
+    cint_rows = _split(cints, int_counts)
+    lcols, lints = [], []
+    for keys in layouts:
+        lcols.append(ccols[:len(keys)])
+        lints.append(cint_rows[:len(keys)])
+        ccols, cint_rows = ccols[len(keys):], cint_rows[len(keys):]
+
+    w = meta["world"]
+    w["gravity"] = tuple(w["gravity"])
+    return PiCompiledBundle(src.hex(), PiWorldSpec(**w), [num[j * n:(j + 1) * n] for j in range(BODY_COLS)],
+                            _split(ints, meta["int_counts"]), strings, cstrings, clayout, layouts, lcols, lints,
+                            meta["tree"], {int(r[0]): r[1:] for r in meta["exact"]},
+                            {int(r[0]): r[1] for r in meta["cexact"]})
+
+def cache_dir() -> str:
+    return os.environ.get("PI_BUNDLE_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "pi-kuhul", "bundles")
+
+def cache_path(root: str, digest: str, validated: bool = True) -> str:
+    """
+    <sha256>.pibc for schema-checked compiles, <sha256>.raw.pibc otherwise.
+    """
+    return os.path.join(root, digest + (".pibc" if validated else ".raw.pibc"))
+
+def load_cached(path: str, cache: Optional[str] = None, validate: bool = False,
+                stream: Optional[bool] = None) -> PiCompiledBundle:
+    """
+    Compiled bundle keyed by the source's sha256: compile on a miss, otherwise
+    read the columns back with no JSON parse of the bodies.
+    - validate=False accepts whatever load_bundle + parse_* accept (same kernel
+      inputs as the plain path); either cache entry can serve it
+    - validate=True checks π-bundle.schema.json and only trusts validated entries
+    """
+    digest = file_digest(path)
+    root = cache or cache_dir()
+    for cpath in [cache_path(root, digest)] + ([] if validate else [cache_path(root, digest, False)]):
+        try:
+            return read_compiled(cpath, digest)
+        except (OSError, ValueError):
+            pass
+    cb = compile_file(path, validate, stream, digest)
+    os.makedirs(root, exist_ok=True)
+    write_compiled(cb, cache_path(root, digest, validate))
+    return cb
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="π-KUHUL bundle compiler")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    c = sub.add_parser("compile", help="validate + compile a bundle")
+    c.add_argument("bundle")
+    c.add_argument("-o", "--out", default=None, help="output file (default: the cache entry)")
+    c.add_argument("--cache", default=None, help="cache directory (default: $PI_BUNDLE_CACHE or ~/.cache/pi-kuhul/bundles)")
+    c.add_argument("--stream", action="store_true", help="force the streaming parser")
+    c.add_argument("--no-validate", action="store_true")
+
+    v = sub.add_parser("validate", help="check a bundle against π-bundle.schema.json")
+    v.add_argument("bundle")
+    v.add_argument("--stream", action="store_true", help="validate element by element")
+    args = ap.parse_args(argv)
+
+    try:
+        if args.cmd == "validate":
+            cb = compile_file(args.bundle, True, args.stream or None)
+            print(f"π bundle ok: {cb.n_bodies} bodies, {len(cb.clayout)} constraints", file=sys.stderr)
+            return 0
+        cb = compile_file(args.bundle, not args.no_validate, args.stream or None)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    out = args.out
+    if out is None:
+        root = args.cache or cache_dir()
+        os.makedirs(root, exist_ok=True)
+        out = cache_path(root, cb.digest, not args.no_validate)
+    size = write_compiled(cb, out)
+    print(f"π bundle compiled: {cb.n_bodies} bodies -> {out} ({size} bytes)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import json, mmap, os, struct, sys
+from array import array
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pi_types import PiWorldSpec, PiBody, PiConstraint, PiEvent, PiKernelConfig
+from pi_kernel import PiKernel
+from pi_soa import np
+
+# PICK v1 (little-endian), sections 8-byte aligned so they can be mapped as arrays:
+#   header  magic "PICK", u16 version, u16 reserved, u32 bodies, u32 multipliers,
+#           i64 epoch, i64 tick, 32s prev_hash, then 4 x (u64 offset, u64 length):
+#   NUM     f64 (bodies x NUM_COLS): p.xyz v.xyz f.xyz rot.xyzw size.xyz mass drag friction restitution
+#   INTS    u32 per body: bit j set when NUM column j was an int (bundle values hash as ints)
+#   LAMBDA  f64 per XPBD row (warm-start multipliers)
+#   META    UTF-8 JSON: world, config, tree, body strings, constraints, events, sleep
+CHECKPOINT_MAGIC = b"PICK"
+CHECKPOINT_VERSION = 1
+NUM_COLS = 20
+
+_HEADER = struct.Struct("<4sHHIIqq32s")
+_SECTION = struct.Struct("<QQ")
+_SECTIONS = 4
+
+def _body_row(b: PiBody) -> List[Any]:
+    return [*b.position, *b.velocity, *b.force, *b.rotation, *b.size, b.mass, b.drag, b.friction, b.restitution]
+
+def _le(a: array) -> array:
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+def _solver_lambdas(kernel: PiKernel) -> List[float]:
+    solver = kernel._solver
+    if solver is None:
+        return []
+    lam = solver.lam
+    return lam.tolist() if hasattr(lam, "tolist") else list(lam)
+
+def save_checkpoint(kernel: PiKernel, path: str) -> int:
+    """
+    Write the full kernel state (between ticks). Returns bytes written.
+    Caches (projection/delta tracking, spatial grid, merkle tree) are rebuilt on restore.
+    """
+    if kernel._soa is not None:
+        kernel._soa.write_back(kernel.bodies)
+    bodies = kernel.bodies
+    num = array("d")
+    ints = array("I")
+    for b in bodies:
+        row = _body_row(b)
+        mask = 0
+        for j, v in enumerate(row):
+            if isinstance(v, int):
+                mask |= 1 << j
+        ints.append(mask)
+        num.extend(float(v) for v in row)
+    lam = array("d", _solver_lambdas(kernel))
+
+    q = kernel.event_queue
+    sleep = kernel._sleep
+    meta = {
+        "world": asdict(kernel.world),
+        "config": asdict(kernel.config),
+        "tree": kernel.tree,
+        "bodies": [[b.id, b.shape, list(b.flags), b.role, b.bind_dom, b.dom_key] for b in bodies],
+        "constraints": [[c.id, c.type, c.a, c.b, c.params] for c in kernel.constraints],
+        "events": {
+            "impulse": [[i] + v for i, v in q.impulse.items()],
+            "force": [[i] + v for i, v in q.force.items()],
+            "dropped": q.dropped,
+            "raw": [[ev.type, ev.target, ev.payload] for ev in kernel.events],
+        },
+        "sleep": {"asleep": sleep.asleep, "quiet": sleep.quiet} if sleep is not None else None,
+        "seal_requested": kernel._seal_requested,
+    }
+    blobs = [_le(num).tobytes(), _le(ints).tobytes(), _le(lam).tobytes(),
+             json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")]
+
+    offset = _align(_HEADER.size + _SECTION.size * _SECTIONS)
+    table = []
+    for blob in blobs:
+        table.append((offset, len(blob)))
+        offset = _align(offset + len(blob))
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, 0, len(bodies), len(lam),
+                             kernel.epoch, kernel.tick, bytes.fromhex(kernel.prev_hash)))
+        for off, n in table:
+            f.write(_SECTION.pack(off, n))
+        for (off, n), blob in zip(table, blobs):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(blob)
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+def _read(mm: Any, section: Tuple[int, int], code: str) -> array:
+    off, n = section
+    a = array(code)
+    a.frombytes(mm[off:off + n])
+    return _le(a)
+
+def _restore_value(v: float, is_int: bool) -> Any:
+    return int(v) if is_int else v
+
+def load_checkpoint(path: str, config: Optional[PiKernelConfig] = None) -> PiKernel:
+    """
+    Rebuild a kernel that continues the saved hash chain exactly.
+    config overrides the saved host options (e.g. fork onto another backend).
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, _, n, n_lam, epoch, tick, prev = _HEADER.unpack_from(mm, 0)
+        if magic != CHECKPOINT_MAGIC:
+            raise ValueError("not a π checkpoint")
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported π checkpoint version: {version}")
+        table = [_SECTION.unpack_from(mm, _HEADER.size + k * _SECTION.size) for k in range(_SECTIONS)]
+        num = _read(mm, table[0], "d").tolist()
+        ints = _read(mm, table[1], "I").tolist()
+        lam = _read(mm, table[2], "d").tolist()
+        off, ln = table[3]
+        meta = json.loads(mm[off:off + ln].decode("utf-8"))
+
+    w = meta["world"]
+    w["gravity"] = tuple(w["gravity"])
+    world = PiWorldSpec(**w)
+
+    bodies: List[PiBody] = []
+    for i, (bid, shape, flags, role, bind_dom, dom_key) in enumerate(meta["bodies"]):
+        mask = ints[i]
+        row = [_restore_value(v, bool(mask >> j & 1)) for j, v in enumerate(num[i * NUM_COLS:(i + 1) * NUM_COLS])]
+        bodies.append(PiBody(
+            id=bid, mass=row[16], position=tuple(row[0:3]), velocity=tuple(row[3:6]),
+            rotation=tuple(row[9:13]), shape=shape, size=tuple(row[13:16]), friction=row[18],
+            restitution=row[19], drag=row[17], flags=flags, role=role, bind_dom=bind_dom,
+            dom_key=dom_key, force=tuple(row[6:9])
+        ))
+    constraints = [PiConstraint(id=c[0], type=c[1], a=c[2], b=c[3], params=c[4]) for c in meta["constraints"]]
+
+    kernel = PiKernel(world, bodies, constraints, meta["tree"], config or PiKernelConfig(**meta["config"]))
+    kernel.epoch = epoch
+    kernel.tick = tick
+    kernel.prev_hash = prev.hex()
+    kernel._seal_requested = meta.get("seal_requested", False)
+
+    ev = meta["events"]
+    q = kernel.event_queue
+    q.impulse = {int(r[0]): [r[1], r[2], r[3]] for r in ev["impulse"]}
+    q.force = {int(r[0]): [r[1], r[2], r[3]] for r in ev["force"]}
+    q.dropped = ev["dropped"]
+    kernel.events = [PiEvent(type=t, target=target, payload=payload) for t, target, payload in ev["raw"]]
+
+    solver = kernel._solver
+    if solver is not None and n_lam == len(solver.lam):
+        solver.lam = lam if isinstance(solver.lam, list) else np.asarray(lam, dtype=np.float64)
+    if kernel._sleep is not None and meta["sleep"] is not None:
+        kernel._sleep.asleep = list(meta["sleep"]["asleep"])
+        kernel._sleep.quiet = list(meta["sleep"]["quiet"])
+        kernel._sleep.version += 1
+    return kernel
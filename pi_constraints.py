@@ -1,12 +1,21 @@
 from __future__ import annotations
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 from pi_types import PiBody, PiConstraint, Vec3, vsub, vlen, vnorm, vmul, vadd
+from pi_soa import np, pow_array, require_numpy
 
-def solve_springs(bodies_by_id: Dict[str, PiBody], constraints: List[PiConstraint]) -> None:
+# pre-resolved spring: (a, b, rest_length, stiffness, damping)
+CompiledSpring = Tuple[PiBody, PiBody, float, float, float]
+
+def _spring_params(c: PiConstraint) -> Tuple[float, float, float]:
+    return (float(c.params.get("rest_length", 1.0)),
+            float(c.params.get("stiffness", 40.0)),
+            float(c.params.get("damping", 6.0)))
+
+def compile_springs(bodies_by_id: Dict[str, PiBody], constraints: List[PiConstraint]) -> List[CompiledSpring]:
     """
-    Constraint solve is kernel-owned.
-    We implement spring forces (Hooke + damping) as force accumulators.
+    Resolve ids + parse params once (constraints are frozen). Order is preserved.
     """
+    out: List[CompiledSpring] = []
     for c in constraints:
         if c.type != "spring":
             continue
@@ -14,11 +23,18 @@ def solve_springs(bodies_by_id: Dict[str, PiBody], constraints: List[PiConstrain
         b = bodies_by_id.get(c.b)
         if not a or not b:
             continue
+        out.append((a, b) + _spring_params(c))
+    return out
 
-        rest = float(c.params.get("rest_length", 1.0))
-        k = float(c.params.get("stiffness", 40.0))
-        damp = float(c.params.get("damping", 6.0))
+def solve_springs(bodies_by_id: Dict[str, PiBody], constraints: List[PiConstraint]) -> None:
+    """
+    Constraint solve is kernel-owned.
+    We implement spring forces (Hooke + damping) as force accumulators.
+    """
+    solve_compiled_springs(compile_springs(bodies_by_id, constraints))
 
+def solve_compiled_springs(springs: List[CompiledSpring]) -> None:
+    for a, b, rest, k, damp in springs:
         delta = vsub(b.position, a.position)
         dist = vlen(delta)
         if dist <= 1e-9:
@@ -39,3 +55,90 @@ def solve_springs(bodies_by_id: Dict[str, PiBody], constraints: List[PiConstrain
             a.force = vadd(a.force, f)
         if not b.is_static():
             b.force = vadd(b.force, vmul(f, -1.0))
+
+class PiSpringGraph:
+    """
+    Springs compiled into index + parameter arrays (soa backend).
+    - Hooke + damping evaluated for all springs at once
+    - forces scatter-added in constraint order (a then b per spring),
+      so accumulation matches solve_springs bit for bit
+    """
+    def __init__(self, arrays: Any, constraints: List[PiConstraint]) -> None:
+        require_numpy()
+        ia: List[int] = []
+        ib: List[int] = []
+        params: List[Tuple[float, float, float]] = []
+        for c in constraints:
+            if c.type != "spring":
+                continue
+            a = arrays.index.get(c.a)
+            b = arrays.index.get(c.b)
+            if a is None or b is None:
+                continue
+            ia.append(a)
+            ib.append(b)
+            params.append(_spring_params(c))
+
+        self.n = len(ia)
+        self.a = np.asarray(ia, dtype=np.int64)
+        self.b = np.asarray(ib, dtype=np.int64)
+        p = np.asarray(params, dtype=np.float64).reshape(-1, 3)
+        self.rest = p[:, 0].copy()
+        self.stiffness = p[:, 1].copy()
+        self.damping = p[:, 2].copy()
+
+        self._static = arrays.static
+        self._all = (self.a, self.b, self.rest, self.stiffness, self.damping)
+        self._index()
+
+    def _index(self) -> None:
+        # interleaved scatter rows (a0, b0, a1, b1, ...) and which ends may take force
+        self.ends = np.stack([self.a, self.b], axis=1).reshape(-1)
+        self.ends_live = ~self._static[self.ends]
+
+    def refresh_static(self) -> None:
+        """
+        Re-derive which spring ends take force after the arrays' static rows changed.
+        """
+        self._index()
+
+    def select(self, body_mask: Any) -> None:
+        """
+        Keep only springs touching a row in body_mask (e.g. awake bodies); order is preserved.
+        """
+        a, b, rest, stiffness, damping = self._all
+        keep = np.flatnonzero(body_mask[a] | body_mask[b])
+        self.n = int(keep.size)
+        self.a, self.b = a[keep], b[keep]
+        self.rest, self.stiffness, self.damping = rest[keep], stiffness[keep], damping[keep]
+        self._index()
+
+    def apply(self, arrays: Any) -> None:
+        if not self.n:
+            return
+        pos = arrays.position
+        vel = arrays.velocity
+        delta = pos[self.b] - pos[self.a]
+        dx, dy, dz = delta[:, 0], delta[:, 1], delta[:, 2]
+        dist = pow_array(dx*dx + dy*dy + dz*dz, 0.5)
+        live = ~(dist <= 1e-9)
+        safe = np.where(live, dist, 1.0)
+
+        dirv = delta / safe[:, None]
+        x = dist - self.rest
+
+        rv = vel[self.b] - vel[self.a]
+        rel = rv[:, 0]*dirv[:, 0] + rv[:, 1]*dirv[:, 1] + rv[:, 2]*dirv[:, 2]
+
+        fmag = (self.stiffness * x) + (self.damping * rel)
+        f = dirv * fmag[:, None]
+
+        vals = np.stack([f, -f], axis=1).reshape(-1, 3)
+        keep = np.repeat(live, 2) & self.ends_live
+        rows = self.ends[keep] * 3
+        vals = vals[keep]
+        flat = arrays.force.reshape(-1)
+        # ufunc.at applies indices in order: per-body accumulation order is preserved
+        np.add.at(flat, rows, vals[:, 0])
+        np.add.at(flat, rows + 1, vals[:, 1])
+        np.add.at(flat, rows + 2, vals[:, 2])
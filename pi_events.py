@@ -0,0 +1,127 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pi_types import PiEvent, Vec3, vnorm, vmul
+
+# π.event action types (pi.event.schema.json) + the legacy kernel event types
+ACTION_TYPES = ("impulse", "torque", "attract", "repel")
+LEGACY_TYPES = ("impulse", "attraction")
+
+def _vec(v: Any) -> Vec3:
+    return (float(v[0]), float(v[1]), float(v[2]))
+
+def action_vector(action: Dict[str, Any]) -> Optional[Tuple[str, Vec3]]:
+    """
+    π.event action -> ("impulse" | "force", vector); None for actions with no linear effect.
+    - impulse: magnitude along direction (velocity change = impulse / mass)
+    - attract / repel: force along / against direction
+    - torque: accepted, but the kernel has no angular state (no-op)
+    """
+    t = action.get("type")
+    if t not in ACTION_TYPES or t == "torque":
+        return None
+    d = vnorm(_vec(action.get("direction", [0, 0, 0])))
+    mag = float(action.get("magnitude", 1.0))
+    if t == "impulse":
+        return "impulse", vmul(d, mag)
+    return "force", vmul(d, mag if t == "attract" else -mag)
+
+class PiEventQueue:
+    """
+    Kernel-owned event ingestion, coalesced per target body.
+    - push()/extend(): PiEvent (legacy payloads or π.event action fields)
+    - push_actions(): bulk π.event items {"target", "action"}
+    - pending impulses/forces are summed per body in arrival order, so the
+      event step costs one update per touched body, not per event
+    A single event per body applies exactly as before (v + i/m, F + f).
+    """
+    def __init__(self, index: Dict[str, int], static: List[bool]) -> None:
+        self.index = index
+        self.static = static
+        self.impulse: Dict[int, List[float]] = {}
+        self.force: Dict[int, List[float]] = {}
+        self.dropped = 0  # unknown/static targets, torque, unknown types
+
+    def __len__(self) -> int:
+        return len(self.impulse) + len(self.force)
+
+    def _row(self, target: Optional[str]) -> Optional[int]:
+        if not target:
+            return None
+        i = self.index.get(target)
+        if i is None or self.static[i]:
+            return None
+        return i
+
+    def _add(self, acc: Dict[int, List[float]], row: int, v: Vec3) -> None:
+        cur = acc.get(row)
+        if cur is None:
+            acc[row] = [v[0], v[1], v[2]]
+        else:
+            cur[0] += v[0]
+            cur[1] += v[1]
+            cur[2] += v[2]
+
+    def add_impulse(self, target: Optional[str], v: Vec3) -> bool:
+        row = self._row(target)
+        if row is None:
+            self.dropped += 1
+            return False
+        self._add(self.impulse, row, v)
+        return True
+
+    def add_force(self, target: Optional[str], v: Vec3) -> bool:
+        row = self._row(target)
+        if row is None:
+            self.dropped += 1
+            return False
+        self._add(self.force, row, v)
+        return True
+
+    def push(self, ev: PiEvent) -> bool:
+        p = ev.payload
+        if ev.type == "impulse" and "impulse" in p:
+            return self.add_impulse(ev.target, _vec(p["impulse"]))
+        if ev.type == "attraction":
+            return self.add_force(ev.target, _vec(p.get("force", [0, 0, 0])))
+        if ev.type in ACTION_TYPES:
+            hit = action_vector(dict(p, type=ev.type))
+            if hit is not None:
+                kind, v = hit
+                return self.add_impulse(ev.target, v) if kind == "impulse" else self.add_force(ev.target, v)
+        # route_intent and friends are intents, never forces
+        self.dropped += 1
+        return False
+
+    def extend(self, events: Iterable[PiEvent]) -> int:
+        push = self.push
+        return sum(1 for ev in events if push(ev))
+
+    def push_actions(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bulk π.event items: {"target": body_id, "action": {type, magnitude, direction}} (trigger ignored).
+        """
+        n = 0
+        for item in items:
+            hit = action_vector(item.get("action") or {})
+            if hit is None:
+                self.dropped += 1
+                continue
+            kind, v = hit
+            target = item.get("target")
+            if (self.add_impulse(target, v) if kind == "impulse" else self.add_force(target, v)):
+                n += 1
+        return n
+
+    def rows(self) -> List[int]:
+        """
+        Bodies with pending impulses or forces (first-touch order).
+        """
+        out = list(self.impulse)
+        out.extend(i for i in self.force if i not in self.impulse)
+        return out
+
+    def drain(self) -> Tuple[Dict[int, List[float]], Dict[int, List[float]]]:
+        out = (self.impulse, self.force)
+        self.impulse = {}
+        self.force = {}
+        return out
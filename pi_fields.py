@@ -1,8 +1,129 @@
 from __future__ import annotations
-from typing import Any, Callable, Dict, List
-from pi_types import PiBody, Vec3, vadd, vmul, vnorm
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pi_types import PiBody, PiWorldSpec, Vec3, vadd, vmul, vnorm, vlen
+from pi_soa import np, pow_array
 
 FieldCalc = Callable[[Dict[str, Any], PiBody], Vec3]
+# batch contract: (parsed params, body arrays) -> float64 (n, 3) force rows
+FieldParse = Callable[[Dict[str, Any]], Any]
+BatchFieldCalc = Callable[[Any, Any], Any]
+# optional: parsed params -> (lo, hi) AABB outside which the field is exactly zero
+FieldSupport = Callable[[Any], Optional[Tuple[Vec3, Vec3]]]
+
+class PiFieldPlan:
+    """
+    Fields resolved once per world: calculator looked up, parameters parsed.
+    entries keep field order (accumulation order is part of determinism).
+    """
+    def __init__(self, entries: List[Tuple[str, Any, Any, Optional[Tuple[Vec3, Vec3]]]]) -> None:
+        self.entries = entries  # (kind, calc, params, support); kind: "batch" | "body"
+        self.needs_bodies = any(e[0] == "body" for e in entries)
+        self.supports = [e[3] for e in entries if e[3] is not None]
+
+# fused pipeline term kinds
+_WIND, _WELL, _CALL = 0, 1, 2
+
+class PiBodyFieldPipeline:
+    """
+    PiBody-path field step compiled for one world: gravity, air drag and every
+    field fused into a single per-body pass.
+    - parameters parsed and wind directions normalised once
+    - unknown field types dropped; wind / attraction_well inlined, other calculators called
+    - same operand order as the generic path (bit-identical forces)
+    - with a spatial grid, bounded terms only visit the bodies in their support
+    """
+    def __init__(self, world: PiWorldSpec, terms: List[Tuple[int, Any]],
+                 supports: List[Optional[Tuple[Vec3, Vec3]]]) -> None:
+        self.world = world  # kept alive: the compositor's cache key holds ids
+        self.fields = world.fields
+        self.terms = terms
+        self.supports = supports  # per term: AABB outside which it adds nothing (None: everywhere)
+        self.calls = any(kind == _CALL for kind, _ in terms)
+
+    def _local_terms(self, grid: Any) -> Tuple[List[Tuple[int, Any]], Dict[int, List[Tuple[int, Any]]]]:
+        """
+        grid rows are indices into the bodies passed to apply().
+        -> (terms for rows outside every queried support, row -> its terms in field order)
+        """
+        shared: List[int] = []
+        hits: Dict[int, List[int]] = {}
+        for t, support in enumerate(self.supports):
+            rows = grid.query_aabb(*support) if support is not None else None
+            if rows is None:
+                shared.append(t)
+                continue
+            for r in rows.tolist():
+                hits.setdefault(r, []).append(t)
+        terms = self.terms
+        local = {r: [terms[t] for t in (sorted(idx + shared) if shared else idx)] for r, idx in hits.items()}
+        return [terms[t] for t in shared], local
+
+    def apply(self, bodies: List[PiBody], grid: Any = None) -> None:
+        """
+        grid: optional PiSpatialGrid over `bodies` (row k = bodies[k]), updated by the caller.
+        Skipped terms are exactly those that would add nothing, so forces are unchanged.
+        """
+        gx, gy, gz = self.world.gravity
+        air = self.world.air_density
+        half_air = 0.5 * air
+        terms = self.terms
+        calls = self.calls
+        local: Optional[Dict[int, List[Tuple[int, Any]]]] = None
+        if grid is not None and terms:
+            terms, local = self._local_terms(grid)
+        for k, b in enumerate(bodies):
+            if b.is_static():
+                continue
+            # gravity (mass-scaled)
+            m = b.mass
+            fx, fy, fz = b.force
+            fx, fy, fz = fx + gx * m, fy + gy * m, fz + gz * m
+
+            # air drag (simple)
+            if air > 0.0:
+                vx, vy, vz = b.velocity
+                speed2 = vx*vx + vy*vy + vz*vz
+                drag_mag = half_air * speed2 * max(0.0, b.drag)
+                fx, fy, fz = fx + -drag_mag * vx, fy + -drag_mag * vy, fz + -drag_mag * vz
+
+            # custom fields, accumulated from zero in field order
+            tx = ty = tz = 0.0
+            body_terms = terms if local is None else local.get(k, terms)
+            if body_terms:
+                if calls:
+                    b.force = (fx, fy, fz)  # per-body calculators see the same state as before
+                px, py, pz = b.position
+                for kind, a in body_terms:
+                    if kind == _WELL:
+                        cx, cy, cz, strength, radius, power = a
+                        dx = cx - px
+                        dy = cy - py
+                        dz = cz - pz
+                        dist = (dx*dx + dy*dy + dz*dz) ** 0.5
+                        if dist <= 1e-6 or dist > radius:
+                            continue
+                        nd = max(1e-3, dist / radius)
+                        mag = strength * (1.0 / (nd ** power))
+                        tx += (dx / dist) * mag
+                        ty += (dy / dist) * mag
+                        tz += (dz / dist) * mag
+                    elif kind == _WIND:
+                        dx, dy, dz, strength, bounds = a
+                        if bounds is not None:
+                            lo, hi = bounds
+                            if not ((lo[0] <= px <= hi[0]) and (lo[1] <= py <= hi[1]) and (lo[2] <= pz <= hi[2])):
+                                continue
+                        s = strength * max(0.0, 1.0 - min(1.0, b.drag))
+                        tx += dx * s
+                        ty += dy * s
+                        tz += dz * s
+                    else:
+                        calc, params = a
+                        f = calc(params, b)
+                        tx += f[0]
+                        ty += f[1]
+                        tz += f[2]
+            b.force = (fx + tx, fy + ty, fz + tz)
 
 class PiFieldCompositor:
     """
@@ -13,9 +134,41 @@ class PiFieldCompositor:
     """
     def __init__(self) -> None:
         self._calcs: Dict[str, FieldCalc] = {}
+        self._batch: Dict[str, Tuple[FieldParse, BatchFieldCalc, Optional[FieldSupport]]] = {}
+        self._plan_key: Optional[Tuple[int, ...]] = None
+        self._plan: Optional[PiFieldPlan] = None
+        self._pipe_key: Optional[Tuple[int, ...]] = None
+        self._pipe: Optional[PiBodyFieldPipeline] = None
+        # objects whose ids form the keys, held so no id is reused while it is cached
+        self._plan_refs: Tuple[Any, ...] = ()
+        self._pipe_refs: Tuple[Any, ...] = ()
 
     def register(self, field_type: str, calc: FieldCalc) -> None:
+        """
+        Per-body calculator. Replaces any batch calculator of the same type, so an
+        override applies on every backend (register_batch again to vectorise it).
+        """
         self._calcs[field_type] = calc
+        self._batch.pop(field_type, None)
+        self._plan_key = None
+        self._pipe_key = None
+
+    def register_batch(self, field_type: str, calc: BatchFieldCalc, parse: Optional[FieldParse] = None,
+                       support: Optional[FieldSupport] = None) -> None:
+        """
+        Whole-array calculator. parse(params) runs once per world; calc gets its result.
+        support(parsed) bounds the field so a spatial index can skip out-of-range bodies.
+        Field types without a batch calculator fall back to the per-body callable.
+        """
+        self._batch[field_type] = (parse or (lambda p: p), calc, support)
+        self._plan_key = None
+        self._pipe_key = None
+
+    def calculator(self, field_type: str) -> Optional[FieldCalc]:
+        return self._calcs.get(field_type)
+
+    def batch_calculator(self, field_type: str) -> Optional[Tuple[FieldParse, BatchFieldCalc, Optional[FieldSupport]]]:
+        return self._batch.get(field_type)
 
     def total_force(self, fields: List[Dict[str, Any]], body: PiBody) -> Vec3:
         total: Vec3 = (0.0, 0.0, 0.0)
@@ -28,9 +181,114 @@ class PiFieldCompositor:
             total = vadd(total, calc(params, body))
         return total
 
+    def compile_bodies(self, world: PiWorldSpec) -> PiBodyFieldPipeline:
+        """
+        Fused PiBody-path pipeline, rebuilt only when the world or its field list changes
+        (same immutability rule as compile()).
+        """
+        fields = world.fields or []
+        key = (id(world), id(fields)) + tuple(id(f) for f in fields)
+        if self._pipe is not None and key == self._pipe_key:
+            return self._pipe
+
+        terms: List[Tuple[int, Any]] = []
+        supports: List[Optional[Tuple[Vec3, Vec3]]] = []
+        for f in fields:
+            ft = f.get("field_type")
+            params = f.get("parameters", {})
+            calc = self._calcs.get(ft)
+            if not calc:
+                continue
+            if calc is calc_wind:
+                d, strength, bounds = parse_wind(params)
+                terms.append((_WIND, (d[0], d[1], d[2], strength, bounds)))
+                supports.append(bounds)
+            elif calc is calc_attraction_well:
+                parsed = parse_attraction_well(params)
+                (cx, cy, cz), strength, radius, power = parsed
+                terms.append((_WELL, (cx, cy, cz, strength, radius, power)))
+                supports.append(support_attraction_well(parsed))
+            else:
+                terms.append((_CALL, (calc, params)))
+                supports.append(None)
+        self._pipe = PiBodyFieldPipeline(world, terms, supports)
+        self._pipe_key = key
+        self._pipe_refs = (world, fields) + tuple(fields)
+        return self._pipe
+
+    def compile(self, fields: List[Dict[str, Any]]) -> PiFieldPlan:
+        """
+        Cached per field list: field dicts are treated as immutable once handed
+        to the kernel (replace the list/dict to change a field).
+        """
+        key = (id(fields),) + tuple(id(f) for f in fields)
+        if self._plan is not None and key == self._plan_key:
+            return self._plan
+
+        entries: List[Tuple[str, Any, Any, Optional[Tuple[Vec3, Vec3]]]] = []
+        for f in fields:
+            ft = f.get("field_type")
+            params = f.get("parameters", {})
+            if ft in self._batch:
+                parse, bcalc, support = self._batch[ft]
+                parsed = parse(params)
+                entries.append(("batch", bcalc, parsed, support(parsed) if support else None))
+            elif ft in self._calcs:
+                entries.append(("body", self._calcs[ft], params, None))
+        self._plan = PiFieldPlan(entries)
+        self._plan_key = key
+        self._plan_refs = (fields,) + tuple(fields)
+        return self._plan
+
+    def total_force_batch(self, fields: List[Dict[str, Any]], arrays: Any, bodies: Optional[List[PiBody]] = None,
+                          index: Any = None, rows: Any = None) -> Any:
+        """
+        All fields over all bodies in one pass -> (n, 3) array.
+        Per-body fallbacks read `bodies` (caller keeps them in sync with arrays).
+        With a spatial `index`, bounded fields only touch candidate rows.
+        With `rows` (int array), only those rows are evaluated; the rest stay zero.
+        """
+        plan = self.compile(fields)
+        total = np.zeros((arrays.n, 3), dtype=np.float64)
+        for kind, calc, params, support in plan.entries:
+            if kind == "batch":
+                hit = index.query_aabb(*support) if (index is not None and support is not None) else None
+                if hit is None:
+                    hit = rows
+                if hit is None:
+                    total += calc(params, arrays)
+                elif hit.size:
+                    total[hit] += calc(params, arrays.take(hit))
+                continue
+            if bodies is None:
+                raise ValueError("per-body field calculator needs bodies")
+            body_rows = arrays.dyn_rows
+            ff = np.array([calc(params, bodies[i]) for i in body_rows], dtype=np.float64).reshape(-1, 3)
+            total[body_rows] += ff
+        return total
+
+def _parse_bounds(params: Dict[str, Any]) -> Optional[Tuple[Vec3, Vec3]]:
+    """
+    Optional regional AABB (π.field bounds: origin = min corner, size = extents).
+    """
+    bounds = params.get("bounds")
+    if not bounds:
+        return None
+    o = bounds.get("origin", [0, 0, 0])
+    sz = bounds.get("size", [0, 0, 0])
+    lo = (float(o[0]), float(o[1]), float(o[2]))
+    return lo, (lo[0] + float(sz[0]), lo[1] + float(sz[1]), lo[2] + float(sz[2]))
+
+def _in_bounds(bounds: Tuple[Vec3, Vec3], p: Vec3) -> bool:
+    lo, hi = bounds
+    return (lo[0] <= p[0] <= hi[0]) and (lo[1] <= p[1] <= hi[1]) and (lo[2] <= p[2] <= hi[2])
+
 def calc_wind(params: Dict[str, Any], body: PiBody) -> Vec3:
     if body.is_static():
         return (0.0, 0.0, 0.0)
+    bounds = _parse_bounds(params)
+    if bounds is not None and not _in_bounds(bounds, body.position):
+        return (0.0, 0.0, 0.0)
     direction = params.get("direction", [1, 0, 0])
     strength = float(params.get("strength", 0.5))
     d = vnorm((float(direction[0]), float(direction[1]), float(direction[2])))
@@ -49,7 +307,7 @@ def calc_attraction_well(params: Dict[str, Any], body: PiBody) -> Vec3:
     dx = float(cx) - body.position[0]
     dy = float(cy) - body.position[1]
     dz = float(cz) - body.position[2]
-    dist = (dx*dx + dy*dy + dz*dz) ** 0.5
+    dist = vlen((dx, dy, dz))
     if dist <= 1e-6 or dist > radius:
         return (0.0, 0.0, 0.0)
 
@@ -59,8 +317,68 @@ def calc_attraction_well(params: Dict[str, Any], body: PiBody) -> Vec3:
     d = vnorm((dx, dy, dz))
     return vmul(d, mag)
 
+# -------------------- Batch calculators (same math, whole arrays) --------------------
+
+def parse_wind(params: Dict[str, Any]) -> Tuple[Vec3, float, Optional[Tuple[Vec3, Vec3]]]:
+    direction = params.get("direction", [1, 0, 0])
+    strength = float(params.get("strength", 0.5))
+    d = vnorm((float(direction[0]), float(direction[1]), float(direction[2])))
+    return d, strength, _parse_bounds(params)
+
+def support_wind(parsed: Tuple[Vec3, float, Optional[Tuple[Vec3, Vec3]]]) -> Optional[Tuple[Vec3, Vec3]]:
+    return parsed[2]
+
+def calc_wind_batch(parsed: Tuple[Vec3, float, Optional[Tuple[Vec3, Vec3]]], arrays: Any) -> Any:
+    d, strength, bounds = parsed
+    s = strength * np.maximum(0.0, 1.0 - np.minimum(1.0, arrays.drag))
+    if bounds is not None:
+        lo, hi = bounds
+        p = arrays.position
+        inside = ((p >= lo) & (p <= hi)).all(axis=1)
+        s = np.where(inside, s, 0.0)
+    out = np.empty((arrays.n, 3), dtype=np.float64)
+    out[:, 0] = d[0] * s
+    out[:, 1] = d[1] * s
+    out[:, 2] = d[2] * s
+    return out
+
+def parse_attraction_well(params: Dict[str, Any]) -> Tuple[Vec3, float, float, float]:
+    cx, cy, cz = params.get("position", [0, 0, 0])
+    return ((float(cx), float(cy), float(cz)),
+            float(params.get("strength", 2.0)),
+            float(params.get("radius", 5.0)),
+            float(params.get("falloff_power", 2.0)))
+
+def support_attraction_well(parsed: Tuple[Vec3, float, float, float]) -> Tuple[Vec3, Vec3]:
+    (cx, cy, cz), _, radius, _ = parsed
+    r = abs(radius)
+    return (cx - r, cy - r, cz - r), (cx + r, cy + r, cz + r)
+
+def calc_attraction_well_batch(parsed: Tuple[Vec3, float, float, float], arrays: Any) -> Any:
+    (cx, cy, cz), strength, radius, power = parsed
+    p = arrays.position
+    dx = cx - p[:, 0]
+    dy = cy - p[:, 1]
+    dz = cz - p[:, 2]
+    dist = pow_array(dx*dx + dy*dy + dz*dz, 0.5)
+    live = ~((dist <= 1e-6) | (dist > radius))
+    dist = np.where(live, dist, 1.0)
+
+    nd = np.maximum(1e-3, dist / radius)
+    mag = np.zeros(arrays.n, dtype=np.float64)
+    mag[live] = strength * (1.0 / pow_array(nd[live], power))
+    out = np.empty((arrays.n, 3), dtype=np.float64)
+    out[:, 0] = (dx / dist) * mag
+    out[:, 1] = (dy / dist) * mag
+    out[:, 2] = (dz / dist) * mag
+    return out
+
 def default_field_compositor() -> PiFieldCompositor:
     comp = PiFieldCompositor()
     comp.register("wind", calc_wind)
     comp.register("attraction_well", calc_attraction_well)
+    if np is not None:
+        comp.register_batch("wind", calc_wind_batch, parse_wind, support_wind)
+        comp.register_batch("attraction_well", calc_attraction_well_batch, parse_attraction_well,
+                            support_attraction_well)
     return comp
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import json
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from pi_types import PiBody, PiProjection, PiTickResult
+
+# PIFS v1 (binary frame stream, little-endian):
+#   b"PIFS" u16 version, then records: u8 kind, u32 payload length, payload
+#   kind 0 header: UTF-8 JSON {"intents": [...], "bindings": {id: {...}}}
+#   kind 1 frame:  q epoch, q tick, 32s tick hash, u8 keyframe, u32 count,
+#                  count x (u16 id length, id, 3d position[, 4d rotation on keyframes])
+FRAME_MAGIC = b"PIFS"
+FRAME_VERSION = 1
+RECORD_HEADER = 0
+RECORD_FRAME = 1
+
+FRAME_FORMATS = ("ndjson", "binary")
+
+# bytes buffered before a write to the underlying stream
+FLUSH_BYTES = 1 << 20
+
+def _bindings(b: PiBody) -> Dict[str, Any]:
+    return {"flags": list(b.flags), "@dom_key": b.dom_key, "@bind_dom": b.bind_dom, "@role": b.role}
+
+class PiFrameWriter:
+    """
+    Buffered frame sink for headless runs (file or pipe, π-only).
+    - "ndjson": compact JSON per line; first line carries the intents
+    - "binary": PIFS v1 records; the header carries intents + static bindings,
+      frames carry positions (rotation too on keyframes)
+    """
+    def __init__(self, stream: BinaryIO, fmt: str = "ndjson") -> None:
+        if fmt not in FRAME_FORMATS:
+            raise ValueError(f"unknown π frame format: {fmt!r}")
+        self.stream = stream
+        self.fmt = fmt
+        self.frames = 0
+        self._buf = bytearray()
+        if fmt == "binary":
+            self._buf += FRAME_MAGIC + struct.pack("<H", FRAME_VERSION)
+
+    def _write(self, data: bytes) -> None:
+        self._buf += data
+        if len(self._buf) >= FLUSH_BYTES:
+            self.flush()
+
+    def _json_line(self, obj: Dict[str, Any]) -> None:
+        self._write(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    def _record(self, kind: int, payload: bytes) -> None:
+        self._write(struct.pack("<BI", kind, len(payload)) + payload)
+
+    def header(self, intents: List[Dict[str, Any]], bodies: List[PiBody]) -> None:
+        if self.fmt == "ndjson":
+            self._json_line({"intents": intents})
+            return
+        meta = {"intents": intents, "bindings": {b.id: _bindings(b) for b in bodies}}
+        self._record(RECORD_HEADER, json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    def frame(self, res: PiTickResult, projection: Optional[PiProjection] = None) -> None:
+        proj = projection if projection is not None else res.projection
+        self.frames += 1
+        if self.fmt == "ndjson":
+            self._json_line({
+                "epoch": res.epoch,
+                "tick": res.tick,
+                "tick_hash": res.tick_hash,
+                "keyframe": proj.keyframe,
+                "projection": proj.bodies
+            })
+            return
+        parts = [struct.pack("<qq32sBI", res.epoch, res.tick, bytes.fromhex(res.tick_hash),
+                             1 if proj.keyframe else 0, len(proj.bodies))]
+        for bid, entry in proj.bodies.items():
+            raw = bid.encode("utf-8")
+            p = entry["position"]
+            parts.append(struct.pack("<H", len(raw)) + raw + struct.pack("<3d", p[0], p[1], p[2]))
+            if proj.keyframe:
+                r = entry["rotation"]
+                parts.append(struct.pack("<4d", r[0], r[1], r[2], r[3]))
+        self._record(RECORD_FRAME, b"".join(parts))
+
+    def flush(self) -> None:
+        if self._buf:
+            self.stream.write(bytes(self._buf))
+            self._buf.clear()
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+def read_frames(stream: BinaryIO) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Decode a PIFS v1 stream -> ("header", meta) then ("frame", {epoch, tick, tick_hash, keyframe, projection}).
+    """
+    head = stream.read(6)
+    if len(head) != 6 or head[:4] != FRAME_MAGIC:
+        raise ValueError("not a π frame stream")
+    (version,) = struct.unpack("<H", head[4:])
+    if version != FRAME_VERSION:
+        raise ValueError(f"unsupported π frame stream version: {version}")
+    while True:
+        rec = stream.read(5)
+        if not rec:
+            return
+        kind, n = struct.unpack("<BI", rec)
+        payload = stream.read(n)
+        if len(payload) != n:
+            raise ValueError("truncated π frame stream")
+        if kind == RECORD_HEADER:
+            yield "header", json.loads(payload.decode("utf-8"))
+            continue
+        if kind != RECORD_FRAME:
+            raise ValueError(f"unknown π frame record: {kind}")
+        epoch, tick, h, key, count = struct.unpack_from("<qq32sBI", payload, 0)
+        off = struct.calcsize("<qq32sBI")
+        bodies: Dict[str, Dict[str, Any]] = {}
+        for _ in range(count):
+            (ln,) = struct.unpack_from("<H", payload, off)
+            off += 2
+            bid = payload[off:off + ln].decode("utf-8")
+            off += ln
+            entry: Dict[str, Any] = {"position": list(struct.unpack_from("<3d", payload, off))}
+            off += 24
+            if key:
+                entry["rotation"] = list(struct.unpack_from("<4d", payload, off))
+                off += 32
+            bodies[bid] = entry
+        yield "frame", {"epoch": epoch, "tick": tick, "tick_hash": h.hex(), "keyframe": bool(key), "projection": bodies}
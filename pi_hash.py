@@ -1,7 +1,8 @@
 from __future__ import annotations
-import hashlib, json
-from typing import Any, Dict, List, Tuple
-from pi_types import PiBody, PiConstraint, Vec3
+import hashlib, json, struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pi_types import PiBody, PiBodyEdits, PiConstraint, Vec3
+from pi_soa import np
 
 def _round_vec3(v: Vec3, nd: int = 8) -> Tuple[float, float, float]:
     return (round(v[0], nd), round(v[1], nd), round(v[2], nd))
@@ -20,7 +21,7 @@ def canonical_state_snapshot(epoch: int, tick: int, bodies: List[PiBody], constr
             "p": _round_vec3(body.position),
             "v": _round_vec3(body.velocity),
             "m": round(body.mass, 8),
-            "f": sorted(body.flags),
+            "f": sorted(body.flag_names),
         })
     b.sort(key=lambda x: x["id"])
 
@@ -45,3 +46,326 @@ def canonical_state_snapshot(epoch: int, tick: int, bodies: List[PiBody], constr
 def sha256_json(obj: Dict[str, Any]) -> str:
     s = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+# -------------------- Binary canonical encoding (hash_encoding="binary") --------------------
+# PISB v1, little-endian:
+#   header   magic "PISB", u16 version, u16 reserved, i64 epoch, i64 tick
+#   strings  u32 count, then (u32 len, utf-8) sorted: body ids, flags, constraint ids/types/ends
+#   bodies   u32 count (sorted by id), u32 id refs, i64 x7 per body (p.xyz, v.xyz, m),
+#            u32 flag count per body, then u32 flag refs (each body's flags sorted)
+#   cons     u32 count (sorted by id), per constraint u32 id/type/a/b refs + u32 len + canonical JSON params
+# Quantisation: q = round(x * 1e8) (ties-to-even) saturated to +-2**62; NaN -> -2**63.
+
+SNAPSHOT_MAGIC = b"PISB"
+SNAPSHOT_VERSION = 1
+QUANT_SCALE = 100000000.0
+_Q_MAX = 2 ** 62
+_Q_NAN = -(2 ** 63)
+
+def quantize(x: float) -> int:
+    if x != x:
+        return _Q_NAN
+    y = x * QUANT_SCALE
+    if y >= _Q_MAX:
+        return _Q_MAX
+    if y <= -_Q_MAX:
+        return -_Q_MAX
+    return round(y)
+
+def quantize_array(x: Any) -> Any:
+    """
+    Element-wise quantize() -> int64 (rint is ties-to-even, like round()).
+    """
+    y = x * QUANT_SCALE
+    nan = np.isnan(y)
+    q = np.rint(np.clip(np.where(nan, 0.0, y), -_Q_MAX, _Q_MAX)).astype(np.int64)
+    q[nan] = _Q_NAN
+    return q
+
+def _pack_str(s: str) -> bytes:
+    b = s.encode("utf-8")
+    return struct.pack("<I", len(b)) + b
+
+def _unpack_str(data: bytes, off: int) -> Tuple[str, int]:
+    (n,) = struct.unpack_from("<I", data, off)
+    off += 4
+    return data[off:off + n].decode("utf-8"), off + n
+
+class PiBinaryEncoder:
+    """
+    Canonical binary snapshot for a fixed body/constraint set. Ids and constraints
+    are frozen while a kernel runs; the string table, id refs and flag section are
+    rebuilt when body flags change (checked when edits.version moves, or on every
+    encode without an edit log).
+    """
+    def __init__(self, bodies: List[PiBody], constraints: List[PiConstraint],
+                 edits: Optional[PiBodyEdits] = None) -> None:
+        self.order = sorted(range(len(bodies)), key=lambda i: bodies[i].id)
+        self._cons = sorted(constraints, key=lambda c: c.id)
+        self._edits = edits
+        self._version = -1
+        self._flag_key: List[Tuple[str, ...]] = []
+        self._order_rows: Any = np.asarray(self.order, dtype=np.int64) if np is not None else None
+        self._index(bodies, [bodies[i].flag_names for i in self.order])
+
+    def _index(self, bodies: List[PiBody], flag_key: List[Tuple[str, ...]]) -> None:
+        self._flag_key = flag_key
+        cons = self._cons
+        strings = set()
+        for b in bodies:
+            strings.add(b.id)
+            strings.update(b.flag_names)
+        for c in cons:
+            strings.update((c.id, c.type, c.a, c.b))
+        table = sorted(strings)
+        ref = {s: i for i, s in enumerate(table)}
+        self._strings = struct.pack("<I", len(table)) + b"".join(_pack_str(s) for s in table)
+
+        flags = [sorted(fl) for fl in flag_key]
+        self._ids = struct.pack(f"<I{len(self.order)}I", len(self.order), *(ref[bodies[i].id] for i in self.order))
+        flag_refs = [ref[f] for fl in flags for f in fl]
+        self._flags = (struct.pack(f"<{len(flags)}I", *(len(fl) for fl in flags))
+                       + struct.pack(f"<{len(flag_refs)}I", *flag_refs))
+
+        parts = [struct.pack("<I", len(cons))]
+        for c in cons:
+            params = json.dumps(c.params, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            parts.append(struct.pack("<IIIII", ref[c.id], ref[c.type], ref[c.a], ref[c.b], len(params)) + params)
+        self.constraints_section = b"".join(parts)
+
+    def _check_flags(self, bodies: List[PiBody]) -> None:
+        if self._edits is not None:
+            if self._edits.version == self._version:
+                return
+            self._version = self._edits.version
+        key = [bodies[i].flag_names for i in self.order]
+        if key != self._flag_key:
+            self._index(bodies, key)
+
+    def encode(self, epoch: int, tick: int, bodies: List[PiBody], arrays: Any = None) -> bytes:
+        """
+        arrays: optional PiBodyArrays in sync with bodies (vectorised quantisation).
+        """
+        self._check_flags(bodies)
+        head = struct.pack("<4sHHqq", SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, epoch, tick)
+        if arrays is not None:
+            vals = np.concatenate([arrays.position, arrays.velocity, arrays.mass[:, None]], axis=1)
+            state = quantize_array(vals[self._order_rows].reshape(-1)).astype("<i8").tobytes()
+        else:
+            q: List[int] = []
+            for i in self.order:
+                b = bodies[i]
+                p = b.position
+                v = b.velocity
+                q.extend((quantize(p[0]), quantize(p[1]), quantize(p[2]),
+                          quantize(v[0]), quantize(v[1]), quantize(v[2]), quantize(b.mass)))
+            state = struct.pack(f"<{len(q)}q", *q)
+        return head + self._strings + self._ids + state + self._flags + self.constraints_section
+
+def canonical_state_binary(epoch: int, tick: int, bodies: List[PiBody], constraints: List[PiConstraint]) -> bytes:
+    """
+    Binary counterpart of canonical_state_snapshot (PISB v1).
+    """
+    return PiBinaryEncoder(bodies, constraints).encode(epoch, tick, bodies)
+
+def decode_state_binary(data: bytes) -> Dict[str, Any]:
+    """
+    PISB -> snapshot-shaped dict (floats are q / 1e8; saturated values stay saturated).
+    """
+    magic, version, _, epoch, tick = struct.unpack_from("<4sHHqq", data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a π binary snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported π snapshot version: {version}")
+    off = struct.calcsize("<4sHHqq")
+
+    (ns,) = struct.unpack_from("<I", data, off)
+    off += 4
+    table: List[str] = []
+    for _ in range(ns):
+        s, off = _unpack_str(data, off)
+        table.append(s)
+
+    (nb,) = struct.unpack_from("<I", data, off)
+    off += 4
+    ids = struct.unpack_from(f"<{nb}I", data, off)
+    off += 4 * nb
+    q = struct.unpack_from(f"<{nb * 7}q", data, off)
+    off += 8 * nb * 7
+    counts = struct.unpack_from(f"<{nb}I", data, off)
+    off += 4 * nb
+    refs = struct.unpack_from(f"<{sum(counts)}I", data, off)
+    off += 4 * sum(counts)
+
+    def val(k: int) -> float:
+        return float("nan") if q[k] == _Q_NAN else q[k] / QUANT_SCALE
+
+    bodies = []
+    r = 0
+    for i in range(nb):
+        k = 7 * i
+        bodies.append({
+            "id": table[ids[i]],
+            "p": (val(k), val(k + 1), val(k + 2)),
+            "v": (val(k + 3), val(k + 4), val(k + 5)),
+            "m": val(k + 6),
+            "f": [table[x] for x in refs[r:r + counts[i]]],
+        })
+        r += counts[i]
+
+    (nc,) = struct.unpack_from("<I", data, off)
+    off += 4
+    cons = []
+    for _ in range(nc):
+        cid, ct, ca, cb, n = struct.unpack_from("<IIIII", data, off)
+        off += 20
+        cons.append({"id": table[cid], "t": table[ct], "a": table[ca], "b": table[cb],
+                     "p": json.loads(data[off:off + n].decode("utf-8"))})
+        off += n
+
+    return {"epoch": epoch, "tick": tick, "bodies": bodies, "constraints": cons}
+
+def sha256_binary(prev_hash: str, data: bytes) -> str:
+    return hashlib.sha256(prev_hash.encode("ascii") + data).hexdigest()
+
+def write_snapshot(path: str, epoch: int, tick: int, bodies: List[PiBody], constraints: List[PiConstraint],
+                   encoding: str = "json") -> None:
+    if encoding == "binary":
+        data = canonical_state_binary(epoch, tick, bodies, constraints)
+    elif encoding == "json":
+        data = _canonical_bytes(canonical_state_snapshot(epoch, tick, bodies, constraints))
+    else:
+        raise ValueError(f"unknown π hash encoding: {encoding!r}")
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _sha256(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+def _canonical_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _body_leaf(body: PiBody) -> Dict[str, Any]:
+    # same record canonical_state_snapshot emits per body
+    return {
+        "id": body.id,
+        "p": _round_vec3(body.position),
+        "v": _round_vec3(body.velocity),
+        "m": round(body.mass, 8),
+        "f": sorted(body.flag_names),
+    }
+
+def _body_leaf_binary(body: PiBody) -> Tuple[Any, ...]:
+    p = body.position
+    v = body.velocity
+    return (body.id, quantize(p[0]), quantize(p[1]), quantize(p[2]),
+            quantize(v[0]), quantize(v[1]), quantize(v[2]), quantize(body.mass), tuple(sorted(body.flag_names)))
+
+def _leaf_bytes_binary(leaf: Tuple[Any, ...]) -> bytes:
+    flags = leaf[8]
+    return (_pack_str(leaf[0]) + struct.pack("<7qH", *leaf[1:8], len(flags))
+            + b"".join(_pack_str(f) for f in flags))
+
+class PiMerkleSealer:
+    """
+    Incremental seal (seal_mode="merkle").
+    - one leaf per body, stable id order fixed at construction
+    - a leaf is rehashed only when its raw state (position, velocity, mass, flags)
+      changed AND its rounded record differs
+    - inner nodes are recomputed along changed paths only
+    - constraint subtree hash is computed once (PiConstraint list is frozen)
+    json:   seal = sha256_json({prev, epoch, tick, bodies: root, constraints: root})
+    binary: leaves are PISB body records, seal = sha256(prev + epoch/tick + both roots)
+    Not hash-compatible with the full-snapshot seal; chains record which mode produced them.
+    """
+    def __init__(self, bodies: List[PiBody], constraints: List[PiConstraint], encoding: str = "json") -> None:
+        if encoding == "json":
+            self._leaf_of, self._leaf_bytes = _body_leaf, _canonical_bytes
+        elif encoding == "binary":
+            self._leaf_of, self._leaf_bytes = _body_leaf_binary, _leaf_bytes_binary
+        else:
+            raise ValueError(f"unknown π hash encoding: {encoding!r}")
+        self.encoding = encoding
+        self.order = sorted(range(len(bodies)), key=lambda i: bodies[i].id)
+        self._slot = [0] * len(bodies)  # body index -> leaf slot
+        for slot, i in enumerate(self.order):
+            self._slot[i] = slot
+
+        self._raw: List[Any] = [None] * len(bodies)
+        self._leaf: List[Any] = [None] * len(bodies)
+        self._levels: List[List[bytes]] = []
+
+        if encoding == "binary":
+            self.constraints_root = hashlib.sha256(PiBinaryEncoder([], constraints).constraints_section).hexdigest()
+        else:
+            snap = canonical_state_snapshot(0, 0, [], constraints)
+            self.constraints_root = hashlib.sha256(_canonical_bytes(snap["constraints"])).hexdigest()
+
+    def _build(self, leaves: List[bytes]) -> None:
+        levels = [leaves]
+        while len(levels[-1]) > 1:
+            prev = levels[-1]
+            nxt = [_sha256(prev[k] + prev[k + 1]) if k + 1 < len(prev) else prev[k]
+                   for k in range(0, len(prev), 2)]
+            levels.append(nxt)
+        self._levels = levels
+
+    def _update_paths(self, slots: List[int]) -> None:
+        dirty = sorted(set(slots))
+        for lv in range(len(self._levels) - 1):
+            prev = self._levels[lv]
+            nxt = self._levels[lv + 1]
+            parents = sorted(set(s // 2 for s in dirty))
+            for k in parents:
+                left = 2 * k
+                nxt[k] = _sha256(prev[left] + prev[left + 1]) if left + 1 < len(prev) else prev[left]
+            dirty = parents
+
+    def root(self) -> str:
+        if not self._levels or not self._levels[0]:
+            return hashlib.sha256(b"").hexdigest()
+        return self._levels[-1][0].hex()
+
+    def seal(self, prev_hash: str, epoch: int, tick: int, bodies: List[PiBody],
+             changed: Optional[Iterable[int]] = None) -> str:
+        """
+        changed: optional hint of body indices whose raw state may differ since
+        the last seal (backends that track it avoid the per-body compare).
+        """
+        if not self._levels:
+            leaves = [b""] * len(bodies)
+            for i, b in enumerate(bodies):
+                self._raw[i] = (b.position, b.velocity, b.mass, b.flag_names)
+                self._leaf[i] = self._leaf_of(b)
+                leaves[self._slot[i]] = _sha256(self._leaf_bytes(self._leaf[i]))
+            self._build(leaves)
+        else:
+            rows = range(len(bodies)) if changed is None else changed
+            dirty: List[int] = []
+            leaves = self._levels[0]
+            for i in rows:
+                b = bodies[i]
+                raw = (b.position, b.velocity, b.mass, b.flag_names)
+                if raw == self._raw[i]:
+                    continue
+                self._raw[i] = raw
+                leaf = self._leaf_of(b)
+                if leaf == self._leaf[i]:
+                    continue  # moved below hash precision
+                self._leaf[i] = leaf
+                slot = self._slot[i]
+                leaves[slot] = _sha256(self._leaf_bytes(leaf))
+                dirty.append(slot)
+            if dirty:
+                self._update_paths(dirty)
+
+        if self.encoding == "binary":
+            return sha256_binary(prev_hash, SNAPSHOT_MAGIC + struct.pack("<qq", epoch, tick)
+                                 + bytes.fromhex(self.root()) + bytes.fromhex(self.constraints_root))
+        return sha256_json({
+            "prev": prev_hash,
+            "epoch": epoch,
+            "tick": tick,
+            "bodies": self.root(),
+            "constraints": self.constraints_root
+        })
@@ -1,13 +1,22 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from pi_types import (
-    PiWorldSpec, PiBody, PiConstraint, PiEvent, PiProjection, PiTickResult,
-    Vec3, vadd, vmul
+    PiWorldSpec, PiBody, PiBodyEdits, PiConstraint, PiEvent, PiProjection, PiTickResult,
+    PiKernelConfig, Vec3, vadd, vmul
 )
 from pi_fields import default_field_compositor
-from pi_constraints import solve_springs
-from pi_symbolic import extract_symbolic_intents
-from pi_hash import canonical_state_snapshot, sha256_json
+from pi_lattice import PiFieldLattice, bake_lattice
+from pi_constraints import PiSpringGraph, compile_springs, solve_compiled_springs
+from pi_soa import PiBodyArrays, np
+from pi_spatial import PiSpatialGrid, finite_support
+from pi_solver import PiPositionSolver, PiPositionSolverArrays
+from pi_sleep import PiSleepManager
+from pi_events import PiEventQueue
+from pi_metrics import PiMetrics, run_step
+from pi_symbolic import PiSymbolicIndex
+from pi_hash import PiBinaryEncoder, PiMerkleSealer, canonical_state_snapshot, sha256_binary, sha256_json
+
+EPOCH_TICKS = 60
 
 class PiKernel:
     """
@@ -19,7 +28,9 @@ class PiKernel:
     - Does NOT fetch URLs
     - Does NOT project visuals (only emits projection state)
     """
-    def __init__(self, world: PiWorldSpec, bodies: List[PiBody], constraints: List[PiConstraint], tree: Dict[str, Any]) -> None:
+    def __init__(self, world: PiWorldSpec, bodies: List[PiBody], constraints: List[PiConstraint], tree: Dict[str, Any],
+                 config: Optional[PiKernelConfig] = None) -> None:
+        self.config = config or PiKernelConfig()
         self.world = world
         self.bodies = bodies
         self.constraints = constraints
@@ -29,77 +40,263 @@ class PiKernel:
         self.tick = 0
         self.prev_hash = "0" * 64
 
-        self.events: List[PiEvent] = []  # kernel-owned event queue
         self.field_comp = default_field_compositor()
 
         self._bodies_by_id: Dict[str, PiBody] = {b.id: b for b in self.bodies}
+        self._rows: Dict[str, int] = {b.id: i for i, b in enumerate(self.bodies)}
+
+        # kernel-owned event queue, coalesced per body; `events` still accepts raw appends
+        # mass/static caches below are updated in place by _apply_edits() after host edits
+        self.body_edits = PiBodyEdits(self.bodies)
+        self._static = [b.is_static() for b in self.bodies]
+        self._mass = [b.mass for b in self.bodies]
+        self.event_queue = PiEventQueue(self._rows, self._static)
+        self.events: List[PiEvent] = []
+        self.events_applied = 0  # lifetime count of coalesced per-body event applications
+
+        # opt-in instrumentation (host-owned); None = plain step calls
+        self.metrics: Optional[PiMetrics] = None
+        self._n_dynamic = sum(1 for b in self.bodies if not b.is_static())
+
+        # optional structure-of-arrays backend (numpy); same locked order + hash chain
+        if self.config.backend == "soa":
+            self._soa: Optional[PiBodyArrays] = PiBodyArrays(self.bodies)
+        elif self.config.backend == "python":
+            self._soa = None
+        else:
+            raise ValueError(f"unknown π backend: {self.config.backend!r}")
+        self._grid: Optional[PiSpatialGrid] = None
+
+        # "lattice": custom fields baked into a voxel grid, rebaked only when the field list changes
+        if self.config.field_mode == "lattice":
+            if self._soa is None:
+                raise ValueError("π lattice field mode needs the soa backend")
+        elif self.config.field_mode != "exact":
+            raise ValueError(f"unknown π field mode: {self.config.field_mode!r}")
+        self._lattice: Optional[PiFieldLattice] = None
+        self._lattice_key: Optional[Tuple[int, ...]] = None
+        self._lattice_refs: Tuple[Any, ...] = ()  # keyed objects held: their ids cannot be reused
+
+        # constraints are frozen: resolve ids + parse params once
+        self._springs = compile_springs(self._bodies_by_id, self.constraints)
+        self._spring_graph = PiSpringGraph(self._soa, self.constraints) if self._soa is not None else None
+
+        # "pbd": springs/distance/rope are projected after integration instead of applied as forces
+        self._solver: Any = None
+        if world.solver_mode == "pbd":
+            if self._soa is not None:
+                self._solver = PiPositionSolverArrays(self._soa, self.constraints)
+            else:
+                self._solver = PiPositionSolver(self.bodies, self.constraints)
+        elif world.solver_mode != "force":
+            raise ValueError(f"unknown π solver mode: {world.solver_mode!r}")
+
+        # optional island sleeping: at-rest islands drop out of every locked step
+        self._sleep: Optional[PiSleepManager] = None
+        self._sleep_version = -1
+        self._sleep_key: Optional[Tuple[int, ...]] = None
+        self._sleep_refs: Tuple[Any, ...] = ()  # keyed objects held: their ids cannot be reused
+        self._active: List[PiBody] = self.bodies  # PiBody backend: bodies stepped this tick
+        self._active_springs = self._springs
+        self._awake_rows: List[int] = []
+        self._tick_rows: List[int] = []  # rows stepped this tick (may have changed)
+        self._tick_v0: Any = None
+        self._unsealed_rows: Set[int] = set()  # PiBody backend merkle hint
+        self._proj_cache: Dict[str, Dict[str, Any]] = {}
+        if self.config.sleep:
+            self._sleep = PiSleepManager(self.bodies, self.constraints, self.config.sleep_ticks)
+
+        if self.config.projection_mode not in ("full", "delta", "none"):
+            raise ValueError(f"unknown π projection mode: {self.config.projection_mode!r}")
+        self._keyframe_due = True
+        self._proj_last: Any = None  # delta: last emitted position per row
+
+        encoding = self.config.hash_encoding
+        if encoding not in ("json", "binary"):
+            raise ValueError(f"unknown π hash encoding: {encoding!r}")
+        self._merkle: Optional[PiMerkleSealer] = None
+        self._encoder: Optional[PiBinaryEncoder] = None
+        if self.config.seal_mode == "merkle":
+            self._merkle = PiMerkleSealer(self.bodies, self.constraints, encoding)
+        elif self.config.seal_mode != "json":
+            raise ValueError(f"unknown π seal mode: {self.config.seal_mode!r}")
+        elif encoding == "binary":
+            self._encoder = PiBinaryEncoder(self.bodies, self.constraints, self.body_edits)
+        self._seal_requested = False
 
         # symbolic scan produces intents (not actions) — this is safe and deterministic
-        self.symbolic_intents: List[PiEvent] = extract_symbolic_intents(self.tree)
+        # (indexed: edit the tree through self.symbolic to keep intents current)
+        self.symbolic = PiSymbolicIndex(self.tree)
+
+    @property
+    def symbolic_intents(self) -> List[PiEvent]:
+        return self.symbolic.intents()
 
     def enqueue_event(self, ev: PiEvent) -> None:
-        self.events.append(ev)
+        self._check_edits()
+        self.event_queue.push(ev)
 
-    # -------------------- Tick Steps (Locked Order) --------------------
+    def enqueue_events(self, events: List[PiEvent]) -> int:
+        self._check_edits()
+        return self.event_queue.extend(events)
 
-    def step_fields(self) -> None:
-        fields = self.world.fields
-        for b in self.bodies:
-            if b.is_static():
-                continue
-            # gravity (mass-scaled)
-            g = self.world.gravity
-            b.force = vadd(b.force, (g[0] * b.mass, g[1] * b.mass, g[2] * b.mass))
+    def enqueue_actions(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Bulk π.event actions: [{"target": body_id, "action": {type, magnitude, direction}}, ...].
+        """
+        self._check_edits()
+        return self.event_queue.push_actions(items)
 
-            # air drag (simple)
-            if self.world.air_density > 0.0:
-                # quadratic-ish drag term scaled by body.drag
-                vx, vy, vz = b.velocity
-                speed2 = vx*vx + vy*vy + vz*vz
-                drag_mag = 0.5 * self.world.air_density * speed2 * max(0.0, b.drag)
-                b.force = vadd(b.force, (-drag_mag * vx, -drag_mag * vy, -drag_mag * vz))
+    def _check_edits(self) -> None:
+        if self.body_edits.pending:
+            self._apply_edits(self.body_edits.drain())
 
-            # custom fields (wind, wells, etc.)
-            ff = self.field_comp.total_force(fields, b)
-            b.force = vadd(b.force, ff)
+    def _apply_edits(self, edited: List[PiBody]) -> None:
+        """
+        Host edited body.mass / body.flags: update the caches derived from them for
+        the edited rows (event targets, soa mass/static rows, spring ends, solver
+        inverse masses, sleep islands), so all backends keep stepping the same bodies.
+        """
+        rix = self._rows
+        rows = sorted(rix[b.id] for b in edited if rix.get(b.id) is not None)
+        flipped = False
+        for i in rows:
+            b = self.bodies[i]
+            static = b.is_static()
+            if static != self._static[i]:
+                flipped = True
+                self._static[i] = static  # in place: the event queue shares this list
+            self._mass[i] = b.mass
+        if flipped:
+            self._n_dynamic = self._static.count(False)
+            q = self.event_queue
+            for acc in (q.impulse, q.force):
+                for i in [i for i in acc if self._static[i]]:
+                    del acc[i]
+                    q.dropped += 1
+
+        if self._merkle is not None and self._soa is None:
+            self._unsealed_rows.update(rows)  # mass/flags are sealed: reseal edited leaves
+        if self._soa is not None:
+            self._soa.mark_dirty(rows)
+            if self._soa.refresh_rows(self.bodies, rows):
+                self._grid = None
+                if self._spring_graph is not None:
+                    self._spring_graph.refresh_static()
+            if self._solver is not None:
+                self._solver.refresh_mass(self._soa)
+        elif self._solver is not None:
+            self._solver.refresh_mass()
+        if self._sleep is not None:
+            if flipped:
+                self._sleep = PiSleepManager(self.bodies, self.constraints, self.config.sleep_ticks)
+            self._select_awake()
+
+    def _collect_events(self) -> None:
+        if self.events:
+            self.event_queue.extend(self.events)
+            self.events = []
+
+    def wake(self, body_id: Optional[str] = None) -> None:
+        """
+        Wake the island holding body_id (or every island). No-op without sleeping.
+        """
+        if self._sleep is None:
+            return
+        if body_id is None:
+            self._sleep.wake_all()
+            return
+        row = self._rows.get(body_id)
+        if row is not None:
+            self._sleep.wake_row(row)
+
+    def enable_metrics(self, metrics: Optional[PiMetrics] = None) -> PiMetrics:
+        """
+        Attach per-step timers, counters and hooks (see pi_metrics.PiMetrics).
+        """
+        self.metrics = metrics or PiMetrics()
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        self.metrics = None
+
+    def request_keyframe(self) -> None:
+        """
+        Delta projection: make the next tick emit a full keyframe (late-joining consumers).
+        """
+        self._keyframe_due = True
+
+    def request_seal(self) -> None:
+        """
+        Make the next tick seal whatever the seal cadence (e.g. the last tick of a run,
+        so the reported hash covers the final state).
+        """
+        self._seal_requested = True
+
+    # -------------------- Tick Steps (Locked Order) --------------------
+
+    def step_fields(self) -> None:
+        if self._soa is not None:
+            self._step_fields_soa(self._soa)
+            return
+        # gravity + quadratic-ish air drag (scaled by body.drag) + custom fields, fused per world
+        pipe = self.field_comp.compile_bodies(self.world)
+        grid = None
+        if np is not None and self.config.spatial_index and pipe.terms:
+            supports = [s for s in pipe.supports if s is not None]
+            if supports:
+                # grid rows index self._active (reset whenever the awake set changes)
+                position = np.array([b.position for b in self._active], dtype=np.float64).reshape(-1, 3)
+                grid = self._spatial_grid(position, range(len(self._active)), supports)
+        pipe.apply(self._active, grid)
 
     def step_symbolic_forces(self) -> None:
         """
         Events -> forces. Kernel-owned. No JS.
+        The queue is coalesced per body, so this is one update per touched body.
         """
-        for ev in self.events:
-            if ev.type == "impulse" and ev.target:
-                b = self._bodies_by_id.get(ev.target)
-                if not b or b.is_static():
-                    continue
-                imp = ev.payload.get("impulse", [0, 0, 0])
-                ix, iy, iz = float(imp[0]), float(imp[1]), float(imp[2])
-                # impulse converted into velocity delta
-                if b.mass > 0:
-                    b.velocity = (b.velocity[0] + ix / b.mass,
-                                  b.velocity[1] + iy / b.mass,
-                                  b.velocity[2] + iz / b.mass)
-
-            elif ev.type == "attraction" and ev.target:
-                b = self._bodies_by_id.get(ev.target)
-                if not b or b.is_static():
-                    continue
-                f = ev.payload.get("force", [0, 0, 0])
-                b.force = vadd(b.force, (float(f[0]), float(f[1]), float(f[2])))
-
-            # route_intent is emitted as intent; it is NOT executed here.
-            # It can be surfaced to higher layers as “available actions”.
-
-        self.events = []
+        # route_intent is emitted as intent; it is NOT executed here.
+        # It can be surfaced to higher layers as “available actions”.
+        self._collect_events()
+        impulse, force = self.event_queue.drain()
+        if not impulse and not force:
+            return
+        self.events_applied += len(impulse) + len(force)
+        if self._soa is not None:
+            self._step_symbolic_forces_soa(self._soa, impulse, force)
+            return
+        bodies = self.bodies
+        for i, (ix, iy, iz) in impulse.items():
+            b = bodies[i]
+            # impulse converted into velocity delta (queue only holds dynamic bodies: mass > 0)
+            b.velocity = (b.velocity[0] + ix / b.mass,
+                          b.velocity[1] + iy / b.mass,
+                          b.velocity[2] + iz / b.mass)
+        for i, f in force.items():
+            b = bodies[i]
+            b.force = vadd(b.force, (f[0], f[1], f[2]))
 
     def step_constraints(self) -> None:
-        solve_springs(self._bodies_by_id, self.constraints)
+        if self._solver is not None:
+            # pbd: remember pre-integration positions; projection runs after step_integrate
+            if self._soa is not None:
+                self._solver.capture(self._soa)
+            else:
+                self._solver.capture()
+            return
+        if self._spring_graph is not None:
+            self._spring_graph.apply(self._soa)
+            return
+        solve_compiled_springs(self._active_springs)
 
     def step_integrate(self, dt: float) -> None:
         """
         Semi-implicit Euler (locked default).
         """
-        for b in self.bodies:
+        if self._soa is not None:
+            self._step_integrate_soa(self._soa, dt)
+            return
+        for b in self._active:
             if b.is_static():
                 b.force = (0.0, 0.0, 0.0)
                 continue
@@ -123,24 +320,139 @@ class PiKernel:
 
             b.force = (0.0, 0.0, 0.0)
 
+    def step_solve_positions(self, dt: float) -> None:
+        """
+        pbd only: solver_iterations XPBD passes on predicted positions, then v = dx / dt.
+        """
+        iterations = max(1, int(self.world.solver_iterations))
+        if self._soa is not None:
+            self._solver.project(self._soa, dt, iterations)
+        else:
+            self._solver.project(dt, iterations)
+
     def step_projection(self) -> PiProjection:
         """
         Output only: CSS-VER reads this. Kernel does not render.
+        With sleeping on, entries of bodies that did not step are reused.
         """
+        if self.config.projection_mode == "delta":
+            return self._step_projection_delta()
+        if self.config.projection_mode == "none":
+            return PiProjection(bodies={}, keyframe=False)
+        if self._sleep is not None and self._proj_cache:
+            cache = self._proj_cache
+            for i in self._tick_rows:
+                b = self.bodies[i]
+                cache[b.id] = self._project_body(b)
+            return PiProjection(bodies=dict(cache))
         out: Dict[str, Dict[str, Any]] = {}
         for b in self.bodies:
-            out[b.id] = {
-                "position": [b.position[0], b.position[1], b.position[2]],
-                "rotation": [b.rotation[0], b.rotation[1], b.rotation[2], b.rotation[3]],
-                "scale": [1.0, 1.0, 1.0],
-                "flags": list(b.flags),
-                "@dom_key": b.dom_key,
-                "@bind_dom": b.bind_dom,
-                "@role": b.role
-            }
+            out[b.id] = self._project_body(b)
+        if self._sleep is not None:
+            self._proj_cache = dict(out)
         return PiProjection(bodies=out)
 
+    def full_projection(self) -> PiProjection:
+        """
+        Keyframe of the current state, outside the tick (does not touch delta tracking).
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        for b in self.bodies:
+            out[b.id] = self._project_body(b)
+        return PiProjection(bodies=out, keyframe=True)
+
+    def _step_projection_delta(self) -> PiProjection:
+        """
+        Keyframes carry every body with its full entry (rotation, flags, bindings).
+        Other ticks carry {"position"} for bodies that moved beyond projection_epsilon
+        since they were last emitted. Rotation and bindings are not stepped by the
+        kernel, so host edits to them go out with the next keyframe.
+        """
+        every = self.config.keyframe_every
+        if self._keyframe_due or (every > 0 and self.tick % every == 0):
+            self._keyframe_due = False
+            out: Dict[str, Dict[str, Any]] = {}
+            for b in self.bodies:
+                out[b.id] = self._project_body(b)
+            if self._soa is not None:
+                self._proj_last = self._soa.position.copy()
+            else:
+                self._proj_last = [b.position for b in self.bodies]
+            return PiProjection(bodies=out, keyframe=True)
+
+        # with sleeping on, only rows stepped this tick can have moved
+        rows: Any = self._tick_rows if self._sleep is not None else None
+        eps = self.config.projection_epsilon
+        out = {}
+        if self._soa is not None:
+            arr = self._soa
+            last = self._proj_last
+            if rows is None:
+                moved = np.flatnonzero(~(np.abs(arr.position - last) <= eps).all(axis=1))
+            else:
+                r = np.asarray(rows, dtype=np.int64)
+                moved = r[~(np.abs(arr.position[r] - last[r]) <= eps).all(axis=1)]
+            p = arr.position[moved]
+            last[moved] = p
+            ids = arr.ids
+            for i, pos in zip(moved.tolist(), p.tolist()):
+                out[ids[i]] = {"position": pos}
+            return PiProjection(bodies=out, keyframe=False)
+
+        last = self._proj_last
+        for i in (range(len(self.bodies)) if rows is None else rows):
+            b = self.bodies[i]
+            p = b.position
+            q = last[i]
+            if p == q:
+                continue
+            if abs(p[0] - q[0]) <= eps and abs(p[1] - q[1]) <= eps and abs(p[2] - q[2]) <= eps:
+                continue
+            last[i] = p
+            out[b.id] = {"position": [p[0], p[1], p[2]]}
+        return PiProjection(bodies=out, keyframe=False)
+
+    @staticmethod
+    def _project_body(b: PiBody) -> Dict[str, Any]:
+        return {
+            "position": [b.position[0], b.position[1], b.position[2]],
+            "rotation": [b.rotation[0], b.rotation[1], b.rotation[2], b.rotation[3]],
+            "scale": [1.0, 1.0, 1.0],
+            "flags": list(b.flags),
+            "@dom_key": b.dom_key,
+            "@bind_dom": b.bind_dom,
+            "@role": b.role
+        }
+
+    def seal_due(self) -> bool:
+        """
+        Seal cadence for the tick about to complete (counters not yet advanced).
+        """
+        if self._seal_requested:
+            return True
+        n = self.tick + 1
+        every = self.config.seal_every
+        if every > 0 and n % every == 0:
+            return True
+        return self.config.seal_epochs and n % EPOCH_TICKS == 0
+
     def step_seal(self) -> str:
+        self._seal_requested = False
+        if self._merkle is not None:
+            changed: Optional[List[int]] = None
+            if self._soa is not None:
+                changed = self._soa.changed_rows()
+            elif self._sleep is not None:
+                # sleeping bodies never move: only rows stepped since the last seal
+                changed = sorted(self._unsealed_rows)
+            self._unsealed_rows = set()
+            h = self._merkle.seal(self.prev_hash, self.epoch, self.tick, self.bodies, changed)
+            self.prev_hash = h
+            return h
+        if self._encoder is not None:
+            h = sha256_binary(self.prev_hash, self._encoder.encode(self.epoch, self.tick, self.bodies, self._soa))
+            self.prev_hash = h
+            return h
         snap = canonical_state_snapshot(self.epoch, self.tick, self.bodies, self.constraints)
         h = sha256_json({
             "prev": self.prev_hash,
@@ -149,26 +461,232 @@ class PiKernel:
         self.prev_hash = h
         return h
 
+    # -------------------- SoA Backend (same math, whole-array ops) --------------------
+    # Expressions keep the PiBody path's operand order so float results are bit-identical.
+
+    def _step_fields_soa(self, arr: PiBodyArrays) -> None:
+        d = arr.dyn
+        g = self.world.gravity
+        m = arr.mass[d]
+        F = arr.force[d]
+        F[:, 0] += g[0] * m
+        F[:, 1] += g[1] * m
+        F[:, 2] += g[2] * m
+
+        if self.world.air_density > 0.0:
+            v = arr.velocity[d]
+            vx, vy, vz = v[:, 0], v[:, 1], v[:, 2]
+            speed2 = vx*vx + vy*vy + vz*vz
+            drag_mag = 0.5 * self.world.air_density * speed2 * np.maximum(0.0, arr.drag[d])
+            F[:, 0] += -drag_mag * vx
+            F[:, 1] += -drag_mag * vy
+            F[:, 2] += -drag_mag * vz
+
+        fields = self.world.fields
+        if fields and self.config.field_mode == "lattice":
+            lattice = self._field_lattice(fields)
+            F += lattice.sample(arr.position[d], arr.drag[d])
+            fields = lattice.rest
+        if fields:
+            plan = self.field_comp.compile(fields)
+            if plan.needs_bodies:
+                # per-body fallback callables read PiBody state: sync first
+                arr.write_back(self.bodies)
+            index = self._spatial_grid(arr.position, arr.dyn_rows, plan.supports)
+            rows = d if self._sleep is not None and not isinstance(d, slice) else None
+            F += self.field_comp.total_force_batch(fields, arr, self.bodies, index, rows)[d]
+        arr.force[d] = F
+
+    def _field_lattice(self, fields: List[Dict[str, Any]]) -> PiFieldLattice:
+        # same immutability rule as PiFieldCompositor.compile(): replace the list/dict to rebake
+        key = (id(fields),) + tuple(id(f) for f in fields)
+        if self._lattice is None or key != self._lattice_key:
+            self._lattice = bake_lattice(self.field_comp, fields, self.config.lattice_resolution,
+                                         self.config.lattice_bounds)
+            self._lattice_key = key
+            self._lattice_refs = (fields,) + tuple(fields)
+        return self._lattice
+
+    def _spatial_grid(self, position: Any, rows: Any, supports: List[Tuple[Vec3, Vec3]]) -> Optional[PiSpatialGrid]:
+        # unbounded supports (inf/NaN bounds) are full scans: they take no part in the grid
+        supports = [s for s in supports if finite_support(*s)]
+        if not self.config.spatial_index or not supports:
+            return None
+        cell = self.config.spatial_cell
+        if cell <= 0.0:
+            half = sorted(max(hi[0] - lo[0], hi[1] - lo[1], hi[2] - lo[2]) * 0.5 for lo, hi in supports)
+            cell = max(1e-6, half[len(half) // 2])
+        if self._grid is None or self._grid.cell_size != cell:
+            # only stepped (dynamic, awake) rows ever receive field forces
+            self._grid = PiSpatialGrid(cell, list(rows))
+        self._grid.update(position)
+        return self._grid
+
+    def _step_symbolic_forces_soa(self, arr: PiBodyArrays, impulse: Dict[int, List[float]],
+                                  force: Dict[int, List[float]]) -> None:
+        if impulse:
+            rows = list(impulse)
+            imp = np.array(list(impulse.values()), dtype=np.float64)
+            arr.velocity[rows] = arr.velocity[rows] + imp / arr.mass[rows][:, None]
+        if force:
+            rows = list(force)
+            arr.force[rows] = arr.force[rows] + np.array(list(force.values()), dtype=np.float64)
+
+    def _step_integrate_soa(self, arr: PiBodyArrays, dt: float) -> None:
+        d = arr.dyn
+        m = arr.mass[d][:, None]
+        v = arr.velocity[d] + (arr.force[d] / m) * dt
+        arr.velocity[d] = v
+        arr.position[d] = arr.position[d] + v * dt
+        arr.force.fill(0.0)
+
+    # -------------------- Sleeping (islands at rest skip every step) --------------------
+
+    def _select_awake(self) -> None:
+        rows = self._sleep.awake_rows()
+        awake = [False] * len(self.bodies)
+        for i in rows:
+            awake[i] = True
+        if self._soa is not None:
+            mask = np.asarray(awake, dtype=bool)
+            self._soa.select(rows)
+            self._grid = None
+            self._spring_graph.select(mask)
+            if self._solver is not None:
+                self._solver.select(mask)
+        else:
+            rix = self._rows
+            self._active = [self.bodies[i] for i in rows]
+            self._grid = None
+            self._active_springs = [s for s in self._springs if awake[rix[s[0].id]] or awake[rix[s[1].id]]]
+            if self._solver is not None:
+                self._solver.select(awake)
+        self._awake_rows = rows
+        self._sleep_version = self._sleep.version
+
+    def _sleep_begin(self) -> None:
+        """
+        Wake islands touched since the last tick (field change, queued impulses/forces),
+        then remember awake velocities for the at-rest test.
+        """
+        sleep = self._sleep
+        fields = self.world.fields
+        key = (id(self.world), id(fields)) + tuple(id(f) for f in fields)
+        if key != self._sleep_key:
+            if self._sleep_key is not None:
+                sleep.wake_all()
+            self._sleep_key = key
+            self._sleep_refs = (self.world, fields) + tuple(fields)
+        self._collect_events()
+        for row in self.event_queue.rows():
+            sleep.wake_row(row)
+        if sleep.version != self._sleep_version:
+            self._select_awake()
+
+        rows = self._awake_rows
+        self._tick_rows = rows
+        if self._merkle is not None and self._soa is None:
+            self._unsealed_rows.update(rows)
+        if self._soa is not None:
+            self._tick_v0 = self._soa.velocity[rows]
+        else:
+            self._tick_v0 = [self.bodies[i].velocity for i in rows]
+
+    def _sleep_end(self, dt: float) -> None:
+        """
+        At rest: |v| < sleep_velocity and m * |dv| / dt < sleep_force over the tick.
+        Islands that fall asleep get zero velocity and leave the stepped set.
+        """
+        sleep = self._sleep
+        rows = self._tick_rows
+        lim_v = self.config.sleep_velocity * self.config.sleep_velocity
+        fdt = self.config.sleep_force * dt
+        lim_f = fdt * fdt
+
+        if self._soa is not None:
+            arr = self._soa
+            v = arr.velocity[rows]
+            q = self._tick_v0
+            vx, vy, vz = v[:, 0], v[:, 1], v[:, 2]
+            dx, dy, dz = vx - q[:, 0], vy - q[:, 1], vz - q[:, 2]
+            m = arr.mass[rows]
+            v2 = vx*vx + vy*vy + vz*vz
+            dv2 = dx*dx + dy*dy + dz*dz
+            quiet = (v2 < lim_v) & ((m * m) * dv2 < lim_f)
+            loud = np.asarray(rows, dtype=np.int64)[~quiet].tolist()
+        else:
+            loud = []
+            for k, i in enumerate(rows):
+                b = self.bodies[i]
+                vx, vy, vz = b.velocity
+                q = self._tick_v0[k]
+                dx, dy, dz = vx - q[0], vy - q[1], vz - q[2]
+                v2 = vx*vx + vy*vy + vz*vz
+                dv2 = dx*dx + dy*dy + dz*dz
+                if not (v2 < lim_v and (b.mass * b.mass) * dv2 < lim_f):
+                    loud.append(i)
+
+        slept = sleep.update(loud)
+        if not slept:
+            return
+        zero = (0.0, 0.0, 0.0)
+        for isl in slept:
+            members = sleep.members[isl]
+            for i in members:
+                self.bodies[i].velocity = zero
+            if self._soa is not None:
+                self._soa.velocity[members] = 0.0
+        self._select_awake()
+
+    def _count_metrics(self, m: PiMetrics, sub: int, sealed: bool, events: int) -> None:
+        rows = len(self._tick_rows) if self._sleep is not None else self._n_dynamic
+        if self._solver is not None:
+            iters = max(1, int(self.world.solver_iterations)) + 1
+            live = len(self._solver.a) if self._soa is not None else len(self._solver.active)
+            springs = live * iters
+        else:
+            springs = self._spring_graph.n if self._spring_graph is not None else len(self._active_springs)
+        m.count(seals=int(sealed), bodies_touched=rows * sub, fields_evaluated=len(self.world.fields) * rows * sub,
+                springs_solved=springs * sub, events_applied=events)
+        m.end_tick()
+
     # -------------------- Public API --------------------
 
     def tick_once(self) -> PiTickResult:
         dt = self.world.dt
         sub = max(1, int(self.world.substeps))
         sub_dt = dt / sub
+        m = self.metrics
+        step = m.run if m is not None else run_step
+        applied = self.events_applied
+
+        self._check_edits()
+        if self._sleep is not None:
+            step("sleep", self._sleep_begin)
 
         for _ in range(sub):
             # LOCKED ORDER
-            self.step_fields()
-            self.step_symbolic_forces()
-            self.step_constraints()
-            self.step_integrate(sub_dt)
+            step("fields", self.step_fields)
+            step("symbolic_forces", self.step_symbolic_forces)
+            step("constraints", self.step_constraints)
+            step("integrate", self.step_integrate, sub_dt)
+            if self._solver is not None:
+                step("solve_positions", self.step_solve_positions, sub_dt)
+
+        if self._soa is not None:
+            step("write_back", self._soa.write_back, self.bodies)
+        if self._sleep is not None:
+            step("sleep", self._sleep_end, dt)
 
-        proj = self.step_projection()
-        h = self.step_seal()
+        proj = step("projection", self.step_projection)
+        sealed = self.seal_due()
+        h = step("seal", self.step_seal) if sealed else self.prev_hash
+        if m is not None:
+            self._count_metrics(m, sub, sealed, self.events_applied - applied)
 
         # advance counters (epoch policy can be tuned later, but kernel-owned)
         self.tick += 1
-        if self.tick % 60 == 0:
+        if self.tick % EPOCH_TICKS == 0:
             self.epoch += 1
 
         return PiTickResult(
@@ -176,5 +694,6 @@ class PiKernel:
             tick=self.tick,
             projection=proj,
             tick_hash=h,
-            prev_hash=self.prev_hash
+            prev_hash=self.prev_hash,
+            sealed=sealed
         )
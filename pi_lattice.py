@@ -0,0 +1,248 @@
+from __future__ import annotations
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pi_types import Vec3
+from pi_soa import np, require_numpy
+from pi_spatial import finite_support
+from pi_fields import (PiFieldCompositor, parse_wind, calc_attraction_well_batch,
+                       calc_wind_batch, parse_attraction_well, support_attraction_well)
+
+FALLOFFS = ("linear", "quadratic", "exponential")
+EXP_FALLOFF_RATE = 3.0  # exponential falloff: exp(-rate * t), t = normalised distance from the bounds centre
+
+_M1 = 0x9E3779B97F4A7C15
+_M2 = 0xC2B2AE3D27D4EB4F
+_M3 = 0x165667B19E3779F9
+_MASK = (1 << 64) - 1
+_BITS = 0x1FFFFF  # 21 bits per noise component
+
+class _Points:
+    """
+    Minimal body-array stand-in for batch calculators: lattice nodes with zero drag.
+    """
+    def __init__(self, position: Any) -> None:
+        self.position = position
+        self.n = int(position.shape[0])
+        self.drag = np.zeros(self.n, dtype=np.float64)
+
+def _hash3(ix: Any, iy: Any, iz: Any, seed: int) -> Any:
+    # integer hash of lattice corners (splitmix64 finaliser); uint64 wraps, platform independent
+    u = np.uint64
+    h = (ix.astype(np.int64).astype(u) * u(_M1)) ^ (iy.astype(np.int64).astype(u) * u(_M2)) \
+        ^ (iz.astype(np.int64).astype(u) * u(_M3)) ^ u(seed & _MASK)
+    h ^= h >> u(30)
+    h *= u(0xBF58476D1CE4E5B9)
+    h ^= h >> u(27)
+    h *= u(0x94D049BB133111EB)
+    h ^= h >> u(31)
+    return h
+
+def value_noise(q: Any, seed: int) -> Any:
+    """
+    Seeded 3D value noise, (m, 3) coords -> (m, 3) in [-1, 1].
+    Corner values come from an integer hash (no RNG state), blended with smoothstep weights.
+    """
+    i0 = np.floor(q)
+    f = q - i0
+    w = f * f * (3.0 - 2.0 * f)
+    out = np.zeros(q.shape, dtype=np.float64)
+    for cx in (0, 1):
+        wx = w[:, 0] if cx else 1.0 - w[:, 0]
+        for cy in (0, 1):
+            wy = w[:, 1] if cy else 1.0 - w[:, 1]
+            for cz in (0, 1):
+                wz = w[:, 2] if cz else 1.0 - w[:, 2]
+                h = _hash3(i0[:, 0] + cx, i0[:, 1] + cy, i0[:, 2] + cz, seed)
+                wt = wx * wy * wz
+                for c, shift in ((0, 0), (1, 21), (2, 42)):
+                    v = ((h >> np.uint64(shift)) & np.uint64(_BITS)).astype(np.float64) * (2.0 / _BITS) - 1.0
+                    out[:, c] += wt * v
+    return out
+
+def parse_wind_texture(params: Dict[str, Any]) -> Tuple[float, Optional[str], int, float]:
+    """
+    -> (turbulence, falloff, seed, turbulence_scale). Only explicit parameters count:
+    a wind without them stays the uniform field the exact path computes.
+    """
+    turbulence = min(1.0, max(0.0, float(params.get("turbulence", 0.0))))
+    falloff = params.get("falloff")
+    if falloff is not None and falloff not in FALLOFFS:
+        raise ValueError(f"unknown π wind falloff: {falloff!r}")
+    scale = float(params.get("turbulence_scale", 4.0))
+    if scale <= 0.0:
+        raise ValueError(f"π wind turbulence_scale must be > 0: {scale!r}")
+    return turbulence, falloff, int(params.get("seed", 0)), scale
+
+def bake_wind(params: Dict[str, Any], points: Any) -> Any:
+    """
+    Wind at lattice nodes before the per-body drag factor -> (m, 3).
+    - turbulence: direction jittered by seeded value noise (scale = turbulence_scale), renormalised
+    - falloff: strength scaled by distance from the bounds centre (needs bounds)
+    """
+    d, strength, bounds = parse_wind(params)
+    turbulence, falloff, seed, scale = parse_wind_texture(params)
+    m = points.shape[0]
+    vec = np.empty((m, 3), dtype=np.float64)
+    vec[:] = d
+    if turbulence > 0.0:
+        vec += turbulence * value_noise(points / scale, seed)
+        norm = np.sqrt(vec[:, 0]*vec[:, 0] + vec[:, 1]*vec[:, 1] + vec[:, 2]*vec[:, 2])
+        ok = norm > 1e-12
+        vec[ok] /= norm[ok][:, None]
+        vec[~ok] = 0.0
+    s = np.full(m, strength, dtype=np.float64)
+    if bounds is not None:
+        lo = np.asarray(bounds[0], dtype=np.float64)
+        hi = np.asarray(bounds[1], dtype=np.float64)
+        if falloff is not None:
+            c = (lo + hi) * 0.5
+            r = math.sqrt(float(((hi - lo) * 0.5) @ ((hi - lo) * 0.5)))
+            rel = points - c
+            t = np.minimum(1.0, np.sqrt((rel * rel).sum(axis=1)) / max(r, 1e-12))
+            if falloff == "linear":
+                s *= 1.0 - t
+            elif falloff == "quadratic":
+                s *= (1.0 - t) * (1.0 - t)
+            else:
+                s *= np.exp(-EXP_FALLOFF_RATE * t)
+        inside = ((points >= lo) & (points <= hi)).all(axis=1)
+        s = np.where(inside, s, 0.0)
+    return vec * s[:, None]
+
+class PiFieldLattice:
+    """
+    Custom fields baked into a 3D voxel grid (PiKernelConfig.field_mode = "lattice").
+    - one table of 6 channels per node: position-only force | wind before the drag factor
+    - sample(): trilinear, two lookups per body however many fields are layered
+    - outside the grid bounded fields are exactly zero; unbounded winds stay uniform
+    - rest: fields with no baker (custom calculators) or an unbounded support
+      (radius=inf, non-finite bounds), still evaluated per body
+    Approximate by construction: hashes differ from field_mode="exact".
+    """
+    def __init__(self, fields: List[Dict[str, Any]], lo: Vec3, cell: float, shape: Tuple[int, int, int],
+                 table: Any, wind_in: Vec3, wind_out: Vec3, rest: List[Dict[str, Any]]) -> None:
+        self.fields = fields  # kept alive: the cache key holds ids
+        self.lo = np.asarray(lo, dtype=np.float64)
+        self.cell = cell
+        self.shape = shape
+        self.table = table  # (nx * ny * nz, 6); empty when nothing needed baking
+        self.wind_in = np.asarray(wind_in, dtype=np.float64)  # uniform winds, inside the grid
+        self.wind_out = np.asarray(wind_out, dtype=np.float64)  # + textured unbounded winds, outside
+        self.rest = rest
+        self._top = np.asarray(shape, dtype=np.float64) - 1.0
+        nx, ny, nz = shape
+        self._last = np.array((nx - 2, ny - 2, nz - 2), dtype=np.intp)  # lowest corner of the last cell
+        sx, sy = ny * nz, nz
+        self._corners = np.array((0, 1, sy, sy + 1, sx, sx + 1, sx + sy, sx + sy + 1), dtype=np.intp)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.table.nbytes)
+
+    def sample(self, position: Any, drag: Any) -> Any:
+        n = position.shape[0]
+        s = np.maximum(0.0, 1.0 - np.minimum(1.0, drag))
+        out = np.empty((n, 3), dtype=np.float64)
+        out[:] = self.wind_out
+        out *= s[:, None]
+        if not self.table.shape[0] or not n:
+            return out
+        g = (position - self.lo) / self.cell
+        inside = ((g >= 0.0) & (g <= self._top)).all(axis=1)  # NaN rows fall outside
+        if not inside.any():
+            return out
+        g = g[inside]
+        nx, ny, nz = self.shape
+        i = np.minimum(g.astype(np.intp), self._last)  # g >= 0: truncation is floor
+        f = g - i
+        a = (i[:, 0] * ny + i[:, 1]) * nz + i[:, 2]
+        corners = self.table[a[:, None] + self._corners]  # (m, 8, 6), one gather
+        fx, fy, fz = f[:, 0], f[:, 1], f[:, 2]
+        gx, gy, gz = 1.0 - fx, 1.0 - fy, 1.0 - fz
+        w = np.stack([gx*gy*gz, gx*gy*fz, gx*fy*gz, gx*fy*fz, fx*gy*gz, fx*gy*fz, fx*fy*gz, fx*fy*fz], axis=1)
+        v = np.einsum("mk,mkc->mc", w, corners)
+        si = s[inside][:, None]
+        out[inside] = v[:, 0:3] + (v[:, 3:6] + self.wind_in) * si
+        return out
+
+def bake_lattice(comp: PiFieldCompositor, fields: List[Dict[str, Any]], resolution: int = 32,
+                 bounds: Optional[Sequence[Sequence[float]]] = None) -> PiFieldLattice:
+    """
+    Bake the bakeable fields of a world (stock wind / attraction_well batch calculators).
+    Grid bounds: `bounds` ((lo, hi)) if given, else the union of bounded field supports,
+    padded by one cell; `resolution` cells span the longest axis (cubic cells).
+    """
+    require_numpy()
+    if resolution < 1:
+        raise ValueError(f"π lattice resolution must be >= 1: {resolution!r}")
+    wells: List[Any] = []
+    winds: List[Dict[str, Any]] = []
+    rest: List[Dict[str, Any]] = []
+    supports: List[Tuple[Vec3, Vec3]] = []
+    wind_in = [0.0, 0.0, 0.0]
+    textured: List[Tuple[Dict[str, Any], Vec3, float]] = []  # unbounded winds with turbulence
+    for f in fields:
+        ft = f.get("field_type")
+        params = f.get("parameters", {})
+        batch = comp.batch_calculator(ft)
+        calc = batch[1] if batch is not None else None
+        if calc is calc_attraction_well_batch:
+            parsed = parse_attraction_well(params)
+            support = support_attraction_well(parsed)
+            if not finite_support(*support):
+                rest.append(f)  # no finite grid covers it
+                continue
+            wells.append(parsed)
+            supports.append(support)
+        elif calc is calc_wind_batch:
+            d, strength, wb = parse_wind(params)
+            turbulence = parse_wind_texture(params)[0]
+            if wb is not None and not finite_support(*wb):
+                rest.append(f)
+            elif wb is not None:
+                winds.append(params)
+                supports.append(wb)
+            elif turbulence > 0.0:
+                textured.append((params, d, strength))
+            else:
+                for k in range(3):
+                    wind_in[k] += d[k] * strength
+        elif ft is not None and (batch is not None or comp.calculator(ft) is not None):
+            rest.append(f)
+
+    if bounds is None and not supports:
+        for _, d, strength in textured:  # no grid to texture them over: uniform
+            for k in range(3):
+                wind_in[k] += d[k] * strength
+        textured = []
+    wind_out = list(wind_in)
+    for params, d, strength in textured:  # textured inside the grid, uniform outside it
+        winds.append(params)
+        for k in range(3):
+            wind_out[k] += d[k] * strength
+    if bounds is not None:
+        lo = tuple(float(x) for x in bounds[0])
+        hi = tuple(float(x) for x in bounds[1])
+        if not finite_support(lo, hi):
+            raise ValueError(f"π lattice bounds must be finite: {bounds!r}")
+    elif supports:
+        lo = tuple(min(s[0][k] for s in supports) for k in range(3))
+        hi = tuple(max(s[1][k] for s in supports) for k in range(3))
+    if not (wells or winds):
+        return PiFieldLattice(fields, (0.0, 0.0, 0.0), 1.0, (2, 2, 2), np.zeros((0, 6), dtype=np.float64),
+                              tuple(wind_in), tuple(wind_out), rest)
+
+    cell = max(1e-6, max(hi[k] - lo[k] for k in range(3)) / resolution)
+    shape = tuple(int(math.ceil((hi[k] - lo[k]) / cell)) + 3 for k in range(3))  # nodes, one padding cell a side
+    lo = (lo[0] - cell, lo[1] - cell, lo[2] - cell)
+    axes = [lo[k] + cell * np.arange(shape[k], dtype=np.float64) for k in range(3)]
+    gx, gy, gz = np.meshgrid(axes[0], axes[1], axes[2], indexing="ij")
+    pts = np.stack([gx.ravel(), gy.ravel(), gz.ravel()], axis=1)
+
+    table = np.zeros((pts.shape[0], 6), dtype=np.float64)
+    nodes = _Points(pts)
+    for parsed in wells:
+        table[:, 0:3] += calc_attraction_well_batch(parsed, nodes)
+    for params in winds:
+        table[:, 3:6] += bake_wind(params, pts)
+    return PiFieldLattice(fields, lo, cell, shape, table, tuple(wind_in), tuple(wind_out), rest)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+PreHook = Callable[[str], None]
+PostHook = Callable[[str, float], None]  # (step, seconds)
+
+# Prometheus histogram bucket bounds (seconds)
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+COUNTERS = ("ticks", "seals", "bodies_touched", "fields_evaluated", "springs_solved", "events_applied")
+
+def run_step(name: str, fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Uninstrumented step call (PiKernel default when metrics are off).
+    """
+    return fn(*args)
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+class PiMetrics:
+    """
+    Opt-in kernel instrumentation (host-owned; never part of hashed state).
+    - run(): per-step perf_counter_ns timer + pre/post hooks
+    - end_tick(): folds per-tick step totals into rolling windows and lifetime
+      histogram buckets, bumps counters
+    - snapshot() -> JSON-able dict over the rolling window
+    - prometheus() -> text exposition format: lifetime (monotonic) histogram,
+      rolling-window quantiles as gauges
+    Attach with PiKernel.enable_metrics(); detached kernels pay one call per step.
+    """
+    def __init__(self, window: int = 600) -> None:
+        self.window = max(1, int(window))
+        self.counters: Dict[str, int] = {c: 0 for c in COUNTERS}
+        self.totals: Dict[str, float] = {}  # lifetime seconds per step
+        self.samples: Dict[str, Deque[float]] = {}  # rolling per-tick seconds per step
+        self.buckets: Dict[str, List[int]] = {}  # lifetime per-bucket counts per step (BUCKETS + overflow)
+        self.observed: Dict[str, int] = {}  # lifetime samples per step
+        self._tick: Dict[str, int] = {}  # ns accumulated this tick (substeps add up)
+        self._pre: List[PreHook] = []
+        self._post: List[PostHook] = []
+
+    def add_hook(self, pre: Optional[PreHook] = None, post: Optional[PostHook] = None) -> None:
+        if pre is not None:
+            self._pre.append(pre)
+        if post is not None:
+            self._post.append(post)
+
+    def run(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        for h in self._pre:
+            h(name)
+        t = time.perf_counter_ns()
+        try:
+            return fn(*args)
+        finally:
+            dt = time.perf_counter_ns() - t
+            self._tick[name] = self._tick.get(name, 0) + dt
+            for p in self._post:
+                p(name, dt / 1e9)
+
+    def count(self, **deltas: int) -> None:
+        for k, v in deltas.items():
+            self.counters[k] = self.counters.get(k, 0) + int(v)
+
+    def _observe(self, name: str, s: float) -> None:
+        self.totals[name] = self.totals.get(name, 0.0) + s
+        win = self.samples.get(name)
+        if win is None:
+            win = self.samples[name] = deque(maxlen=self.window)
+            self.buckets[name] = [0] * (len(BUCKETS) + 1)
+            self.observed[name] = 0
+        win.append(s)
+        self.buckets[name][bisect_left(BUCKETS, s)] += 1
+        self.observed[name] += 1
+
+    def end_tick(self) -> None:
+        total = 0
+        for name, ns in self._tick.items():
+            total += ns
+            self._observe(name, ns / 1e9)
+        self._observe("tick", total / 1e9)
+        self._tick = {}
+        self.counters["ticks"] += 1
+
+    def reset(self) -> None:
+        self.counters = {c: 0 for c in COUNTERS}
+        self.totals = {}
+        self.samples = {}
+        self.buckets = {}
+        self.observed = {}
+        self._tick = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        steps: Dict[str, Dict[str, float]] = {}
+        for name, win in self.samples.items():
+            vals = sorted(win)
+            steps[name] = {
+                "last_ms": win[-1] * 1000.0 if win else 0.0,
+                "mean_ms": sum(vals) * 1000.0 / len(vals) if vals else 0.0,
+                "p50_ms": _percentile(vals, 0.50) * 1000.0,
+                "p90_ms": _percentile(vals, 0.90) * 1000.0,
+                "p99_ms": _percentile(vals, 0.99) * 1000.0,
+                "max_ms": vals[-1] * 1000.0 if vals else 0.0,
+                "total_ms": self.totals.get(name, 0.0) * 1000.0,
+                "samples": len(vals),
+            }
+        return {"window": self.window, "counters": dict(self.counters), "steps": steps}
+
+    def prometheus(self, prefix: str = "pi") -> str:
+        lines: List[str] = []
+        for name in COUNTERS:
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {self.counters.get(name, 0)}")
+        metric = f"{prefix}_step_seconds"
+        lines.append(f"# HELP {metric} Per-tick seconds per locked step since the last reset.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name in sorted(self.buckets):
+            n = 0
+            for le, k in zip(BUCKETS, self.buckets[name]):
+                n += k
+                lines.append(f'{metric}_bucket{{step="{name}",le="{le}"}} {n}')
+            lines.append(f'{metric}_bucket{{step="{name}",le="+Inf"}} {self.observed[name]}')
+            lines.append(f'{metric}_sum{{step="{name}"}} {self.totals.get(name, 0.0)!r}')
+            lines.append(f'{metric}_count{{step="{name}"}} {self.observed[name]}')
+        metric = f"{prefix}_step_window_seconds"
+        lines.append(f"# HELP {metric} Per-tick seconds per locked step, quantiles over the rolling window.")
+        lines.append(f"# TYPE {metric} gauge")
+        for name in sorted(self.samples):
+            vals = sorted(self.samples[name])
+            for q in (0.5, 0.9, 0.99):
+                lines.append(f'{metric}{{step="{name}",quantile="{q}"}} {_percentile(vals, q)!r}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,107 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List
+from pi_types import PiBody, PiConstraint
+
+# constraint types that couple bodies into one island
+ISLAND_TYPES = ("spring", "distance", "rope")
+
+class PiSleepManager:
+    """
+    Island sleep bookkeeping (kernel-owned, deterministic).
+    - islands = connected components of spring/distance/rope constraints over
+      dynamic bodies (static anchors never merge islands)
+    - an island sleeps after `window` consecutive quiet ticks
+    - islands wake as a unit (events, field changes, explicit wake)
+    The kernel decides what "quiet" means per body; this class only tracks islands.
+    """
+    def __init__(self, bodies: List[PiBody], constraints: List[PiConstraint], window: int) -> None:
+        n = len(bodies)
+        self.window = max(1, int(window))
+        self.dynamic = [not b.is_static() for b in bodies]
+        index = {b.id: i for i, b in enumerate(bodies)}
+
+        parent = list(range(n))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for c in constraints:
+            if c.type not in ISLAND_TYPES:
+                continue
+            a = index.get(c.a)
+            b = index.get(c.b)
+            if a is None or b is None or not (self.dynamic[a] and self.dynamic[b]):
+                continue
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+
+        # island ids in first-member order (stable across runs)
+        self.island_of: List[int] = [-1] * n
+        self.members: List[List[int]] = []
+        ids: Dict[int, int] = {}
+        for i in range(n):
+            if not self.dynamic[i]:
+                continue
+            r = find(i)
+            if r not in ids:
+                ids[r] = len(self.members)
+                self.members.append([])
+            self.island_of[i] = ids[r]
+            self.members[ids[r]].append(i)
+
+        self.asleep: List[bool] = [False] * len(self.members)
+        self.quiet: List[int] = [0] * len(self.members)
+        self.version = 0  # bumps whenever the awake set changes
+
+    def awake_rows(self) -> List[int]:
+        return [i for i, isl in enumerate(self.island_of) if isl >= 0 and not self.asleep[isl]]
+
+    def is_asleep(self, row: int) -> bool:
+        isl = self.island_of[row]
+        return isl >= 0 and self.asleep[isl]
+
+    def wake_row(self, row: int) -> bool:
+        isl = self.island_of[row]
+        if isl < 0:
+            return False
+        return self.wake_island(isl)
+
+    def wake_island(self, isl: int) -> bool:
+        self.quiet[isl] = 0
+        if not self.asleep[isl]:
+            return False
+        self.asleep[isl] = False
+        self.version += 1
+        return True
+
+    def wake_all(self) -> None:
+        changed = any(self.asleep)
+        self.asleep = [False] * len(self.members)
+        self.quiet = [0] * len(self.members)
+        if changed:
+            self.version += 1
+
+    def update(self, loud_rows: Iterable[int]) -> List[int]:
+        """
+        One tick of evidence: rows (awake, dynamic) that were NOT quiet.
+        Returns the islands that fell asleep on this tick.
+        """
+        loud = set(self.island_of[i] for i in loud_rows)
+        slept: List[int] = []
+        for isl in range(len(self.members)):
+            if self.asleep[isl]:
+                continue
+            if isl in loud:
+                self.quiet[isl] = 0
+                continue
+            self.quiet[isl] += 1
+            if self.quiet[isl] >= self.window:
+                self.asleep[isl] = True
+                slept.append(isl)
+        if slept:
+            self.version += 1
+        return slept
@@ -0,0 +1,145 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Set
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the "soa" backend needs numpy
+    np = None  # type: ignore[assignment]
+
+from pi_types import PiBody
+
+def require_numpy() -> Any:
+    if np is None:
+        raise RuntimeError("π soa backend requires numpy")
+    return np
+
+def pow_array(x: Any, power: float) -> Any:
+    """
+    Element-wise float x ** power, rounded exactly like the PiBody path.
+    numpy's power loops (and sqrt) differ from libm pow in the last ulp, even for
+    0.5 and 2.0, so the scalar operation is applied per element.
+    """
+    if power == 1.0:
+        return x.copy()
+    return np.fromiter((v ** power for v in x.tolist()), dtype=np.float64, count=len(x))
+
+class PiBodyArrays:
+    """
+    Structure-of-arrays body store (π-only, float64, row i == bodies[i]).
+    - Arrays are the authority while the soa backend steps
+    - PiBody objects stay the identity/binding record
+    - write_back() re-syncs dynamic bodies once per tick (projection + seal read them)
+    - dyn / dyn_rows are the rows being stepped (all dynamic rows unless select()ed)
+    """
+    def __init__(self, bodies: List[PiBody]) -> None:
+        require_numpy()
+        n = len(bodies)
+        self.n = n
+        self.ids: List[str] = [b.id for b in bodies]
+        self.index: Dict[str, int] = {bid: i for i, bid in enumerate(self.ids)}
+
+        self.position = np.array([b.position for b in bodies], dtype=np.float64).reshape(n, 3)
+        self.velocity = np.array([b.velocity for b in bodies], dtype=np.float64).reshape(n, 3)
+        self.force = np.array([b.force for b in bodies], dtype=np.float64).reshape(n, 3)
+        self.mass = np.array([b.mass for b in bodies], dtype=np.float64)
+        self.drag = np.array([b.drag for b in bodies], dtype=np.float64)
+
+        # flags + mass are not stepped; refresh_rows() re-reads them after host edits
+        self.static = np.array([b.is_static() for b in bodies], dtype=bool)
+        self.dynamic = ~self.static
+        self._select_dynamic()
+        self._mark: Any = None  # (position, velocity) at the last changed_rows() call
+        self._dirty: Set[int] = set()  # rows edited by the host since then (mass/flags)
+
+    def _select_dynamic(self) -> None:
+        # row selector for dynamic bodies: a plain slice avoids fancy-index copies
+        self.dyn: Any = slice(None) if bool(self.dynamic.all()) else np.flatnonzero(self.dynamic)
+        self.dyn_rows: List[int] = np.flatnonzero(self.dynamic).tolist()
+
+    def refresh_rows(self, bodies: List[PiBody], rows: List[int]) -> bool:
+        """
+        Re-read mass and static state of edited rows (in place: holders of
+        .static/.mass see it). Rows turning dynamic load their PiBody state.
+        -> True if any static bit flipped (dyn is then reset to all dynamic rows).
+        """
+        flipped = False
+        for i in rows:
+            b = bodies[i]
+            static = b.is_static()
+            self.mass[i] = b.mass
+            if static == bool(self.static[i]):
+                continue
+            flipped = True
+            self.static[i] = static
+            self.dynamic[i] = not static
+            if not static:
+                self.position[i] = b.position
+                self.velocity[i] = b.velocity
+                self.force[i] = b.force
+        if flipped:
+            self._select_dynamic()
+        return flipped
+
+    def select(self, rows: List[int]) -> None:
+        """
+        Restrict stepping (dyn / dyn_rows) to a subset of dynamic rows, e.g. awake islands.
+        """
+        self.dyn_rows = list(rows)
+        if len(self.dyn_rows) == self.n:
+            self.dyn = slice(None)
+        else:
+            self.dyn = np.asarray(self.dyn_rows, dtype=np.int64)
+
+    def write_back(self, bodies: List[PiBody]) -> None:
+        """
+        Copy stepped state into PiBody records. Static bodies are never stepped,
+        so their (possibly int-valued) bundle vectors are left untouched.
+        """
+        rows = self.dyn_rows
+        pos = self.position[rows].tolist()
+        vel = self.velocity[rows].tolist()
+        frc = self.force[rows].tolist()
+        for k, i in enumerate(rows):
+            b = bodies[i]
+            b.position = tuple(pos[k])
+            b.velocity = tuple(vel[k])
+            b.force = tuple(frc[k])
+
+    def mark_dirty(self, rows: List[int]) -> None:
+        """
+        Report rows to the next changed_rows() call (host mass/flag edits are not compared).
+        """
+        self._dirty.update(rows)
+
+    def changed_rows(self) -> List[int]:
+        """
+        Rows whose position/velocity changed since the previous call, plus rows
+        passed to mark_dirty() (first call: all).
+        """
+        if self._mark is None:
+            rows = list(range(self.n))
+        else:
+            pos, vel = self._mark
+            rows = np.flatnonzero((self.position != pos).any(axis=1) | (self.velocity != vel).any(axis=1)).tolist()
+            if self._dirty:
+                rows = sorted(self._dirty.union(rows))
+        self._dirty = set()
+        self._mark = (self.position.copy(), self.velocity.copy())
+        return rows
+
+    def take(self, rows: Any) -> "PiBodyRows":
+        return PiBodyRows(self, rows)
+
+class PiBodyRows:
+    """
+    Read-only row subset of a PiBodyArrays (copies), same attribute names,
+    so batch field calculators accept either.
+    """
+    def __init__(self, arrays: PiBodyArrays, rows: Any) -> None:
+        self.n = len(rows)
+        self.rows = rows
+        self.position = arrays.position[rows]
+        self.velocity = arrays.velocity[rows]
+        self.mass = arrays.mass[rows]
+        self.drag = arrays.drag[rows]
+        self.static = arrays.static[rows]
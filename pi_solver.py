@@ -0,0 +1,250 @@
+from __future__ import annotations
+import math
+from typing import Any, Dict, List, Tuple
+from pi_types import PiBody, PiConstraint
+from pi_soa import np, require_numpy
+
+# fraction of last substep's multipliers re-applied before iterating (warm start)
+WARM_START = 0.8
+
+POSITION_TYPES = ("spring", "distance", "rope")
+
+# compiled row: (a, b, is_rope, rest_length, compliance, damping)
+PositionRow = Tuple[int, int, bool, float, float, float]
+
+def compile_position_constraints(index: Dict[str, int], constraints: List[PiConstraint]) -> List[PositionRow]:
+    """
+    spring   -> compliant distance (compliance = 1/stiffness, damping as given)
+    distance -> rigid unless params.compliance > 0
+    rope     -> distance that only pulls (inactive while slack)
+    """
+    rows: List[PositionRow] = []
+    for c in constraints:
+        if c.type not in POSITION_TYPES:
+            continue
+        a = index.get(c.a)
+        b = index.get(c.b)
+        if a is None or b is None:
+            continue
+        p = c.params
+        if c.type == "spring":
+            k = float(p.get("stiffness", 40.0))
+            if k <= 0.0:
+                continue
+            rows.append((a, b, False, float(p.get("rest_length", 1.0)), 1.0 / k, float(p.get("damping", 6.0))))
+        else:
+            rest = float(p.get("length", p.get("rest_length", 1.0)))
+            rows.append((a, b, c.type == "rope", rest, float(p.get("compliance", 0.0)), float(p.get("damping", 0.0))))
+    return rows
+
+class PiPositionSolver:
+    """
+    XPBD position solver (PiBody backend), used when world.solver_mode == "pbd".
+    - Jacobi passes: every row reads the same positions, corrections are
+      averaged per body (accumulated in constraint order, a then b)
+    - multipliers persist across substeps and warm-start the next solve
+    - velocities are re-derived from the projected positions
+    PiPositionSolverArrays performs the same arithmetic, so both backends share a hash chain.
+    """
+    def __init__(self, bodies: List[PiBody], constraints: List[PiConstraint]) -> None:
+        self.bodies = bodies
+        self.inv_mass = [0.0 if b.is_static() else 1.0 / b.mass for b in bodies]
+        self.rows = compile_position_constraints({b.id: i for i, b in enumerate(bodies)}, constraints)
+        self.lam = [0.0] * len(self.rows)
+        self.active: List[int] = list(range(len(self.rows)))
+        self.body_rows: List[int] = [i for i, w in enumerate(self.inv_mass) if w > 0.0]
+        self._prev: List[Any] = []
+
+    def refresh_mass(self) -> None:
+        """
+        Re-read inverse masses after mass/static edits (every dynamic body stepped again).
+        """
+        self.inv_mass = [0.0 if b.is_static() else 1.0 / b.mass for b in self.bodies]
+        self.body_rows = [i for i, w in enumerate(self.inv_mass) if w > 0.0]
+
+    def select(self, awake: List[bool]) -> None:
+        """
+        Only rows touching an awake body are solved; sleeping rows keep their multipliers.
+        """
+        self.active = [j for j, r in enumerate(self.rows) if awake[r[0]] or awake[r[1]]]
+        self.body_rows = [i for i, w in enumerate(self.inv_mass) if w > 0.0 and awake[i]]
+
+    def capture(self) -> None:
+        self._prev = [b.position for b in self.bodies]
+
+    def _pass(self, pos: List[Any], h: float, warm: bool) -> None:
+        inv = self.inv_mass
+        prev = self._prev
+        lam = self.lam
+        h2 = h * h
+        acc: Dict[int, List[float]] = {}
+
+        rows = self.rows
+        for j in self.active:
+            a, b, rope, rest, compliance, damping = rows[j]
+            pa = pos[a]
+            pb = pos[b]
+            dx = pb[0] - pa[0]
+            dy = pb[1] - pa[1]
+            dz = pb[2] - pa[2]
+            L = math.sqrt(dx*dx + dy*dy + dz*dz)
+            C = L - rest
+            wa = inv[a]
+            wb = inv[b]
+            w = wa + wb
+            if L <= 1e-9 or (rope and C <= 0.0) or w <= 0.0:
+                lam[j] = 0.0
+                continue
+            nx = dx / L
+            ny = dy / L
+            nz = dz / L
+
+            if warm:
+                dl = WARM_START * lam[j]
+                lam[j] = dl
+            else:
+                at = compliance / h2
+                gamma = compliance * damping / h
+                qa = prev[a]
+                qb = prev[b]
+                gdx = (nx * ((pb[0] - qb[0]) - (pa[0] - qa[0]))
+                       + ny * ((pb[1] - qb[1]) - (pa[1] - qa[1]))
+                       + nz * ((pb[2] - qb[2]) - (pa[2] - qa[2])))
+                dl = (-C - at * lam[j] - gamma * gdx) / ((1.0 + gamma) * w + at)
+                lam[j] = lam[j] + dl
+
+            sa = -wa * dl
+            sb = wb * dl
+            ca = acc.setdefault(a, [0.0, 0.0, 0.0, 0.0])
+            ca[0] += sa * nx
+            ca[1] += sa * ny
+            ca[2] += sa * nz
+            ca[3] += 1.0
+            cb = acc.setdefault(b, [0.0, 0.0, 0.0, 0.0])
+            cb[0] += sb * nx
+            cb[1] += sb * ny
+            cb[2] += sb * nz
+            cb[3] += 1.0
+
+        for i, (cx, cy, cz, n) in acc.items():
+            if inv[i] <= 0.0:
+                continue
+            p = pos[i]
+            pos[i] = (p[0] + cx / n, p[1] + cy / n, p[2] + cz / n)
+
+    def project(self, h: float, iterations: int) -> None:
+        if not self.rows:
+            return
+        bodies = self.bodies
+        pos = [b.position for b in bodies]
+        self._pass(pos, h, warm=True)
+        for _ in range(iterations):
+            self._pass(pos, h, warm=False)
+
+        prev = self._prev
+        for i in self.body_rows:
+            b = bodies[i]
+            p = pos[i]
+            q = prev[i]
+            b.position = p
+            b.velocity = ((p[0] - q[0]) / h, (p[1] - q[1]) / h, (p[2] - q[2]) / h)
+
+class PiPositionSolverArrays:
+    """
+    PiPositionSolver over a PiBodyArrays store (soa backend), whole-array passes.
+    """
+    def __init__(self, arrays: Any, constraints: List[PiConstraint]) -> None:
+        require_numpy()
+        rows = compile_position_constraints(arrays.index, constraints)
+        self.n = len(rows)
+        self.a = np.asarray([r[0] for r in rows], dtype=np.int64)
+        self.b = np.asarray([r[1] for r in rows], dtype=np.int64)
+        self.rope = np.asarray([r[2] for r in rows], dtype=bool)
+        self.rest = np.asarray([r[3] for r in rows], dtype=np.float64)
+        self.compliance = np.asarray([r[4] for r in rows], dtype=np.float64)
+        self.damping = np.asarray([r[5] for r in rows], dtype=np.float64)
+        self.lam = np.zeros(self.n, dtype=np.float64)
+
+        self.refresh_mass(arrays)
+        self.ends = np.stack([self.a, self.b], axis=1).reshape(-1)
+        self._all = (self.a, self.b, self.rope, self.rest, self.compliance, self.damping)
+        self.sel: Any = None  # active row subset (None = all rows)
+        self._prev: Any = None
+
+    def refresh_mass(self, arrays: Any) -> None:
+        self.inv_mass = np.where(arrays.static, 0.0, 1.0 / np.where(arrays.static, 1.0, arrays.mass))
+
+    def select(self, body_mask: Any) -> None:
+        """
+        PiPositionSolver.select over a bool row mask; multipliers stay indexed by full row.
+        """
+        a, b, rope, rest, compliance, damping = self._all
+        self.sel = np.flatnonzero(body_mask[a] | body_mask[b])
+        s = self.sel
+        self.a, self.b, self.rope = a[s], b[s], rope[s]
+        self.rest, self.compliance, self.damping = rest[s], compliance[s], damping[s]
+        self.ends = np.stack([self.a, self.b], axis=1).reshape(-1)
+
+    def capture(self, arrays: Any) -> None:
+        self._prev = arrays.position.copy()
+
+    def _pass(self, arrays: Any, h: float, warm: bool) -> None:
+        pos = arrays.position
+        pa = pos[self.a]
+        pb = pos[self.b]
+        d = pb - pa
+        dx, dy, dz = d[:, 0], d[:, 1], d[:, 2]
+        L = np.sqrt(dx*dx + dy*dy + dz*dz)
+        C = L - self.rest
+        wa = self.inv_mass[self.a]
+        wb = self.inv_mass[self.b]
+        w = wa + wb
+        live = ~((L <= 1e-9) | (self.rope & (C <= 0.0)) | (w <= 0.0))
+        safe = np.where(live, L, 1.0)
+        n = d / safe[:, None]
+
+        lam0 = self.lam if self.sel is None else self.lam[self.sel]
+        if warm:
+            dl = WARM_START * lam0
+            lam = dl
+        else:
+            at = self.compliance / (h * h)
+            gamma = self.compliance * self.damping / h
+            q = self._prev
+            g = (pb - q[self.b]) - (pa - q[self.a])
+            gdx = n[:, 0] * g[:, 0] + n[:, 1] * g[:, 1] + n[:, 2] * g[:, 2]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                dl = (-C - at * lam0 - gamma * gdx) / ((1.0 + gamma) * w + at)
+            lam = lam0 + dl
+        if self.sel is None:
+            self.lam = np.where(live, lam, 0.0)
+        else:
+            self.lam[self.sel] = np.where(live, lam, 0.0)
+
+        sa = -wa * dl
+        sb = wb * dl
+        vals = np.stack([sa[:, None] * n, sb[:, None] * n], axis=1).reshape(-1, 3)
+        keep = np.repeat(live, 2)
+        rows = self.ends[keep]
+        vals = vals[keep]
+
+        acc = np.zeros((arrays.n, 4), dtype=np.float64)
+        flat = acc.reshape(-1)
+        base = rows * 4
+        # ufunc.at applies indices in order: same accumulation order as PiPositionSolver
+        np.add.at(flat, base, vals[:, 0])
+        np.add.at(flat, base + 1, vals[:, 1])
+        np.add.at(flat, base + 2, vals[:, 2])
+        np.add.at(flat, base + 3, 1.0)
+
+        m = np.flatnonzero((acc[:, 3] > 0.0) & (self.inv_mass > 0.0))
+        pos[m] = pos[m] + acc[m, :3] / acc[m, 3:4]
+
+    def project(self, arrays: Any, h: float, iterations: int) -> None:
+        if not self.n:
+            return
+        self._pass(arrays, h, warm=True)
+        for _ in range(iterations):
+            self._pass(arrays, h, warm=False)
+        d = arrays.dyn
+        arrays.velocity[d] = (arrays.position[d] - self._prev[d]) / h
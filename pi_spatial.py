@@ -0,0 +1,113 @@
+from __future__ import annotations
+import math
+from typing import Any, Dict, List, Optional, Tuple
+from pi_types import Vec3
+from pi_soa import np, require_numpy
+
+Cell = Tuple[int, int, int]
+
+# cell coords are clamped so huge (or runaway) positions still hash to a cell
+_CELL_LIMIT = 2 ** 40
+
+def finite_support(lo: Vec3, hi: Vec3) -> bool:
+    """
+    False for unbounded supports (inf/NaN bounds, e.g. radius=inf): those get a full scan.
+    """
+    return all(math.isfinite(v) for v in lo) and all(math.isfinite(v) for v in hi)
+
+class PiSpatialGrid:
+    """
+    Uniform hash grid over body rows (π-only, numpy).
+    - update() re-buckets only rows whose cell changed since the last call
+    - query_aabb() returns candidate rows for a bounded field support
+    - non-finite positions land in an overflow bucket returned by every query
+    - non-finite supports are unbounded: query_aabb() answers None (full scan)
+    Candidates are a superset: fields still apply their own exact cutoff.
+    """
+    def __init__(self, cell_size: float, rows: List[int]) -> None:
+        require_numpy()
+        if not cell_size > 0.0:
+            raise ValueError("π spatial grid cell_size must be > 0")
+        self.cell_size = float(cell_size)
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self._cells: Any = None  # (len(rows), 3) int64, last bucketed cell per row
+        self._finite: Any = None
+        self._buckets: Dict[Cell, List[int]] = {}
+        self._overflow: List[int] = []
+
+    def _cell_coords(self, position: Any) -> Tuple[Any, Any]:
+        p = position[self.rows]
+        finite = np.isfinite(p).all(axis=1)
+        with np.errstate(invalid="ignore"):
+            c = np.floor(np.where(finite[:, None], p, 0.0) / self.cell_size)
+        c = np.clip(c, -_CELL_LIMIT, _CELL_LIMIT).astype(np.int64)
+        return c, finite
+
+    def _insert(self, k: int, row: int, cells: Any, finite: Any) -> None:
+        if not finite[k]:
+            self._overflow.append(row)
+            return
+        key = (int(cells[k, 0]), int(cells[k, 1]), int(cells[k, 2]))
+        self._buckets.setdefault(key, []).append(row)
+
+    def _remove(self, k: int, row: int) -> None:
+        if not self._finite[k]:
+            self._overflow.remove(row)
+            return
+        c = self._cells[k]
+        key = (int(c[0]), int(c[1]), int(c[2]))
+        bucket = self._buckets[key]
+        bucket.remove(row)
+        if not bucket:
+            del self._buckets[key]
+
+    def update(self, position: Any) -> int:
+        """
+        Incremental re-bucket. Returns the number of rows that changed cell.
+        """
+        cells, finite = self._cell_coords(position)
+        rows = self.rows.tolist()
+        if self._cells is None:
+            for k, row in enumerate(rows):
+                self._insert(k, row, cells, finite)
+            moved = len(rows)
+        else:
+            changed = np.flatnonzero((cells != self._cells).any(axis=1) | (finite != self._finite))
+            for k in changed.tolist():
+                self._remove(k, rows[k])
+                self._insert(k, rows[k], cells, finite)
+            moved = int(changed.size)
+        self._cells = cells
+        self._finite = finite
+        return moved
+
+    def query_aabb(self, lo: Vec3, hi: Vec3) -> Optional[Any]:
+        """
+        Candidate rows overlapping [lo, hi], or None when a full scan is cheaper.
+        """
+        if not finite_support(lo, hi):
+            return None
+        cs = self.cell_size
+        c0 = [max(-_CELL_LIMIT, min(_CELL_LIMIT, int(np.floor(lo[i] / cs)))) for i in range(3)]
+        c1 = [max(-_CELL_LIMIT, min(_CELL_LIMIT, int(np.floor(hi[i] / cs)))) for i in range(3)]
+        span = (c1[0] - c0[0] + 1) * (c1[1] - c0[1] + 1) * (c1[2] - c0[2] + 1)
+
+        out: List[int] = list(self._overflow)
+        if span <= len(self._buckets):
+            get = self._buckets.get
+            for x in range(c0[0], c1[0] + 1):
+                for y in range(c0[1], c1[1] + 1):
+                    for z in range(c0[2], c1[2] + 1):
+                        bucket = get((x, y, z))
+                        if bucket:
+                            out.extend(bucket)
+        elif len(self._buckets) < len(self.rows):
+            # support spans more cells than are occupied: walk occupied buckets instead
+            for (x, y, z), bucket in self._buckets.items():
+                if c0[0] <= x <= c1[0] and c0[1] <= y <= c1[1] and c0[2] <= z <= c1[2]:
+                    out.extend(bucket)
+        else:
+            return None
+        if 2 * len(out) > len(self.rows):
+            return None  # dense support: one full-array pass beats a gather/scatter
+        return np.asarray(out, dtype=np.int64)
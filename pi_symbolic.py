@@ -1,25 +1,207 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from pi_types import PiEvent
 
+Node = Dict[str, Any]
+
+def node_intent(node: Node) -> Optional[PiEvent]:
+    role = node.get("⟁role")
+    if role == "ui.action":
+        href = node.get("@href")
+        if href:
+            # Intent only; actual navigation is not performed by kernel.
+            return PiEvent(type="route_intent", target=node.get("⟁id"), payload={"href": href})
+    return None
+
+def iter_nodes(tree: Any) -> Iterator[Node]:
+    """
+    Pre-order walk with an explicit stack (deep trees do not hit the recursion limit).
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        yield node
+        stack.extend(reversed(node.get("⟁children", []) or []))
+
 def extract_symbolic_intents(tree: Dict[str, Any]) -> List[PiEvent]:
     """
     ⟁tree is symbolic structure (not markup).
     Kernel may read it to produce intents, but MUST NOT mutate DOM here.
     """
     out: List[PiEvent] = []
-
-    def walk(node: Any) -> None:
-        if not isinstance(node, dict):
-            return
-        role = node.get("⟁role")
-        if role == "ui.action":
-            href = node.get("@href")
-            if href:
-                # Intent only; actual navigation is not performed by kernel.
-                out.append(PiEvent(type="route_intent", target=node.get("⟁id"), payload={"href": href}))
-        for ch in node.get("⟁children", []) or []:
-            walk(ch)
-
-    walk(tree)
+    for node in iter_nodes(tree):
+        ev = node_intent(node)
+        if ev is not None:
+            out.append(ev)
     return out
+
+class _Entry:
+    __slots__ = ("node", "nid", "parent", "intent", "kids", "count")
+
+    def __init__(self, node: Node, parent: Optional[Node], intent: Optional[PiEvent]) -> None:
+        self.node = node
+        self.nid = node.get("⟁id")  # ⟁id as indexed (in-place renames are unindexed by this)
+        self.parent = parent
+        self.intent = intent
+        self.kids: List[Node] = []  # dict children as indexed (edits re-walk from this, not the live tree)
+        self.count = 0  # intents in this subtree
+
+class PiSymbolicIndex:
+    """
+    ⟁id -> node index over a ⟁tree, plus its intents, kept current under subtree edits.
+    - insert / remove / replace / refresh re-walk only the touched subtree and return (added, removed) intents
+    - intents(): document order, cached; rebuilt by visiting only subtrees that hold intents
+    - edits cost O(subtree + depth); live consumers should apply the returned deltas
+    ⟁ids are assumed unique; with duplicates the most recently indexed node wins.
+    """
+    def __init__(self, tree: Any) -> None:
+        self.tree = tree
+        self.nodes: Dict[str, Node] = {}
+        self._entries: Dict[int, _Entry] = {}  # id(node) -> entry
+        self._intents: Optional[List[PiEvent]] = None
+        self.version = 0
+        self._index(tree, None)
+
+    def _index(self, root: Any, parent: Optional[Node]) -> Tuple[int, List[PiEvent]]:
+        added: List[PiEvent] = []
+        order: List[_Entry] = []
+        stack = [(root, parent)]
+        while stack:
+            node, par = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            e = _Entry(node, par, node_intent(node))
+            self._entries[id(node)] = e
+            order.append(e)
+            if e.nid is not None:
+                self.nodes[e.nid] = node
+            if e.intent is not None:
+                added.append(e.intent)
+            e.kids = [ch for ch in node.get("⟁children", []) or [] if isinstance(ch, dict)]
+            stack.extend((ch, node) for ch in reversed(e.kids))
+        # subtree counts bottom-up (reverse pre-order visits children before parents)
+        for e in reversed(order):
+            e.count += e.intent is not None
+            if e.parent is not None and e is not order[0]:
+                self._entries[id(e.parent)].count += e.count
+        return (order[0].count if order else 0), added
+
+    def _unindex(self, root: Node) -> Tuple[int, List[PiEvent]]:
+        removed: List[PiEvent] = []
+        top = self._entries.get(id(root))
+        if top is None:
+            return 0, removed
+        stack = [top]
+        while stack:
+            e = stack.pop()
+            del self._entries[id(e.node)]
+            if e.nid is not None and self.nodes.get(e.nid) is e.node:
+                del self.nodes[e.nid]
+            if e.intent is not None:
+                removed.append(e.intent)
+            stack.extend(self._entries[id(k)] for k in reversed(e.kids))
+        return top.count, removed
+
+    def _bump(self, node: Optional[Node], delta: int) -> None:
+        while node is not None and delta:
+            e = self._entries[id(node)]
+            e.count += delta
+            node = e.parent
+        self._intents = None
+        self.version += 1
+
+    def _sync_kids(self, parent: Node) -> None:
+        # one sibling list, not the tree
+        self._entries[id(parent)].kids = [ch for ch in parent["⟁children"] if isinstance(ch, dict)]
+
+    def _node(self, node_id: str) -> Node:
+        node = self.nodes.get(node_id)
+        if node is None:
+            raise ValueError(f"unknown π node: {node_id!r}")
+        return node
+
+    def get(self, node_id: str) -> Optional[Node]:
+        return self.nodes.get(node_id)
+
+    def intent(self, node_id: str) -> Optional[PiEvent]:
+        return self._entries[id(self._node(node_id))].intent
+
+    def intents(self) -> List[PiEvent]:
+        if self._intents is None:
+            out: List[PiEvent] = []
+            root = self._entries.get(id(self.tree))
+            stack = [root] if root is not None and root.count else []
+            while stack:
+                e = stack.pop()
+                if e.intent is not None:
+                    out.append(e.intent)
+                for k in reversed(e.kids):
+                    ke = self._entries[id(k)]
+                    if ke.count:
+                        stack.append(ke)
+            self._intents = out
+        return list(self._intents)
+
+    def insert(self, parent_id: str, node: Node, index: Optional[int] = None) -> Tuple[List[PiEvent], List[PiEvent]]:
+        parent = self._node(parent_id)
+        children = parent.get("⟁children")
+        if children is None:
+            children = parent["⟁children"] = []
+        if index is None:
+            children.append(node)
+        else:
+            children.insert(index, node)
+        self._sync_kids(parent)
+        n, added = self._index(node, parent)
+        self._bump(parent, n)
+        return added, []
+
+    def remove(self, node_id: str) -> Tuple[List[PiEvent], List[PiEvent]]:
+        node = self._node(node_id)
+        parent = self._entries[id(node)].parent
+        if parent is None:
+            raise ValueError("cannot remove the π tree root")
+        children = parent["⟁children"]
+        del children[next(k for k, ch in enumerate(children) if ch is node)]
+        self._sync_kids(parent)
+        n, removed = self._unindex(node)
+        self._bump(parent, -n)
+        return [], removed
+
+    def replace(self, node_id: str, node: Node) -> Tuple[List[PiEvent], List[PiEvent]]:
+        """
+        Swap the subtree at node_id for `node` (the root is replaced in place, keeping tree identity).
+        """
+        old = self._node(node_id)
+        parent = self._entries[id(old)].parent
+        n_old, removed = self._unindex(old)
+        if parent is None:
+            old.clear()
+            old.update(node)
+            n_new, added = self._index(old, None)
+            self._intents = None
+            self.version += 1
+            return added, removed
+        children = parent["⟁children"]
+        children[next(k for k, ch in enumerate(children) if ch is old)] = node
+        self._sync_kids(parent)
+        n_new, added = self._index(node, parent)
+        self._bump(parent, n_new - n_old)
+        return added, removed
+
+    def refresh(self, node_id: str) -> Tuple[List[PiEvent], List[PiEvent]]:
+        """
+        Re-extract a subtree the caller edited in place (attributes or ⟁children).
+        """
+        node = self._node(node_id)
+        parent = self._entries[id(node)].parent
+        n_old, removed = self._unindex(node)
+        n_new, added = self._index(node, parent)
+        if parent is None:
+            self._intents = None
+            self.version += 1
+        else:
+            self._bump(parent, n_new - n_old)
+        return added, removed
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 Vec3 = Tuple[float, float, float]
 Quat = Tuple[float, float, float, float]
@@ -32,10 +33,140 @@ class PiWorldSpec:
     substeps: int = 1
     integrator: str = "semi_implicit"  # locked default
     solver_iterations: int = 8
+    solver_mode: str = "force"  # "force" (explicit springs) | "pbd" (XPBD projection, solver_iterations passes)
     fields: List[Dict[str, Any]] = field(default_factory=list)
 
-@dataclass
-class PiBody:
+@dataclass(frozen=True)
+class PiKernelConfig:
+    """
+    Host-owned runtime options. Never part of the hashed world state.
+    """
+    backend: str = "python"  # "python" (PiBody loop) | "soa" (numpy arrays, same hash chain)
+    spatial_index: bool = True  # uniform grid (numpy) so bounded fields only touch bodies in range
+    spatial_cell: float = 0.0  # grid cell size; 0 = median half-extent of bounded field supports
+    seal_mode: str = "json"  # "json" (full snapshot) | "merkle" (incremental per-body leaves)
+    hash_encoding: str = "json"  # "json" (canonical JSON, legacy chains) | "binary" (PISB v1)
+    seal_every: int = 1  # seal every N ticks (0 = no cadence seals)
+    seal_epochs: bool = False  # also seal on the last tick of every epoch
+    sleep: bool = False  # islands at rest stop stepping until an event/field change wakes them
+    sleep_velocity: float = 0.01  # |v| below this counts as at rest
+    sleep_force: float = 0.01  # net force (m * |dv| / dt over a tick) below this counts as at rest
+    sleep_ticks: int = 30  # consecutive at-rest ticks before an island sleeps
+    projection_mode: str = "full"  # "full" (every body, every tick) | "delta" (moved bodies + keyframes) | "none"
+    projection_epsilon: float = 0.0  # delta: emit a body once any coordinate moved more than this
+    keyframe_every: int = 600  # delta: full keyframe every N ticks (0 = first tick only)
+    field_mode: str = "exact"  # "exact" (analytic per body) | "lattice" (soa: baked voxel grid, trilinear; approximate)
+    lattice_resolution: int = 32  # lattice: cells along the longest axis of the grid bounds
+    lattice_bounds: Optional[Tuple[Vec3, Vec3]] = None  # lattice: (lo, hi); None = union of bounded field supports
+
+# Flag interning: each distinct flag gets a bit, each distinct flag tuple is stored once.
+FLAG_STATIC = 1
+_FLAG_BITS: Dict[Any, int] = {"static": FLAG_STATIC}
+_FLAG_SETS: Dict[Tuple[Any, ...], Tuple[Tuple[Any, ...], int]] = {}
+
+def flag_bit(flag: Any) -> int:
+    bit = _FLAG_BITS.get(flag)
+    if bit is None:
+        bit = _FLAG_BITS[sys.intern(flag) if type(flag) is str else flag] = 1 << len(_FLAG_BITS)
+    return bit
+
+def intern_flags(flags: Iterable[Any]) -> Tuple[Tuple[Any, ...], int]:
+    """
+    -> (shared tuple in the given order, bitmask).
+    """
+    key = tuple(flags)
+    hit = _FLAG_SETS.get(key)
+    if hit is None:
+        names = tuple(sys.intern(f) if type(f) is str else f for f in key)
+        mask = 0
+        for f in names:
+            mask |= flag_bit(f)
+        hit = _FLAG_SETS[key] = (names, mask)
+    return hit
+
+class PiFlagList(list):
+    """
+    PiBody.flags view: a real list whose in-place edits are written back through
+    the flags setter (interned tuple, bitmask and static bit stay current).
+    Copies and pickles are plain lists.
+    """
+    __slots__ = ("_body",)
+
+    def __init__(self, iterable: Iterable[Any] = (), body: Optional["PiBody"] = None) -> None:
+        super().__init__(iterable)
+        self._body = body
+
+    def __reduce__(self) -> Any:
+        return (list, (list(self),))
+
+def _write_back(name: str) -> Any:
+    base = getattr(list, name)
+
+    def method(self: PiFlagList, *args: Any, **kwargs: Any) -> Any:
+        out = base(self, *args, **kwargs)
+        if self._body is not None:
+            self._body.flags = self
+        return out
+    method.__name__ = name
+    return method
+
+# every list method that mutates in place (test_pi_types exercises each one)
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(PiFlagList, _name, _write_back(_name))
+
+class PiBodyEdits:
+    """
+    Per-kernel log of host edits to body.mass / body.flags. PiKernel drains it
+    before stepping, so only the edited rows of that kernel are refreshed.
+    - version bumps on every edit, static_version only when a static bit flips
+    - a body reports to the last PiBodyEdits that adopted it
+    """
+    __slots__ = ("version", "static_version", "_pending")
+
+    def __init__(self, bodies: Iterable["PiBody"] = ()) -> None:
+        self.version = 0
+        self.static_version = 0
+        self._pending: Dict[int, "PiBody"] = {}  # id(body) -> body, first-edit order
+        for b in bodies:
+            b._edits = self
+
+    def note(self, body: "PiBody", flipped: bool) -> None:
+        self.version += 1
+        if flipped:
+            self.static_version += 1
+        self._pending[id(body)] = body
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def peek(self) -> List["PiBody"]:
+        """
+        Edited bodies not yet drained (first-edit order), e.g. for a session recorder.
+        """
+        return list(self._pending.values())
+
+    def drain(self) -> List["PiBody"]:
+        out = list(self._pending.values())
+        self._pending.clear()
+        return out
+
+class _PiBodyState:
+    # derived state + owner: slots outside the dataclass fields (not in asdict/replace/eq)
+    __slots__ = ("_flag_mask", "_static", "_edits")
+
+@dataclass(slots=True)
+class PiBody(_PiBodyState):
+    """
+    Rigid body record (slotted dataclass).
+    - id/shape/role strings and flag tuples are interned (shared across bodies)
+    - the flags slot holds the interned tuple; body.flags returns a list view
+      whose edits write back, so b.flags.append("static") works
+    - flags carry a bitmask and is_static() reads a cached bool, re-derived
+      whenever mass or flags change
+    - edits after construction are reported to the owning kernel's PiBodyEdits
+    """
     id: str
     mass: float = 1.0
     position: Vec3 = (0.0, 0.0, 0.0)
@@ -56,8 +187,60 @@ class PiBody:
     # runtime accumulators (π-only)
     force: Vec3 = (0.0, 0.0, 0.0)
 
+    def __post_init__(self) -> None:
+        if type(self.id) is str:
+            self.id = sys.intern(self.id)
+        if type(self.shape) is str:
+            self.shape = sys.intern(self.shape)
+        if type(self.role) is str:
+            self.role = sys.intern(self.role)
+        self._static = bool(self._flag_mask & FLAG_STATIC) or self.mass <= 0.0
+        self._edits: Optional[PiBodyEdits] = None
+
+    def _edited(self) -> None:
+        static = bool(self._flag_mask & FLAG_STATIC) or self.mass <= 0.0
+        flipped = static != self._static
+        self._static = static
+        if self._edits is not None:
+            self._edits.note(self, flipped)
+
+    def __reduce__(self) -> Any:
+        # rebuilt through __init__: copies and pickles carry no kernel ownership
+        return (self.__class__, tuple(getattr(self, f.name) for f in fields(self)))
+
+    @property
+    def flag_mask(self) -> int:
+        return self._flag_mask
+
+    def has_flag(self, flag: str) -> bool:
+        bit = _FLAG_BITS.get(flag)
+        return bit is not None and bool(self._flag_mask & bit)
+
     def is_static(self) -> bool:
-        return "static" in self.flags or self.mass <= 0.0
+        return self._static
+
+# mass and flags keep their dataclass slots; these properties re-derive state on assignment
+# (the generated __init__ assigns through them too, before _edits exists)
+_MASS_SLOT = PiBody.__dict__["mass"]
+_FLAGS_SLOT = PiBody.__dict__["flags"]
+
+def _set_mass(self: PiBody, value: float) -> None:
+    _MASS_SLOT.__set__(self, value)
+    if hasattr(self, "_edits"):
+        self._edited()
+
+def _get_flags(self: PiBody) -> List[str]:
+    return PiFlagList(_FLAGS_SLOT.__get__(self), self)
+
+def _set_flags(self: PiBody, value: Iterable[str]) -> None:
+    names, self._flag_mask = intern_flags(value)
+    _FLAGS_SLOT.__set__(self, names)
+    if hasattr(self, "_edits"):
+        self._edited()
+
+PiBody.mass = property(_MASS_SLOT.__get__, _set_mass)  # type: ignore[assignment]
+PiBody.flags = property(_get_flags, _set_flags)  # type: ignore[assignment]
+PiBody.flag_names = property(_FLAGS_SLOT.__get__, doc="Flags as the shared interned tuple (no copy).")  # type: ignore[attr-defined]
 
 @dataclass(frozen=True)
 class PiConstraint:
@@ -80,13 +263,16 @@ class PiEvent:
 class PiProjection:
     """
     Read-only output for CSS-VER projection: mapping body_id -> CSS vars or transforms.
+    keyframe=False: delta frame, only moved bodies with {"position"}; merge onto the last keyframe.
     """
     bodies: Dict[str, Dict[str, Any]]
+    keyframe: bool = True
 
 @dataclass
 class PiTickResult:
     epoch: int
     tick: int
     projection: PiProjection
-    tick_hash: str
+    tick_hash: str  # last seal (this tick's when sealed)
     prev_hash: str
+    sealed: bool = True
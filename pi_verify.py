@@ -0,0 +1,226 @@
+from __future__ import annotations
+import argparse, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pi_types import PiEvent, PiTickResult
+from pi_kernel import PiKernel
+from pi_checkpoint import load_checkpoint, save_checkpoint
+
+# Session log: NDJSON, one record per line, in kernel order.
+#   {"kind": "session", "checkpoint_every": K}
+#   {"kind": "checkpoint", "tick": t, "path": file}      (relative to the log's directory)
+#   {"kind": "input", "tick": t, "inputs": [...]}        (queued before tick t+1 runs)
+#       input: ["event", type, target, payload] | ["actions", [π.event items]]
+#              | ["body", id, mass, flags]                 (host edit to body.mass / body.flags)
+#   {"kind": "tick", "tick": t, "hash": tick_hash, "sealed": bool}
+
+class PiSessionRecorder:
+    """
+    Records everything a replay needs: inputs in arrival order, every tick_hash,
+    and a checkpoint every `checkpoint_every` ticks (plus one at the start).
+    Use it in place of the kernel's enqueue/tick API. Host edits to body.mass /
+    body.flags are picked up from the kernel's edit log before each call.
+    """
+    def __init__(self, kernel: PiKernel, log_path: str, checkpoint_every: int = 600) -> None:
+        self.kernel = kernel
+        self.log_path = log_path
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self._dir = os.path.dirname(os.path.abspath(log_path))
+        self._stem = os.path.splitext(os.path.basename(log_path))[0]
+        self._log = open(log_path, "w", encoding="utf-8")
+        self._inputs: List[Any] = []
+        self._write({"kind": "session", "checkpoint_every": self.checkpoint_every})
+        self.checkpoint()
+
+    def _write(self, rec: Dict[str, Any]) -> None:
+        self._log.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def checkpoint(self) -> str:
+        name = f"{self._stem}.{self.kernel.tick:012d}.pick"
+        save_checkpoint(self.kernel, os.path.join(self._dir, name))
+        self._write({"kind": "checkpoint", "tick": self.kernel.tick, "path": name})
+        return name
+
+    def _note_edits(self) -> None:
+        # the kernel drains its edit log on the next enqueue/tick: record the final values first
+        for b in self.kernel.body_edits.peek():
+            self._inputs.append(["body", b.id, b.mass, list(b.flags)])
+
+    def enqueue_event(self, ev: PiEvent) -> None:
+        self._note_edits()
+        self._inputs.append(["event", ev.type, ev.target, ev.payload])
+        self.kernel.enqueue_event(ev)
+
+    def enqueue_actions(self, items: List[Dict[str, Any]]) -> int:
+        self._note_edits()
+        self._inputs.append(["actions", items])
+        return self.kernel.enqueue_actions(items)
+
+    def tick_once(self) -> PiTickResult:
+        k = self.kernel
+        self._note_edits()
+        if self._inputs:
+            self._write({"kind": "input", "tick": k.tick, "inputs": self._inputs})
+            self._inputs = []
+        res = k.tick_once()
+        self._write({"kind": "tick", "tick": res.tick, "hash": res.tick_hash, "sealed": res.sealed})
+        if res.tick % self.checkpoint_every == 0:
+            self.checkpoint()
+        return res
+
+    def close(self) -> None:
+        self._log.close()
+
+@dataclass
+class PiSession:
+    checkpoints: List[Tuple[int, str]]  # (tick, absolute path), ascending
+    inputs: Dict[int, List[Any]]
+    hashes: Dict[int, str]
+    last_tick: int
+
+def load_session(log_path: str) -> PiSession:
+    base = os.path.dirname(os.path.abspath(log_path))
+    cps: List[Tuple[int, str]] = []
+    inputs: Dict[int, List[Any]] = {}
+    hashes: Dict[int, str] = {}
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            kind = rec.get("kind")
+            if kind == "checkpoint":
+                cps.append((int(rec["tick"]), os.path.join(base, rec["path"])))
+            elif kind == "input":
+                inputs.setdefault(int(rec["tick"]), []).extend(rec["inputs"])
+            elif kind == "tick":
+                hashes[int(rec["tick"])] = rec["hash"]
+    cps.sort()
+    if not cps:
+        raise ValueError("π session log has no checkpoints")
+    return PiSession(cps, inputs, hashes, max(hashes) if hashes else cps[0][0])
+
+@dataclass(frozen=True)
+class PiSegment:
+    start: int  # checkpoint tick
+    end: int  # last tick to replay (inclusive)
+    checkpoint: str
+    next_checkpoint: Optional[str]  # recorded state at `end`, if any
+    inputs: Dict[int, List[Any]] = field(default_factory=dict)
+    hashes: Dict[int, str] = field(default_factory=dict)
+
+def _body_key(b: Any) -> Tuple[str, ...]:
+    # repr: exact, NaN-safe, keeps int/float distinction (which the json seal hashes)
+    return repr(b.position), repr(b.velocity), repr(b.force), repr(b.mass), repr(b.flag_names)
+
+def replay_segment(seg: PiSegment) -> Dict[str, Any]:
+    """
+    Restore the segment's checkpoint, re-apply inputs, compare every tick_hash,
+    then compare the final state with the next checkpoint.
+    A tick with no recorded hash cannot be verified: it counts as missing and diverges.
+    """
+    out: Dict[str, Any] = {"start": seg.start, "end": seg.end, "ticks": 0, "missing": 0, "divergent_tick": None,
+                           "divergent_body": None, "detail": None}
+    kernel = load_checkpoint(seg.checkpoint)
+    while kernel.tick < seg.end:
+        for inp in seg.inputs.get(kernel.tick, []):
+            if inp[0] == "event":
+                kernel.enqueue_event(PiEvent(type=inp[1], target=inp[2], payload=inp[3]))
+            elif inp[0] == "body":
+                b = kernel._bodies_by_id[inp[1]]
+                b.mass = inp[2]
+                b.flags = inp[3]
+            else:
+                kernel.enqueue_actions(inp[1])
+        res = kernel.tick_once()
+        out["ticks"] += 1
+        want = seg.hashes.get(res.tick)
+        if want is None:
+            out["missing"] += 1
+            if out["divergent_tick"] is None:
+                out["divergent_tick"] = res.tick
+                out["detail"] = f"no recorded tick_hash for tick {res.tick}"
+        elif want != res.tick_hash and out["divergent_tick"] is None:
+            out["divergent_tick"] = res.tick
+            out["detail"] = f"tick_hash {res.tick_hash} != recorded {want}"
+    if seg.next_checkpoint is not None:
+        ref = load_checkpoint(seg.next_checkpoint)
+        for mine, theirs in zip(kernel.bodies, ref.bodies):
+            if _body_key(mine) != _body_key(theirs):
+                out["divergent_body"] = mine.id
+                if out["divergent_tick"] is None:
+                    out["divergent_tick"] = seg.end
+                    out["detail"] = f"state of {mine.id} differs from checkpoint at tick {seg.end}"
+                break
+        else:
+            if ref.prev_hash != kernel.prev_hash and out["divergent_tick"] is None:
+                out["divergent_tick"] = seg.end
+                out["detail"] = "chain head differs from checkpoint"
+    return out
+
+@dataclass
+class PiVerifyReport:
+    ok: bool
+    ticks: int
+    segments: int
+    seconds: float
+    divergent_tick: Optional[int] = None
+    divergent_body: Optional[str] = None  # first body differing at the boundary after the divergence
+    detail: Optional[str] = None
+    missing: int = 0  # replayed ticks with no recorded tick_hash (never ok)
+
+def split_segments(session: PiSession) -> List[PiSegment]:
+    cps = session.checkpoints
+    segs: List[PiSegment] = []
+    for k, (tick, path) in enumerate(cps):
+        if tick >= session.last_tick:
+            break
+        end = cps[k + 1][0] if k + 1 < len(cps) else session.last_tick
+        nxt = cps[k + 1][1] if k + 1 < len(cps) else None
+        segs.append(PiSegment(
+            start=tick, end=end, checkpoint=path, next_checkpoint=nxt,
+            inputs={t: v for t, v in session.inputs.items() if tick <= t < end},
+            hashes={t: h for t, h in session.hashes.items() if tick < t <= end}
+        ))
+    return segs
+
+def verify_session(log_path: str, workers: Optional[int] = None) -> PiVerifyReport:
+    """
+    Replay checkpoint-to-checkpoint segments in parallel; the earliest failing
+    segment decides the report.
+    """
+    t0 = time.perf_counter()
+    segs = split_segments(load_session(log_path))
+    n = min(workers or os.cpu_count() or 1, max(1, len(segs)))
+    if n <= 1:
+        results = [replay_segment(s) for s in segs]
+    else:
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            results = list(pool.map(replay_segment, segs))
+
+    report = PiVerifyReport(ok=True, ticks=sum(r["ticks"] for r in results), segments=len(segs), seconds=0.0,
+                            missing=sum(r["missing"] for r in results))
+    for r in results:
+        if r["divergent_tick"] is not None:
+            report.ok = False
+            report.divergent_tick = r["divergent_tick"]
+            report.divergent_body = r["divergent_body"]
+            report.detail = r["detail"]
+            break
+    report.seconds = time.perf_counter() - t0
+    return report
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="π-KUHUL parallel hash-chain verifier")
+    ap.add_argument("log", help="session log written by PiSessionRecorder")
+    ap.add_argument("--workers", type=int, default=0, help="process count (default: all cores)")
+    args = ap.parse_args(argv)
+
+    rep = verify_session(args.log, args.workers or None)
+    print(json.dumps(rep.__dict__, ensure_ascii=False))
+    return 0 if rep.ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
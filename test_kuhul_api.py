@@ -0,0 +1,86 @@
+from __future__ import annotations
+import json
+import threading
+from http.client import HTTPConnection
+from typing import Any, Dict, Iterator, Tuple
+
+import pytest
+
+import kuhul_pi_merged_runtime as K
+
+@pytest.mark.parametrize("data", [
+    [],
+    {"query": 1},
+    {"events": {}},
+    {"events": [{}]},
+    {"events": [1]},
+    {"events": [{"entity": "sun", "key": "t"}]},
+    {"seed": 1.5},
+    {"seed": [1]},
+    {"steps": -1},
+    {"ticks": True},
+    {"p": float("nan")},
+    {"topology": "torus"},
+    {"engine": ["object"]},
+    {"schedule": "some"},
+])
+def test_malformed_requests_are_rejected(data: Any) -> None:
+    with pytest.raises(ValueError):
+        K.check_request(data)
+
+@pytest.mark.parametrize("data", [
+    {},
+    {"seed": None},
+    {"seed": "abc", "topology": "small_world"},
+    {"events": [{"entity": "sun", "key": "t", "value": 5800}]},
+])
+def test_well_formed_requests_pass(data: Dict[str, Any]) -> None:
+    K.check_request(data)
+
+def test_total_work_is_capped() -> None:
+    # 1024 agents full mesh: about a million deliveries per tick
+    K.check_request({"steps": 1024, "ticks": 9})
+    with pytest.raises(ValueError, match="too large"):
+        K.check_request({"steps": 1024, "ticks": 10})
+    # sparse links allow proportionally more ticks
+    K.check_request({"steps": 1024, "ticks": 1000, "topology": "ring", "k": 4})
+    with pytest.raises(ValueError, match="too large"):
+        K.check_request({"steps": 1024, "ticks": 1000, "topology": "ring", "k": 64})
+
+@pytest.mark.parametrize("topology", K.TOPOLOGIES)
+def test_work_bound_covers_every_delivery(topology: str, monkeypatch: Any) -> None:
+    calls = [0]
+    perceive = K.KuhulAgent.perceive
+
+    def counted(self: Any, signal: Any) -> None:
+        calls[0] += 1
+        perceive(self, signal)
+
+    monkeypatch.setattr(K.KuhulAgent, "perceive", counted)
+    events = [{"entity": "perpetual_motion", "key": "k", "value": 1}, {"entity": "sun", "key": "t", "value": 2}]
+    K.infer({"steps": 60, "ticks": 30, "k": 6, "topology": topology, "events": events})
+    assert calls[0] <= K.links_per_tick(topology, 63, 3, 6) * 30
+
+@pytest.fixture
+def server() -> Iterator[Tuple[str, int]]:
+    srv = K.PiClusterServer(("127.0.0.1", 0), workers=1, pool="thread")
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv.server_address[:2]
+    srv.shutdown()
+    srv.server_close()
+
+def _post(address: Tuple[str, int], body: Any) -> Tuple[int, Dict[str, Any]]:
+    conn = HTTPConnection(*address, timeout=10)
+    conn.request("POST", "/", json.dumps(body), {"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    out = resp.status, json.loads(resp.read())
+    conn.close()
+    return out
+
+def test_client_errors_answer_400(server: Tuple[str, int]) -> None:
+    for body in ({"events": [{}]}, {"events": [1]}, {"seed": 1.5}, {"steps": 1024, "ticks": 1000}):
+        status, out = _post(server, body)
+        assert status == 400 and "error" in out, body
+    status, out = _post(server, {"query": "hi", "steps": 8, "ticks": 5})
+    assert status == 200 and out["agents"] == 9
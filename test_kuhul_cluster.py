@@ -0,0 +1,75 @@
+from __future__ import annotations
+import random
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+import kuhul_pi_merged_runtime as K
+
+EVENTS = [[], [{"entity": "perpetual_motion", "key": "k", "value": 1}],
+          [{"entity": "sun", "key": "t", "value": 2}]]
+
+def _cluster(events: Optional[List[Dict[str, Any]]] = None, steps: int = 30) -> Any:
+    random.seed(7)  # pi_emit draws glyphs from the global RNG
+    c = K.KuhulCluster()
+    c.spawn_patterns(K.pi_emit("parity", steps))
+    for e in events or []:
+        c.spawn_event(e)
+    c.spawn_invariant(K.no_perpetual_motion)
+    return c
+
+def _state(c: Any) -> str:
+    return repr((c.collapse(), [(a.activation, a.energy) for a in c.order]))
+
+@pytest.mark.parametrize("events", EVENTS)
+@pytest.mark.parametrize("topology", ["full", "ring", "knn", "small_world", "hub"])
+def test_active_schedule_matches_all(topology: str, events: List[Dict[str, Any]]) -> None:
+    out = []
+    for schedule in ("all", "active"):
+        c = _cluster(events)
+        c.link(topology=topology, k=4, seed=3)
+        c.run(ticks=25, schedule=schedule)
+        c.run(ticks=15, schedule=schedule)  # resumes from the first run's state
+        out.append(_state(c))
+    assert out[0] == out[1]
+
+@pytest.mark.parametrize("schedule", ["all", "active"])
+def test_convergence_stops_early_at_the_same_state(schedule: str) -> None:
+    c = _cluster(EVENTS[2])
+    c.link(topology="ring", k=4)
+    c.run(ticks=200, schedule=schedule, epsilon=1e-4, patience=3)
+    res = c.collapse()
+    assert res["converged"] and 3 < res["ticks"] < 200
+    ref = _cluster(EVENTS[2])
+    ref.link(topology="ring", k=4)
+    ref.run(ticks=res["ticks"], schedule=schedule)
+    assert not ref.collapse()["converged"]
+    assert _state(ref).replace("'converged': False", "'converged': True") == _state(c)
+
+def test_engines_report_the_same_ticks() -> None:
+    pytest.importorskip("numpy")
+    ticks = []
+    for engine, schedule in (("object", "all"), ("object", "active"), ("vector", "all")):
+        c = _cluster(EVENTS[1])
+        c.link(topology="small_world", k=4, seed=1)
+        c.run(ticks=200, engine=engine, schedule=schedule, epsilon=1e-4)
+        ticks.append(c.collapse()["ticks"])
+    assert ticks[0] < 200 and ticks == [ticks[0]] * 3
+
+def test_convergence_criterion() -> None:
+    w = K.Convergence(0.01, 2, 1)
+    assert [w.update(t) for t in (0.0, 0.5, 0.501, 0.502, 0.9)] == [False, False, False, True, False]
+    w = K.Convergence(0.01, 1, 1)
+    assert [w.update(t) for t in (float("nan"), float("nan"))] == [False, True]
+
+def test_infer_reports_ticks_used() -> None:
+    res = K.infer({"query": "q", "steps": 20, "ticks": 300, "epsilon": 1e-4, "topology": "ring"})
+    assert res["converged"] and res["ticks"] < 300
+    res = K.infer({"query": "q", "steps": 20, "ticks": 30, "topology": "ring"})
+    assert not res["converged"] and res["ticks"] == 30
+
+def test_unknown_schedule() -> None:
+    c = _cluster()
+    c.link()
+    with pytest.raises(ValueError):
+        c.run(ticks=1, schedule="lazy")
@@ -0,0 +1,65 @@
+from __future__ import annotations
+import math
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+import kuhul_pi_merged_runtime as K
+
+pytest.importorskip("numpy")
+
+# The vector engine must reproduce the object engine bit for bit (nan included).
+
+EVENTS = [
+    [],
+    [{"entity": "perpetual_motion", "key": "k", "value": 1}],
+    [{"entity": "sun", "key": "t", "value": 2}, {"entity": "perpetual_motion", "key": "k", "value": 1}],
+]
+
+def _cluster(topology: str, events: List[Dict[str, Any]], steps: int, extra_invariant: bool) -> Any:
+    random.seed(11)  # pi_emit draws glyphs from the global RNG
+    c = K.KuhulCluster()
+    c.spawn_patterns(K.pi_emit(topology, steps))
+    for e in events:
+        c.spawn_event(e)
+    c.spawn_invariant(K.no_perpetual_motion)
+    if extra_invariant:
+        c.spawn_invariant(lambda s: s.get("entity") != "sun")
+    c.link(topology=topology, k=4, p=0.3, seed=2)
+    return c
+
+def _state(c: Any) -> str:
+    return repr((c.collapse(), [(a.activation, a.energy) for a in c.order]))
+
+@pytest.mark.parametrize("extra_invariant", [False, True])
+@pytest.mark.parametrize("events", EVENTS)
+@pytest.mark.parametrize("topology", K.TOPOLOGIES)
+def test_vector_matches_object(topology: str, events: List[Dict[str, Any]], extra_invariant: bool) -> None:
+    runs = []
+    for engine in K.ENGINES:
+        c = _cluster(topology, events, 30, extra_invariant)
+        c.run(ticks=25, engine=engine)
+        c.run(ticks=25, engine=engine, epsilon=1e-3)  # reloads agent state into the engine
+        runs.append(_state(c))
+    assert runs[0] == runs[1]
+
+def test_overflowed_run_collapses_alike() -> None:
+    out = []
+    for engine in K.ENGINES:
+        random.seed(0)
+        out.append(K.infer({"query": "x", "events": [{"entity": "sun", "key": "t", "value": 1}], "engine": engine}))
+    assert math.isnan(out[0]["confidence"]) and math.isnan(out[1]["confidence"])
+    assert repr(out[0]) == repr(out[1])
+
+def test_rules_see_the_emitted_signal() -> None:
+    seen: List[Dict[str, Any]] = []
+    runs = []
+    for engine in K.ENGINES:
+        seen.clear()
+        c = _cluster("ring", EVENTS[2], 12, False)
+        c.spawn_invariant(lambda s: seen.append({k: v for k, v in s.items() if k != "time"}) or True)
+        c.link(topology="ring", k=4)
+        c.run(ticks=10, engine=engine)
+        runs.append(list(seen))
+    assert runs[0] and runs[0] == runs[1]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import itertools
+import random
+from typing import Any, List, Set, Tuple
+
+import pytest
+
+import kuhul_pi_merged_runtime as K
+
+def _rows(offsets: Any, targets: Any) -> List[List[int]]:
+    return [list(targets[offsets[i]:offsets[i + 1]]) for i in range(len(offsets) - 1)]
+
+def _pairs(rows: List[List[int]]) -> Set[Tuple[int, int]]:
+    return {(i, j) for i, row in enumerate(rows) for j in row}
+
+def _check_csr(offsets: Any, targets: Any, n: int) -> List[List[int]]:
+    assert len(offsets) == n + 1 and offsets[0] == 0 and offsets[n] == len(targets)
+    rows = _rows(offsets, targets)
+    for i, row in enumerate(rows):
+        assert row == sorted(set(row)) and i not in row
+        assert all(0 <= j < n for j in row)
+    pairs = _pairs(rows)
+    assert pairs == {(j, i) for i, j in pairs}  # undirected
+    return rows
+
+def _cluster(steps: int, events: int = 2) -> Any:
+    random.seed(5)
+    c = K.KuhulCluster()
+    c.spawn_patterns(K.pi_emit("topology", steps))
+    for e in range(events):
+        c.spawn_event({"entity": f"e{e}", "key": "k", "value": e})
+    c.spawn_invariant(K.no_perpetual_motion)
+    return c
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7])
+def test_full_adjacency_is_every_pair(n: int) -> None:
+    offsets, targets = K.full_adjacency(n)
+    rows = _check_csr(offsets, targets, n)
+    assert rows == _rows(*K.build_adjacency(n, itertools.combinations(range(n), 2)))
+    assert len(targets) == n * (n - 1)
+
+def test_build_adjacency_drops_loops_and_duplicates() -> None:
+    offsets, targets = K.build_adjacency(4, [(0, 1), (1, 0), (2, 2), (3, 1), (0, 1)])
+    assert _check_csr(offsets, targets, 4) == [[1], [0, 3], [], [1]]
+
+@pytest.mark.parametrize("topology", K.TOPOLOGIES)
+@pytest.mark.parametrize("steps", [3, 40])
+def test_link_builds_valid_csr(topology: str, steps: int) -> None:
+    c = _cluster(steps)
+    c.link(topology=topology, k=4, p=0.3, seed=1)
+    n = len(c.order)
+    rows = _check_csr(c.offsets, c.targets, n)
+    assert c.edges() == len(_pairs(rows)) // 2
+    for i, a in enumerate(c.order):
+        assert [c.order.index(b) for b in a.neighbors] == rows[i] and len(a.neighbors) == len(rows[i])
+
+def test_ring_and_small_world() -> None:
+    n, k = 30, 6
+    ring = _rows(*K.build_adjacency(n, K.ring_edges(range(n), k)))
+    assert all(len(r) == k for r in ring)
+    assert ring[0] == [1, 2, 3, 27, 28, 29]
+    assert _rows(*K.build_adjacency(n, K.small_world_edges(n, k, 0.0, 3))) == ring
+    sw = _rows(*K.build_adjacency(n, K.small_world_edges(n, k, 0.5, 3)))
+    assert sw == _rows(*K.build_adjacency(n, K.small_world_edges(n, k, 0.5, 3))) and sw != ring
+    assert sw != _rows(*K.build_adjacency(n, K.small_world_edges(n, k, 0.5, 4)))
+
+def test_knn_links_nearest_weights() -> None:
+    rnd = random.Random(2)
+    weights = [rnd.uniform(0.0, 10.0) for _ in range(50)]
+    k = 3
+    rows = _rows(*K.build_adjacency(len(weights), K.knn_edges(weights, k)))
+    for i, w in enumerate(weights):
+        nearest = sorted((j for j in range(len(weights)) if j != i), key=lambda j: (abs(weights[j] - w), j))[:k]
+        assert {abs(weights[j] - w) for j in nearest} <= {abs(weights[j] - w) for j in rows[i]}
+
+def test_hub_links_events_and_invariants_to_everyone() -> None:
+    c = _cluster(20)
+    c.link(topology="hub", k=2)
+    n = len(c.order)
+    for a in c.order:
+        if a.role in ("event", "invariant"):
+            assert len(a.neighbors) == n - 1
+        else:
+            spokes = [b for b in a.neighbors if b.role == "pattern"]
+            assert len(spokes) == 2 and len(a.neighbors) == 2 + 3
+    assert c.edges() < n * (n - 1) // 2
+
+def test_unknown_topology() -> None:
+    with pytest.raises(ValueError):
+        _cluster(4).link(topology="torus")
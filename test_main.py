@@ -0,0 +1,69 @@
+from __future__ import annotations
+import io
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+import main
+from pi_frames import read_frames
+from pi_types import PiEvent, PiKernelConfig
+
+BUNDLE: Dict[str, Any] = {"%pi": {
+    "world": {"gravity": [0, -9.81, 0], "fields": [
+        {"field_type": "attraction_well", "parameters": {"position": [0, 4, 0], "strength": 1.0, "radius": 8}}]},
+    "bodies": [{"id": "anchor", "flags": ["static"]}]
+              + [{"id": f"b{i}", "mass": 1.0 + i, "position": [i, 1, 0]} for i in range(4)],
+    "constraints": [{"id": f"s{i}", "type": "spring", "a": f"b{i}", "b": f"b{i + 1}", "params": {"rest_length": 1.0}}
+                    for i in range(3)],
+}}
+
+@pytest.fixture
+def bundle(tmp_path: Any) -> str:
+    path = tmp_path / "world.json"
+    path.write_text(json.dumps(BUNDLE), encoding="utf-8")
+    return str(path)
+
+def _run(bundle: str, tmp_path: Any, *args: str) -> List[Dict[str, Any]]:
+    out = tmp_path / "frames.ndjson"
+    assert main.main([bundle, *args, "--out", str(out), "--no-summary"]) == 0
+    lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert "intents" in lines[0]
+    return lines[1:]
+
+def _sealed_chain(ticks: int, seal_every: int) -> List[Any]:
+    k = main.build_kernel(BUNDLE, PiKernelConfig(seal_every=seal_every, projection_mode="none"))
+    k.enqueue_event(PiEvent(type="impulse", target="anchor", payload={"impulse": [0, 2, 0]}))
+    out = []
+    for t in range(ticks):
+        if t == ticks - 1:
+            k.request_seal()
+        out.append(k.tick_once())
+    return out
+
+@pytest.mark.parametrize("args", [["--final-only"], ["--every", "4"], []])
+def test_final_frame_is_sealed(bundle: str, tmp_path: Any, args: List[str]) -> None:
+    frames = _run(bundle, tmp_path, "11", "--seal-every", "5", *args)
+    ref = _sealed_chain(11, 5)
+    assert ref[-1].sealed and ref[-1].tick_hash != ref[-2].tick_hash
+    assert frames[-1]["tick"] == 11 and frames[-1]["tick_hash"] == ref[-1].tick_hash
+    want = {"--final-only": [11], "--every": [4, 8, 11]}.get(args[0] if args else "", list(range(1, 12)))
+    assert [f["tick"] for f in frames] == want
+
+def test_sparse_frames_are_keyframes(bundle: str, tmp_path: Any) -> None:
+    frames = _run(bundle, tmp_path, "8", "--every", "3")
+    assert all(f["keyframe"] and set(f["projection"]) == {"anchor", "b0", "b1", "b2", "b3"} for f in frames)
+
+def test_binary_frames_match_ndjson(bundle: str, tmp_path: Any) -> None:
+    ref = _run(bundle, tmp_path, "6", "--projection", "delta")
+    out = tmp_path / "frames.pifs"
+    main.main([bundle, "6", "--projection", "delta", "--format", "binary", "--out", str(out), "--no-summary"])
+    with open(out, "rb") as f:
+        records = list(read_frames(io.BytesIO(f.read())))
+    assert records[0][0] == "header" and set(records[0][1]["bindings"]) == {"anchor", "b0", "b1", "b2", "b3"}
+    got = [r for kind, r in records[1:]]
+    assert [(g["tick"], g["tick_hash"], g["keyframe"]) for g in got] == \
+           [(r["tick"], r["tick_hash"], r["keyframe"]) for r in ref]
+    for g, r in zip(got, ref):
+        assert {b: e["position"] for b, e in g["projection"].items()} == \
+               {b: e["position"] for b, e in r["projection"].items()}
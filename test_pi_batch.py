@@ -0,0 +1,48 @@
+from __future__ import annotations
+import json
+from typing import Any, List
+
+import pytest
+
+from main import build_kernel
+from pi_batch import PiBatchJob, expand_bundles, run_batch
+from pi_types import PiKernelConfig
+
+def _bundle(i: int) -> Any:
+    return {"%pi": {
+        "world": {"gravity": [0, -9.81, 0], "fields": [{"field_type": "wind", "parameters": {"strength": 0.2 * i}}]},
+        "bodies": [{"id": f"b{j}", "mass": 1.0 + j, "position": [j, i, 0]} for j in range(5)],
+        "constraints": [{"id": "s0", "type": "spring", "a": "b0", "b": "b1", "params": {"rest_length": 1.0}}],
+    }}
+
+@pytest.fixture
+def bundles(tmp_path: Any) -> List[str]:
+    for i in range(4):
+        (tmp_path / f"w{i}.json").write_text(json.dumps(_bundle(i)), encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("not a bundle", encoding="utf-8")
+    return expand_bundles([str(tmp_path)])
+
+def _final_hash(i: int, ticks: int, config: PiKernelConfig) -> str:
+    k = build_kernel(_bundle(i), config)
+    for t in range(ticks):
+        if t == ticks - 1:
+            k.request_seal()
+        res = k.tick_once()
+    return res.tick_hash
+
+def test_expand_bundles_lists_json_files_sorted(bundles: List[str]) -> None:
+    assert [p.rsplit("/", 1)[-1] for p in bundles] == ["w0.json", "w1.json", "w2.json", "w3.json"]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_come_back_in_job_order(bundles: List[str], workers: int) -> None:
+    config = PiKernelConfig(seal_every=4)
+    jobs = [PiBatchJob(p, 10, every=3, config=config) for p in bundles]
+    jobs.append(PiBatchJob(bundles[0] + ".missing", 10))
+    out = list(run_batch(jobs, workers))
+    assert [r["bundle"] for r in out] == [j.bundle for j in jobs]
+    for i, r in enumerate(out[:-1]):
+        assert r["error"] is None and r["ticks"] == 10
+        assert r["final_hash"] == _final_hash(i, 10, config)  # sealed although 10 % 4 != 0
+        assert [f["tick"] for f in r["frames"]] == [3, 6, 9, 10]
+        assert set(r["frames"][-1]["projection"]) == {f"b{j}" for j in range(5)}
+    assert out[-1]["error"].startswith("FileNotFoundError")
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import json
+from dataclasses import replace
+from typing import Any, Dict
+
+import pytest
+
+from pi_types import PiKernelConfig
+from main import build_kernel
+from pi_bench import CASES, PiBenchCase, compare, config_mismatch, generate_bundle, main, run_case, run_suite
+
+def test_generator_is_deterministic_and_loads() -> None:
+    case = PiBenchCase("t", bodies=50, springs=60, topology="grid", fields=3, field_type="mixed", substeps=2)
+    bundle = generate_bundle(case)
+    assert json.dumps(bundle) == json.dumps(generate_bundle(case))
+    assert json.dumps(bundle) != json.dumps(generate_bundle(replace(case, seed=2)))
+    k = build_kernel(bundle, PiKernelConfig())
+    assert len(k.bodies) == 50 and len(k.constraints) == 60
+    assert k.world.substeps == 2 and len(k.world.fields) == 3
+
+@pytest.mark.parametrize("topology,springs", [("none", 0), ("chain", 39), ("grid", 40), ("star", 38), ("random", 40)])
+def test_topologies(topology: str, springs: int) -> None:
+    bundle = generate_bundle(PiBenchCase("t", bodies=40, springs=40, topology=topology))
+    cons = bundle["%pi"]["constraints"]
+    assert len(cons) == springs
+    pos = {b["id"]: b["position"] for b in bundle["%pi"]["bodies"]}
+    for c in cons:
+        # springs start at rest length
+        d = sum((pos[c["a"]][j] - pos[c["b"]][j]) ** 2 for j in range(3)) ** 0.5
+        assert c["a"] != c["b"] and c["params"]["rest_length"] == d
+
+def test_unknown_names_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        generate_bundle(PiBenchCase("t", field_type="vortex"))
+    with pytest.raises(ValueError):
+        generate_bundle(PiBenchCase("t", topology="torus"))
+    with pytest.raises(ValueError):
+        run_suite(["nope"])
+
+def test_run_case_reports_the_plain_hash_chain() -> None:
+    case = PiBenchCase("t", bodies=30, springs=30, ticks=5)
+    res = run_case(case)
+    k = build_kernel(generate_bundle(case), PiKernelConfig())
+    for _ in range(case.ticks):
+        last = k.tick_once()
+    assert res["final_hash"] == last.tick_hash
+    assert res["ticks_per_sec"] > 0 and res["peak_bytes"] > 0
+    assert res["hash_ms_per_tick"] == res["step_ms_per_tick"]["step_seal"]
+
+def _results(tps: float, peak: int, final: str, **cfg: Any) -> Dict[str, Any]:
+    case = {"name": "small"}
+    return {"meta": {"config": dict(backend="python", **cfg)},
+            "cases": {"small": {"case": case, "ticks_per_sec": tps, "peak_bytes": peak, "final_hash": final}}}
+
+def test_compare_flags_regressions() -> None:
+    base = _results(100.0, 1000, "a")
+    assert compare(_results(95.0, 1050, "a"), base) == []
+    out = compare(_results(80.0, 1200, "b"), base)
+    assert [line.split(":")[1].split()[0] for line in out] == ["ticks/sec", "peak", "final"]
+
+def test_config_mismatch_skips_hash_compare() -> None:
+    base = _results(100.0, 1000, "a")
+    cur = _results(100.0, 1000, "b", sleep=True)
+    assert config_mismatch(cur, base) == ["config.sleep: None -> True"]
+    assert compare(cur, base) == []
+
+def test_cli_gen_run_and_baseline(tmp_path: Any) -> None:
+    out = tmp_path / "b.json"
+    assert main(["gen", str(out), "--bodies", "20", "--springs", "10"]) == 0
+    assert len(json.loads(out.read_text(encoding="utf-8"))["%pi"]["bodies"]) == 20
+    res = tmp_path / "r.json"
+    assert main(["run", "--cases", "small", "--ticks", "3", "--out", str(res)]) == 0
+    stored = json.loads(res.read_text(encoding="utf-8"))
+    assert set(stored["cases"]) == {"small"} and stored["cases"]["small"]["case"]["ticks"] == 3
+    stored["cases"]["small"]["final_hash"] = "0" * 64
+    res.write_text(json.dumps(stored), encoding="utf-8")
+    assert main(["run", "--cases", "small", "--ticks", "3", "--baseline", str(res), "--tolerance", "1e9"]) == 1
+    assert set(CASES) >= {"small", "medium", "large"}
@@ -0,0 +1,93 @@
+from __future__ import annotations
+import io
+import json
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+import main
+from pi_types import PiEvent
+from pi_kernel import PiKernel
+from pi_bundle import (cache_path, compile_bundle, compile_stream, file_digest, load_bundle, load_cached,
+                       read_compiled, validate_bundle, write_compiled)
+
+# Loose bundle: the plain loader str()s ids and keeps any tree; the schema rejects both.
+LOOSE: Dict[str, Any] = {
+    "%pi": {
+        "world": {"gravity": [0, -9.81, 0], "fields": [
+            {"field_type": "wind", "parameters": {"direction": [1, 0, 0], "strength": 0.5}}]},
+        "bodies": [{"id": 0, "flags": ["static"]}]
+                  + [{"id": i, "mass": 1.0 + i, "position": [i, 1, 0]} for i in range(1, 5)],
+        "constraints": [{"id": i, "type": "spring", "a": i, "b": i + 1, "params": {"rest_length": 1, "stiffness": 9}}
+                        for i in range(4)],
+    },
+    "⟁tree": {"⟁node": "body", "⟁children": ["text", 3, {"⟁node": "div", "⟁children": []}]},
+}
+
+@pytest.fixture
+def loose(tmp_path: Any) -> str:
+    path = tmp_path / "loose.json"
+    path.write_text(json.dumps(LOOSE), encoding="utf-8")
+    return str(path)
+
+def _chain(k: PiKernel, ticks: int = 20) -> List[str]:
+    k.enqueue_event(PiEvent("impulse", "2", {"impulse": [0.0, 2.0, 0.0]}))
+    return [k.tick_once().tick_hash for _ in range(ticks)]
+
+def test_schema_rejects_the_loose_bundle() -> None:
+    with pytest.raises(ValueError):
+        validate_bundle(LOOSE)
+
+def test_cache_loads_what_the_plain_path_loads(loose: str, tmp_path: Any) -> None:
+    cache = str(tmp_path / "cache")
+    ref = _chain(main.build_kernel(load_bundle(loose)))
+    miss = load_cached(loose, cache)
+    hit = load_cached(loose, cache)
+    streamed = compile_stream(io.StringIO(json.dumps(LOOSE)), validate=False)
+    for cb in (miss, hit, streamed):
+        assert _chain(cb.build_kernel()) == ref
+    assert os.listdir(cache) == [os.path.basename(cache_path(cache, file_digest(loose), False))]
+
+def test_validation_is_opt_in_and_consistent(loose: str, tmp_path: Any) -> None:
+    cache = str(tmp_path / "cache")
+    load_cached(loose, cache)
+    # a raw entry never satisfies a validating load
+    with pytest.raises(ValueError):
+        load_cached(loose, cache, validate=True)
+    with pytest.raises(ValueError):
+        compile_stream(io.StringIO(json.dumps(LOOSE)))
+    for args in ([], ["--cache"]):
+        with pytest.raises(ValueError):
+            main.main([loose, "--validate", "--out", str(tmp_path / "f"), "--no-summary", *args])
+
+def test_validated_entries_serve_both_modes(tmp_path: Any) -> None:
+    strict = json.loads(json.dumps(LOOSE))
+    strict["%pi"]["bodies"] = [dict(b, id=str(b["id"])) for b in LOOSE["%pi"]["bodies"]]
+    strict["%pi"]["constraints"] = [dict(c, id=f"s{c['id']}", a=str(c["a"]), b=str(c["b"]))
+                                    for c in LOOSE["%pi"]["constraints"]]
+    strict["⟁tree"] = {"⟁node": "body", "⟁children": []}
+    validate_bundle(strict)
+    path = tmp_path / "strict.json"
+    path.write_text(json.dumps(strict), encoding="utf-8")
+    cache = str(tmp_path / "cache")
+    ref = _chain(load_cached(str(path), cache, validate=True).build_kernel())
+    assert _chain(load_cached(str(path), cache).build_kernel()) == ref
+    assert os.listdir(cache) == [os.path.basename(cache_path(cache, file_digest(str(path))))]
+
+def test_compiled_round_trip(tmp_path: Any) -> None:
+    cb = compile_bundle(LOOSE, "ab" * 32, validate=False)
+    out = str(tmp_path / "b.pibc")
+    write_compiled(cb, out)
+    back = read_compiled(out, cb.digest)
+    assert _chain(back.build_kernel()) == _chain(main.build_kernel(LOOSE))
+    assert back.tree == LOOSE["⟁tree"]
+
+def test_main_cache_matches_plain(loose: str, tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("PI_BUNDLE_CACHE", str(tmp_path / "cache"))
+    outs = []
+    for args in ([], ["--cache"], ["--cache"]):
+        out = tmp_path / "frames.ndjson"
+        assert main.main([loose, "12", "--out", str(out), "--no-summary", *args]) == 0
+        outs.append(out.read_text(encoding="utf-8"))
+    assert outs[0] == outs[1] == outs[2]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from typing import Any, List
+
+import pytest
+
+from pi_types import PiBody, PiConstraint, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+from pi_checkpoint import load_checkpoint, save_checkpoint
+
+TICKS = 40
+
+def _kernel(solver_mode: str = "force", **cfg: Any) -> PiKernel:
+    world = PiWorldSpec(solver_mode=solver_mode, fields=[
+        {"field_type": "attraction_well", "parameters": {"position": [0, 30, 0], "strength": 2.0, "radius": 40.0}}])
+    bodies = [PiBody("anchor", flags=["static"]), PiBody("ground", mass=0.0, position=(0, -5, 0))]
+    bodies += [PiBody(f"b{i}", mass=1 + i, position=(i, 1, 0), drag=0.05) for i in range(6)]  # int fields hash as ints
+    bodies += [PiBody(f"r{i}", position=(50.0 + i, 0.0, 0.0)) for i in range(2)]
+    ids = ["anchor"] + [f"b{i}" for i in range(6)]
+    constraints = [PiConstraint(f"s{k}", "spring", a, b, {"rest_length": 1.0, "stiffness": 12.0, "damping": 0.4})
+                   for k, (a, b) in enumerate(zip(ids, ids[1:]))]
+    return PiKernel(world, bodies, constraints, {"⟁node": "body", "⟁children": []}, PiKernelConfig(**cfg))
+
+def _drive(k: PiKernel, start: int, stop: int) -> List[str]:
+    out = []
+    for t in range(start, stop):
+        if t % 4 == 0:
+            k.enqueue_event(PiEvent("impulse", f"b{t % 6}", {"impulse": [0.5, 1.0, -0.25]}))
+        out.append(k.tick_once().tick_hash)
+    return out
+
+CONFIGS = [
+    ("force", {}),
+    ("force", {"backend": "soa"}),
+    ("pbd", {}),
+    ("pbd", {"backend": "soa"}),
+    ("force", {"sleep": True, "sleep_ticks": 5}),
+    ("force", {"seal_mode": "merkle", "seal_every": 3}),
+]
+
+@pytest.mark.parametrize("solver_mode,cfg", CONFIGS)
+def test_restore_continues_the_chain(tmp_path: Any, solver_mode: str, cfg: Any) -> None:
+    if cfg.get("backend") == "soa":
+        pytest.importorskip("numpy")
+    full = _drive(_kernel(solver_mode, **cfg), 0, TICKS)
+    k = _kernel(solver_mode, **cfg)
+    head = _drive(k, 0, TICKS // 2)
+    k.enqueue_event(PiEvent("impulse", "b2", {"impulse": [0.0, 3.0, 0.0]}))  # pending across the save
+    path = str(tmp_path / "k.pick")
+    save_checkpoint(k, path)
+    restored = load_checkpoint(path)
+    assert (restored.epoch, restored.tick, restored.prev_hash) == (k.epoch, k.tick, k.prev_hash)
+    assert _drive(restored, TICKS // 2, TICKS) == _drive(k, TICKS // 2, TICKS)
+    assert head[-1] == full[TICKS // 2 - 1]
+
+def test_restore_onto_another_backend(tmp_path: Any) -> None:
+    pytest.importorskip("numpy")
+    k = _kernel()
+    _drive(k, 0, 10)
+    path = str(tmp_path / "k.pick")
+    save_checkpoint(k, path)
+    forked = load_checkpoint(path, PiKernelConfig(backend="soa"))
+    assert _drive(forked, 10, 30) == _drive(k, 10, 30)
+
+def test_int_values_and_pending_seal_survive(tmp_path: Any) -> None:
+    k = _kernel(seal_every=5)
+    k.request_seal()
+    path = str(tmp_path / "k.pick")
+    save_checkpoint(k, path)
+    restored = load_checkpoint(path)
+    b = restored._bodies_by_id["b1"]
+    assert type(b.mass) is int and type(b.position[0]) is int
+    assert restored.tick_once().sealed and k.tick_once().sealed
+
+def test_rejects_foreign_files(tmp_path: Any) -> None:
+    path = tmp_path / "x.pick"
+    path.write_bytes(b"NOPE" + b"\0" * 200)
+    with pytest.raises(ValueError):
+        load_checkpoint(str(path))
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import random
+from typing import Dict, List
+
+from pi_types import PiBody, PiConstraint, vadd, vlen, vmul, vnorm, vsub
+from pi_constraints import compile_springs, solve_compiled_springs, solve_springs
+
+def _reference(bodies_by_id: Dict[str, PiBody], constraints: List[PiConstraint]) -> None:
+    # per-constraint lookups and parsing, as before springs were compiled
+    for c in constraints:
+        if c.type != "spring":
+            continue
+        a = bodies_by_id.get(c.a)
+        b = bodies_by_id.get(c.b)
+        if not a or not b:
+            continue
+        rest = float(c.params.get("rest_length", 1.0))
+        k = float(c.params.get("stiffness", 40.0))
+        damp = float(c.params.get("damping", 6.0))
+        delta = vsub(b.position, a.position)
+        dist = vlen(delta)
+        if dist <= 1e-9:
+            continue
+        dirv = vnorm(delta)
+        rv = vsub(b.velocity, a.velocity)
+        rel = rv[0]*dirv[0] + rv[1]*dirv[1] + rv[2]*dirv[2]
+        f = vmul(dirv, (k * (dist - rest)) + (damp * rel))
+        if not a.is_static():
+            a.force = vadd(a.force, f)
+        if not b.is_static():
+            b.force = vadd(b.force, vmul(f, -1.0))
+
+def _world(seed: int):
+    rnd = random.Random(seed)
+    bodies = [PiBody(f"b{i}", mass=rnd.uniform(0.5, 2.0), position=tuple(rnd.uniform(-3.0, 3.0) for _ in range(3)),
+                     velocity=tuple(rnd.uniform(-1.0, 1.0) for _ in range(3)),
+                     flags=["static"] if i % 7 == 0 else [])
+              for i in range(50)]
+    bodies.append(PiBody("twin", position=bodies[1].position))  # coincident: skipped
+    constraints = []
+    for k in range(200):
+        a, b = f"b{rnd.randrange(50)}", f"b{rnd.randrange(55)}"  # b50..b54 do not exist
+        params = {"rest_length": rnd.uniform(0.5, 2.0), "stiffness": rnd.uniform(5.0, 60.0)}
+        if k % 3:
+            params["damping"] = rnd.uniform(0.0, 4.0)
+        constraints.append(PiConstraint(f"s{k}", "spring" if k % 13 else "hinge", a, b, params))
+    constraints.append(PiConstraint("st", "spring", "b1", "twin", {}))
+    return bodies, constraints
+
+def test_compile_resolves_once_in_order() -> None:
+    bodies, constraints = _world(1)
+    by_id = {b.id: b for b in bodies}
+    springs = compile_springs(by_id, constraints)
+    kept = [c for c in constraints if c.type == "spring" and c.a in by_id and c.b in by_id]
+    assert [(s[0].id, s[1].id) for s in springs] == [(c.a, c.b) for c in kept]
+    assert springs[-1][2:] == (1.0, 40.0, 6.0)  # defaults
+
+def test_compiled_forces_match_reference() -> None:
+    for seed in range(3):
+        ref, constraints = _world(seed)
+        _reference({b.id: b for b in ref}, constraints)
+        got, _ = _world(seed)
+        solve_compiled_springs(compile_springs({b.id: b for b in got}, constraints))
+        assert [b.force for b in got] == [b.force for b in ref]
+        again, _ = _world(seed)
+        solve_springs({b.id: b for b in again}, constraints)
+        assert [b.force for b in again] == [b.force for b in ref]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+from typing import Any, List
+
+import pytest
+
+from pi_types import PiBody, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+from pi_events import PiEventQueue, action_vector
+
+def _queue() -> PiEventQueue:
+    return PiEventQueue({"a": 0, "b": 1, "wall": 2}, [False, False, True])
+
+def test_events_coalesce_per_body_in_arrival_order() -> None:
+    q = _queue()
+    assert q.push(PiEvent("impulse", "b", {"impulse": [1, 0, 0]}))
+    assert q.push(PiEvent("impulse", "a", {"impulse": [0.1, 0, 0]}))
+    assert q.push(PiEvent("impulse", "b", {"impulse": [0.2, 1, 0]}))
+    assert q.push(PiEvent("attraction", "a", {"force": [0, 0, 3]}))
+    assert q.rows() == [1, 0] and len(q) == 3
+    impulse, force = q.drain()
+    assert impulse == {1: [1.0 + 0.2, 1.0, 0.0], 0: [0.1, 0.0, 0.0]} and force == {0: [0.0, 0.0, 3.0]}
+    assert not q.impulse and not q.force
+
+def test_unusable_events_are_dropped() -> None:
+    q = _queue()
+    assert not q.push(PiEvent("impulse", "wall", {"impulse": [1, 0, 0]}))
+    assert not q.push(PiEvent("impulse", "ghost", {"impulse": [1, 0, 0]}))
+    assert not q.push(PiEvent("route_intent", "a", {"to": "x"}))
+    assert not q.push(PiEvent("torque", "a", {"magnitude": 2}))
+    assert q.dropped == 4 and len(q) == 0
+
+def test_action_items() -> None:
+    assert action_vector({"type": "impulse", "direction": [0, 2, 0], "magnitude": 3}) == ("impulse", (0.0, 3.0, 0.0))
+    assert action_vector({"type": "repel", "direction": [1, 0, 0], "magnitude": 2}) == ("force", (-2.0, 0.0, 0.0))
+    q = _queue()
+    n = q.push_actions([{"target": "a", "action": {"type": "attract", "direction": [1, 0, 0]}},
+                        {"target": "b", "action": {"type": "torque"}},
+                        {"target": "wall", "action": {"type": "impulse", "direction": [1, 0, 0]}}])
+    assert n == 1 and q.force == {0: [1.0, 0.0, 0.0]} and q.dropped == 2
+
+def _kernel(**cfg: Any) -> PiKernel:
+    bodies = [PiBody("wall", flags=["static"])] + [PiBody(f"b{i}", mass=0.5 + i) for i in range(3)]
+    return PiKernel(PiWorldSpec(gravity=(0.0, 0.0, 0.0)), bodies, [], {}, PiKernelConfig(**cfg))
+
+@pytest.mark.parametrize("backend", ["python", "soa"])
+def test_single_event_applies_as_before(backend: str) -> None:
+    if backend == "soa":
+        pytest.importorskip("numpy")
+    k = _kernel(backend=backend)
+    k.enqueue_event(PiEvent("impulse", "b2", {"impulse": [0.3, 0.0, -0.7]}))
+    k.tick_once()
+    v = k._bodies_by_id["b2"].velocity
+    assert v == (0.3 / 2.5, 0.0, -0.7 / 2.5)
+
+@pytest.mark.parametrize("backend", ["python", "soa"])
+def test_burst_of_events_is_one_update_per_body(backend: str) -> None:
+    if backend == "soa":
+        pytest.importorskip("numpy")
+    k = _kernel(backend=backend)
+    events: List[PiEvent] = [PiEvent("impulse", f"b{i % 3}", {"impulse": [0.01 * i, 0.0, 0.0]}) for i in range(300)]
+    events.append(PiEvent("impulse", "wall", {"impulse": [1.0, 0.0, 0.0]}))
+    assert k.enqueue_events(events) == 300
+    k.events.append(PiEvent("attraction", "b0", {"force": [0.0, 6.0, 0.0]}))  # legacy list still drains
+    k.tick_once()
+    assert k.events_applied == 4 and k.events == []
+    total = 0.0
+    for i in range(0, 300, 3):
+        total += 0.01 * i
+    assert k._bodies_by_id["b0"].velocity[0] == total / 0.5
+    assert k._bodies_by_id["b0"].velocity[1] > 0.0
+    assert k._bodies_by_id["wall"].velocity == (0.0, 0.0, 0.0)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+import random
+from dataclasses import replace
+from typing import Any, List
+
+import pytest
+
+from pi_types import PiBody, PiKernelConfig, PiWorldSpec, Vec3, vadd
+from pi_kernel import PiKernel
+from pi_fields import PiFieldCompositor, calc_wind, default_field_compositor
+
+def _bodies(n: int = 60) -> List[PiBody]:
+    rnd = random.Random(2)
+    return [PiBody(f"b{i}", mass=rnd.uniform(0.5, 2.0), position=tuple(rnd.uniform(-5.0, 5.0) for _ in range(3)),
+                   flags=["static"] if i % 9 == 0 else [])
+            for i in range(n)]
+
+FIELDS = [
+    {"field_type": "wind", "parameters": {"direction": [1, 0, 0], "strength": 0.5,
+                                          "bounds": {"origin": [-2, -2, -2], "size": [4, 4, 4]}}},
+    {"field_type": "attraction_well", "parameters": {"position": [0, 3, 0], "strength": 2.0, "radius": 6.0}},
+    {"field_type": "vortex", "parameters": {"spin": 0.25}},
+]
+
+def _vortex(params: Any, body: PiBody) -> Vec3:
+    x, _, z = body.position
+    return (-z * params["spin"], 0.0, x * params["spin"])
+
+def _compositor() -> PiFieldCompositor:
+    comp = default_field_compositor()
+    comp.register("vortex", _vortex)
+    return comp
+
+def test_batch_matches_per_body() -> None:
+    pytest.importorskip("numpy")
+    from pi_soa import PiBodyArrays
+    comp = _compositor()
+    bodies = _bodies()
+    arrays = PiBodyArrays(bodies)
+    got = comp.total_force_batch(FIELDS, arrays, bodies).tolist()
+    for i in arrays.dyn_rows:  # per-body fallbacks only fill dynamic rows
+        assert got[i] == pytest.approx(list(comp.total_force(FIELDS, bodies[i])), abs=1e-12), i
+
+def test_plan_is_cached_per_field_list() -> None:
+    comp = _compositor()
+    assert comp.compile(FIELDS) is comp.compile(FIELDS)
+    assert comp.compile(list(FIELDS)) is not comp.compile(FIELDS)
+
+def _gust(params: Any, body: PiBody) -> Vec3:
+    return (0.0, params.get("strength", 0.0), 0.0)
+
+@pytest.mark.parametrize("backend", ["python", "soa"])
+def test_register_overrides_a_batched_type(backend: str) -> None:
+    if backend == "soa":
+        pytest.importorskip("numpy")
+    world = PiWorldSpec(gravity=(0.0, 0.0, 0.0), fields=[FIELDS[0]])
+    k = PiKernel(world, [PiBody("a", position=(0.0, 0.0, 0.0))], [], {}, PiKernelConfig(backend=backend))
+    k.tick_once()  # plan / pipeline cached with the built-in wind
+    k.field_comp.register("wind", _gust)
+    assert k.field_comp.batch_calculator("wind") is None
+    k.tick_once()
+    vx, vy, _ = k._bodies_by_id["a"].velocity
+    assert vy > 0.0 and vx == pytest.approx(0.5 / 60.0, rel=0.05)  # only the first tick pushed along x
+
+def test_register_batch_invalidates_both_caches() -> None:
+    pytest.importorskip("numpy")
+    comp = _compositor()
+    world = PiWorldSpec(fields=FIELDS)
+    plan, pipe = comp.compile(FIELDS), comp.compile_bodies(world)
+    comp.register_batch("wind", lambda parsed, arrays: arrays.position * 0.0)
+    assert comp.compile(FIELDS) is not plan and comp.compile_bodies(world) is not pipe
+    comp.register("wind", calc_wind)
+    assert comp.batch_calculator("wind") is None
+
+def _generic_step(comp: PiFieldCompositor, world: PiWorldSpec, bodies: List[PiBody]) -> None:
+    # the unfused PiBody step the pipeline replaced
+    for b in bodies:
+        if b.is_static():
+            continue
+        g = world.gravity
+        b.force = vadd(b.force, (g[0] * b.mass, g[1] * b.mass, g[2] * b.mass))
+        if world.air_density > 0.0:
+            vx, vy, vz = b.velocity
+            speed2 = vx*vx + vy*vy + vz*vz
+            drag_mag = 0.5 * world.air_density * speed2 * max(0.0, b.drag)
+            b.force = vadd(b.force, (-drag_mag * vx, -drag_mag * vy, -drag_mag * vz))
+        b.force = vadd(b.force, comp.total_force(world.fields, b))
+
+def _random_world(rnd: random.Random) -> PiWorldSpec:
+    fields: List[Any] = []
+    for _ in range(rnd.randrange(6)):
+        kind = rnd.choice(["wind", "attraction_well", "vortex", "unknown"])
+        if kind == "wind":
+            params: Any = {"direction": [rnd.uniform(-1, 1), rnd.choice([0.0, -0.0, 1.0]), rnd.uniform(-1, 1)],
+                           "strength": rnd.uniform(0.0, 2.0)}
+            if rnd.random() < 0.5:
+                params["bounds"] = {"origin": [-3, -3, -3], "size": [rnd.uniform(1, 6)] * 3}
+        elif kind == "attraction_well":
+            params = {"position": [rnd.uniform(-4, 4) for _ in range(3)], "strength": rnd.uniform(-2, 2),
+                      "radius": rnd.choice([2.0, 6.0, float("inf")]), "falloff_power": rnd.choice([0.5, 1.0, 2.0, 3.0])}
+        else:
+            params = {"spin": rnd.uniform(-1, 1)}
+        fields.append({"field_type": kind, "parameters": params})
+    return PiWorldSpec(gravity=(0.0, rnd.uniform(-10, 10), -0.0), air_density=rnd.choice([0.0, 1.225]), fields=fields)
+
+def test_fused_pipeline_matches_generic_step() -> None:
+    rnd = random.Random(9)
+    for _ in range(40):
+        world = _random_world(rnd)
+        ref, got = _bodies(), _bodies()
+        for bodies in (ref, got):
+            for b in bodies[::7]:
+                b.position = (float("nan"), 0.0, 0.0)
+            for b in bodies:
+                b.velocity = (0.5, -0.25, 1.0)
+        comp = _compositor()
+        _generic_step(comp, world, ref)
+        comp.compile_bodies(world).apply(got)
+        assert repr([b.force for b in got]) == repr([b.force for b in ref])
+
+def test_pipeline_is_rebuilt_when_fields_change() -> None:
+    comp = _compositor()
+    world = PiWorldSpec(fields=list(FIELDS))
+    pipe = comp.compile_bodies(world)
+    assert comp.compile_bodies(world) is pipe and len(pipe.terms) == 3
+    world.fields.append({"field_type": "unknown", "parameters": {}})
+    assert comp.compile_bodies(world) is not pipe and len(comp.compile_bodies(world).terms) == 3
+    assert len(comp.compile_bodies(replace(world, fields=[FIELDS[1]])).terms) == 1
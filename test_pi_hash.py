@@ -0,0 +1,97 @@
+from __future__ import annotations
+from typing import Any, List
+
+import pytest
+
+from pi_types import PiBody, PiConstraint, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+from pi_hash import PiMerkleSealer, canonical_state_binary, decode_state_binary
+
+def _kernel(**cfg: Any) -> PiKernel:
+    world = PiWorldSpec(gravity=(0.0, 0.0, 0.0), fields=[{
+        "field_type": "attraction_well", "parameters": {"position": [0, 20, 0], "strength": 1.5, "radius": 30.0}}])
+    bodies = [PiBody("ground", mass=0.0)] + [PiBody(f"b{i}", mass=1.0 + 0.5 * i, position=(float(i), 1.0, 0.0))
+                                            for i in range(6)]
+    # bodies at rest outside the well: only host edits change their leaves
+    bodies += [PiBody(f"r{i}", position=(100.0 + i, 0.0, 0.0)) for i in range(3)]
+    constraints = [PiConstraint(f"s{i}", "spring", f"b{i}", f"b{i + 1}", {"rest_length": 1.0, "stiffness": 8.0})
+                   for i in range(5)]
+    return PiKernel(world, bodies, constraints, {}, PiKernelConfig(**cfg))
+
+def _edit(k: PiKernel, t: int) -> None:
+    # host edits that change sealed state without moving anything
+    b = k._bodies_by_id[f"r{t % 3}"] if t % 4 else k._bodies_by_id["ground"]
+    if t % 3 == 0:
+        b.flags.append(f"tag{t}")
+    elif t % 3 == 1:
+        b.mass = b.mass + 0.25 if b.mass > 0.0 else 0.0
+    else:
+        b.flags = [f for f in b.flags if not f.startswith("tag")]
+
+MERKLE_CONFIGS = [{}, {"sleep": True}, {"backend": "soa"}, {"backend": "soa", "sleep": True}]
+
+@pytest.mark.parametrize("encoding", ["json", "binary"])
+@pytest.mark.parametrize("cfg", MERKLE_CONFIGS)
+def test_incremental_root_tracks_host_edits(cfg: Any, encoding: str) -> None:
+    if cfg.get("backend") == "soa":
+        pytest.importorskip("numpy")
+    k = _kernel(seal_mode="merkle", hash_encoding=encoding, **cfg)
+    for t in range(30):
+        if t % 5 == 0:
+            k.enqueue_event(PiEvent("impulse", "b2", {"impulse": [0.0, 1.0, 0.5]}))
+        if t % 2 == 0:
+            _edit(k, t)
+        k.tick_once()
+        fresh = PiMerkleSealer(k.bodies, k.constraints, encoding)
+        fresh.seal(k.prev_hash, k.epoch, k.tick, k.bodies)
+        assert k._merkle.root() == fresh.root(), t
+
+def test_flag_edit_changes_the_seal() -> None:
+    a, b = _kernel(seal_mode="merkle"), _kernel(seal_mode="merkle")
+    for k in (a, b):
+        k.tick_once()
+    a._bodies_by_id["r1"].flags.append("tag")
+    assert a.tick_once().tick_hash != b.tick_once().tick_hash
+
+def test_merkle_chain_is_backend_independent() -> None:
+    pytest.importorskip("numpy")
+    chains: List[List[str]] = []
+    for cfg in MERKLE_CONFIGS:
+        k = _kernel(seal_mode="merkle", **cfg)
+        out = []
+        for t in range(30):
+            if t % 4 == 0:
+                _edit(k, t)
+            out.append(k.tick_once().tick_hash)
+        chains.append(out)
+    assert all(c == chains[0] for c in chains[1:])
+
+def test_seal_cadence() -> None:
+    k = _kernel(seal_every=3, seal_epochs=True)
+    res = [k.tick_once() for _ in range(60)]
+    assert [r.sealed for r in res[:6]] == [False, False, True, False, False, True]
+    assert res[0].tick_hash == "0" * 64 and res[3].tick_hash == res[2].tick_hash
+    assert res[59].sealed  # epoch boundary (tick 60) with 60 % 3 == 0 as well
+    k = _kernel(seal_every=0, seal_epochs=True)
+    res = [k.tick_once() for _ in range(60)]
+    assert [i for i, r in enumerate(res) if r.sealed] == [59]
+
+@pytest.mark.parametrize("backend", ["python", "soa"])
+def test_binary_encoder_tracks_flag_edits(backend: str) -> None:
+    if backend == "soa":
+        pytest.importorskip("numpy")
+    k = _kernel(hash_encoding="binary", backend=backend)
+    for t in range(12):
+        _edit(k, t)
+        k.tick_once()
+        got = k._encoder.encode(k.epoch, k.tick, k.bodies, k._soa)
+        assert got == canonical_state_binary(k.epoch, k.tick, k.bodies, k.constraints), t
+        flags = {b["id"]: b["f"] for b in decode_state_binary(got)["bodies"]}
+        assert flags == {b.id: sorted(b.flags) for b in k.bodies}
+
+def test_binary_chain_sees_flag_edits() -> None:
+    a, b = _kernel(hash_encoding="binary"), _kernel(hash_encoding="binary")
+    for k in (a, b):
+        k.tick_once()
+    a._bodies_by_id["r1"].flags.append("tag")
+    assert a.tick_once().tick_hash != b.tick_once().tick_hash
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import copy
+from typing import Any, Dict, List
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pi_types import PiBody, PiKernelConfig, PiWorldSpec, Vec3
+from pi_kernel import PiKernel
+from pi_fields import default_field_compositor
+from pi_soa import PiBodyArrays
+from pi_lattice import bake_lattice, bake_wind, value_noise
+
+WELL: Dict[str, Any] = {"field_type": "attraction_well", "parameters": {
+    "position": [0, 0, 0], "strength": 1.0, "radius": 8.0, "falloff_power": 1.0}}
+WIND: Dict[str, Any] = {"field_type": "wind", "parameters": {
+    "direction": [0, 1, 0], "strength": 0.5, "bounds": {"origin": [-4, -4, -4], "size": [8, 8, 8]}}}
+
+def _points(n: int, lo: float, hi: float, seed: int = 1) -> Any:
+    return np.random.default_rng(seed).uniform(lo, hi, (n, 3))
+
+def _exact(fields: List[Dict[str, Any]], pos: Any, drag: float = 0.1) -> Any:
+    bodies = [PiBody(f"b{i}", position=tuple(p), drag=drag) for i, p in enumerate(pos.tolist())]
+    return default_field_compositor().total_force_batch(fields, PiBodyArrays(bodies), bodies)
+
+def test_lattice_approximates_exact_fields() -> None:
+    fields = [WELL, WIND]
+    pos = _points(500, -3.5, 3.5)
+    pos = pos[np.sqrt((pos * pos).sum(axis=1)) > 2.0]  # away from the well's 1/d peak
+    lat = bake_lattice(default_field_compositor(), fields, resolution=64)
+    err = np.abs(lat.sample(pos, np.full(pos.shape[0], 0.1)) - _exact(fields, pos)).max()
+    assert err < 0.02
+    assert lat.table.shape == (int(np.prod(lat.shape)), 6) and not lat.rest
+
+def test_outside_the_grid() -> None:
+    uniform = {"field_type": "wind", "parameters": {"direction": [1, 0, 0], "strength": 2.0}}
+    lat = bake_lattice(default_field_compositor(), [WELL, WIND, uniform], resolution=8)
+    far = np.array([[50.0, 50.0, 50.0], [float("nan"), 0.0, 0.0]])
+    got = lat.sample(far, np.array([0.0, 0.5]))
+    assert got.tolist() == [[2.0, 0.0, 0.0], [1.0, 0.0, 0.0]]  # bounded fields are zero, uniform wind stays
+
+def _vortex(params: Any, body: PiBody) -> Vec3:
+    return (0.0, 0.0, 1.0)
+
+def test_unbounded_and_custom_fields_stay_exact() -> None:
+    comp = default_field_compositor()
+    comp.register("vortex", _vortex)
+    inf_well = {"field_type": "attraction_well", "parameters": {"position": [0, 0, 0], "radius": float("inf")}}
+    inf_wind = {"field_type": "wind", "parameters": {"direction": [1, 0, 0],
+                                                     "bounds": {"origin": [0, 0, 0], "size": [float("inf")] * 3}}}
+    vortex = {"field_type": "vortex", "parameters": {}}
+    unknown = {"field_type": "unknown", "parameters": {}}
+    lat = bake_lattice(comp, [WELL, inf_well, inf_wind, vortex, unknown])
+    assert lat.rest == [inf_well, inf_wind, vortex]
+
+def test_turbulence_is_seeded_and_falloff_shapes_strength() -> None:
+    q = _points(1000, -20.0, 20.0)
+    n = value_noise(q, 3)
+    assert n.min() >= -1.0 and n.max() <= 1.0
+    assert np.array_equal(n, value_noise(q, 3)) and not np.array_equal(n, value_noise(q, 4))
+    params = dict(WIND["parameters"], turbulence=0.5, seed=2)
+    a, b = bake_wind(params, q), bake_wind(dict(params, seed=9), q)
+    inside = (np.abs(q) <= 4.0).all(axis=1)
+    assert np.array_equal(a, bake_wind(params, q)) and not np.array_equal(a[inside], b[inside])
+    assert not a[~inside].any()
+    strength = np.sqrt((a[inside] ** 2).sum(axis=1))
+    assert np.allclose(strength, 0.5)  # turbulence turns the wind, never scales it
+    centre = np.array([[0.0, 0.0, 0.0], [4.0, 4.0, 4.0]])
+    for falloff, edge in (("linear", 0.0), ("quadratic", 0.0), ("exponential", 0.5 * np.exp(-3.0))):
+        got = bake_wind(dict(WIND["parameters"], falloff=falloff), centre)[:, 1]
+        assert got[0] == 0.5 and got[1] == pytest.approx(edge)
+    with pytest.raises(ValueError):
+        bake_wind(dict(WIND["parameters"], falloff="cubic"), centre)
+
+def _kernel(fields: List[Dict[str, Any]], **cfg: Any) -> PiKernel:
+    bodies = [PiBody(f"b{i}", position=tuple(p)) for i, p in enumerate(_points(40, -3.0, 3.0, 5).tolist())]
+    return PiKernel(PiWorldSpec(gravity=(0.0, 0.0, 0.0), fields=copy.deepcopy(fields)), bodies, [], {}, PiKernelConfig(**cfg))
+
+def test_kernel_lattice_mode() -> None:
+    with pytest.raises(ValueError):
+        _kernel([WELL], field_mode="lattice")
+    exact = _kernel([WELL, WIND], backend="soa")
+    lattice = _kernel([WELL, WIND], backend="soa", field_mode="lattice", lattice_resolution=64)
+    for _ in range(10):
+        exact.tick_once()
+        lattice.tick_once()
+    baked = lattice._lattice
+    for a, b in zip(exact.bodies, lattice.bodies):
+        assert b.position == pytest.approx(a.position, abs=1e-2)
+    lattice.world.fields[1]["parameters"]["strength"] = 0.5  # same dicts: no rebake
+    lattice.tick_once()
+    assert lattice._lattice is baked
+    lattice.world.fields[1] = copy.deepcopy(WIND)  # replaced dict: rebake
+    lattice.tick_once()
+    assert lattice._lattice is not baked
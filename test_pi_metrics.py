@@ -0,0 +1,71 @@
+from __future__ import annotations
+import json
+from typing import Any, List, Tuple
+
+from pi_types import PiBody, PiConstraint, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+from pi_metrics import BUCKETS, COUNTERS, PiMetrics
+
+def _kernel(substeps: int = 1, **cfg: Any) -> PiKernel:
+    world = PiWorldSpec(substeps=substeps, fields=[
+        {"field_type": "wind", "parameters": {"direction": [1, 0, 0], "strength": 0.5}},
+        {"field_type": "attraction_well", "parameters": {"position": [0, 5, 0], "strength": 1.0, "radius": 20.0}}])
+    bodies = [PiBody("anchor", flags=["static"])] + [PiBody(f"b{i}", position=(float(i), 0.0, 0.0)) for i in range(1, 6)]
+    constraints = [PiConstraint(f"s{i}", "spring", f"b{i - 1}" if i > 1 else "anchor", f"b{i}", {"rest_length": 1.0})
+                   for i in range(1, 6)]
+    return PiKernel(world, bodies, constraints, {}, PiKernelConfig(**cfg))
+
+def test_metrics_do_not_change_the_chain() -> None:
+    plain, timed = _kernel(), _kernel()
+    timed.enable_metrics()
+    for t in range(10):
+        for k in (plain, timed):
+            if t % 3 == 0:
+                k.enqueue_event(PiEvent("impulse", "b2", {"impulse": [0.0, 1.0, 0.0]}))
+        assert plain.tick_once().tick_hash == timed.tick_once().tick_hash
+
+def test_counters_and_hooks() -> None:
+    k = _kernel(substeps=2, seal_every=2)
+    m = k.enable_metrics(PiMetrics(window=4))
+    calls: List[Tuple[str, str]] = []
+    m.add_hook(pre=lambda s: calls.append(("pre", s)), post=lambda s, dt: calls.append(("post", s)))
+    k.enqueue_event(PiEvent("impulse", "b1", {"impulse": [1.0, 0.0, 0.0]}))
+    for _ in range(6):
+        k.tick_once()
+    c = m.counters
+    assert c["ticks"] == 6 and c["seals"] == 3 and c["events_applied"] == 1
+    assert c["bodies_touched"] == 5 * 2 * 6 and c["fields_evaluated"] == 2 * 5 * 2 * 6
+    assert c["springs_solved"] == 5 * 2 * 6
+    first = [s for p, s in calls[:18] if p == "pre"]
+    assert first == ["fields", "symbolic_forces", "constraints", "integrate"] * 2 + ["projection"]
+    assert calls[:2] == [("pre", "fields"), ("post", "fields")]
+
+    snap = json.loads(json.dumps(m.snapshot()))
+    assert snap["steps"]["tick"]["samples"] == 4 and m.observed["tick"] == 6
+    assert snap["steps"]["seal"]["samples"] == 3
+    m.reset()
+    assert m.counters == {name: 0 for name in COUNTERS} and not m.snapshot()["steps"]
+
+def test_prometheus_histogram_is_cumulative() -> None:
+    m = PiMetrics(window=2)
+    for s in (0.00001, 0.0003, 0.0003, 2.0):
+        m._tick = {"fields": int(s * 1e9)}
+        m.end_tick()
+    text = m.prometheus()
+    assert "pi_ticks_total 4" in text
+    buckets = [line for line in text.splitlines() if line.startswith('pi_step_seconds_bucket{step="fields"')]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert len(counts) == len(BUCKETS) + 1 and counts == sorted(counts)
+    assert counts[0] == 1 and counts[BUCKETS.index(0.0005)] == 3 and counts[-2] == 3 and counts[-1] == 4
+    assert 'pi_step_seconds_count{step="fields"} 4' in text
+    # quantiles cover the rolling window only
+    assert 'pi_step_window_seconds{step="fields",quantile="0.5"} 0.0003' in text
+    assert 'pi_step_window_seconds{step="fields",quantile="0.99"} 2.0' in text
+
+def test_disable_metrics() -> None:
+    k = _kernel()
+    m = k.enable_metrics()
+    k.tick_once()
+    k.disable_metrics()
+    k.tick_once()
+    assert k.metrics is None and m.counters["ticks"] == 1
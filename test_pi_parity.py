@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+
+import pytest
+
+from pi_types import PiBody, PiConstraint, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+from pi_hash import canonical_state_snapshot, sha256_json
+
+# Backend parity: every backend must extend the same hash chain as the PiBody loop.
+
+TICKS = 40
+
+def _world(solver_mode: str = "force") -> PiWorldSpec:
+    return PiWorldSpec(solver_mode=solver_mode, fields=[
+        {"field_type": "wind", "parameters": {"direction": [1, 0, 0], "strength": 0.5,
+                                              "bounds": {"origin": [-4, -4, -4], "size": [8, 8, 8]}}},
+        {"field_type": "attraction_well", "parameters": {"position": [0, 30, 0], "strength": 2.0, "radius": 40.0}},
+        # unbounded support: full scan on the soa spatial index (dist / inf clamps to the 1e-3 floor)
+        {"field_type": "attraction_well", "parameters": {"position": [1, 0, 0], "strength": 1e-7,
+                                                         "radius": float("inf")}},
+    ])
+
+def _bodies() -> List[PiBody]:
+    out = [PiBody("anchor", flags=["static"], position=(0, 0, 0)),
+           PiBody("ground", mass=0.0, position=(0, -5, 0))]
+    for i in range(8):
+        out.append(PiBody(f"b{i}", mass=1.0 + 0.25 * i, position=(i * 0.7 - 2.0, 1.0 + 0.1 * i, 0.3 * i),
+                          drag=0.05))
+    return out
+
+def _constraints() -> List[PiConstraint]:
+    ids = ["anchor"] + [f"b{i}" for i in range(8)]
+    return [PiConstraint(f"s{k}", "spring", a, b, {"rest_length": 1.0, "stiffness": 12.0, "damping": 0.4})
+            for k, (a, b) in enumerate(zip(ids, ids[1:]))]
+
+def _kernel(solver_mode: str = "force", **cfg: Any) -> PiKernel:
+    return PiKernel(_world(solver_mode), _bodies(), _constraints(), {}, PiKernelConfig(**cfg))
+
+def _drive(k: PiKernel, start: int, stop: int, flip: bool = False) -> List[str]:
+    out = []
+    for t in range(start, stop):
+        if t % 4 == 0:
+            k.enqueue_event(PiEvent("impulse", f"b{t % 8}", {"impulse": [0.5, 1.0, -0.25]}))
+        if flip and t == 12:
+            k._bodies_by_id["b3"].flags.append("static")
+        if flip and t == 24:
+            k._bodies_by_id["b3"].flags = []
+            k._bodies_by_id["b5"].mass = 4.0
+        out.append(k.tick_once().tick_hash)
+    return out
+
+def _baseline_chain(k: PiKernel, ticks: int) -> Tuple[List[str], List[str]]:
+    # json seal recomputed from the canonical snapshot after every tick
+    got, want = [], []
+    prev = k.prev_hash
+    for t in range(ticks):
+        if t % 4 == 0:
+            k.enqueue_event(PiEvent("impulse", f"b{t % 8}", {"impulse": [0.5, 1.0, -0.25]}))
+        epoch, tick = k.epoch, k.tick
+        got.append(k.tick_once().tick_hash)
+        prev = sha256_json({"prev": prev, "snap": canonical_state_snapshot(epoch, tick, k.bodies, k.constraints)})
+        want.append(prev)
+    return got, want
+
+def test_python_chain_matches_canonical_snapshot() -> None:
+    got, want = _baseline_chain(_kernel(), TICKS)
+    assert got == want
+
+@pytest.mark.parametrize("flip", [False, True])
+@pytest.mark.parametrize("solver_mode", ["force", "pbd"])
+def test_soa_matches_python(flip: bool, solver_mode: str) -> None:
+    pytest.importorskip("numpy")
+    ref = _drive(_kernel(solver_mode), 0, TICKS, flip)
+    assert _drive(_kernel(solver_mode, backend="soa"), 0, TICKS, flip) == ref
+    assert _drive(_kernel(solver_mode, backend="soa", spatial_index=False), 0, TICKS, flip) == ref
+
+def test_static_edit_stops_body_on_every_backend() -> None:
+    pytest.importorskip("numpy")
+    for cfg in ({}, {"backend": "soa"}, {"backend": "soa", "sleep": True}):
+        k = _kernel(**cfg)
+        _drive(k, 0, 5)
+        b = k._bodies_by_id["b6"]
+        b.flags.append("static")
+        pos = b.position
+        _drive(k, 5, 10)
+        assert b.position == pos, cfg
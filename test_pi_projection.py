@@ -0,0 +1,72 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+
+import pytest
+
+from pi_types import PiBody, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+
+def _kernel(**cfg: Any) -> PiKernel:
+    bodies = [PiBody("floor", flags=["static"])]
+    bodies += [PiBody(f"b{i}", position=(float(i), 0.0, 0.0)) for i in range(6)]
+    bodies += [PiBody(f"r{i}", position=(20.0 + i, 0.0, 0.0)) for i in range(3)]  # never pushed
+    return PiKernel(PiWorldSpec(gravity=(0.0, 0.0, 0.0)), bodies, [], {}, PiKernelConfig(**cfg))
+
+def _push(k: PiKernel, t: int) -> None:
+    if t % 3 == 0:
+        k.enqueue_event(PiEvent("impulse", f"b{t % 6}", {"impulse": [0.0, 0.05 * (t % 5), 0.0]}))
+
+BACKENDS = ["python", "soa"]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_deltas_merge_onto_keyframes(backend: str) -> None:
+    if backend == "soa":
+        pytest.importorskip("numpy")
+    full, delta = _kernel(backend=backend), _kernel(backend=backend, projection_mode="delta", keyframe_every=10)
+    view: Dict[str, Dict[str, Any]] = {}
+    for t in range(35):
+        _push(full, t)
+        _push(delta, t)
+        want = full.tick_once()
+        got = delta.tick_once()
+        assert got.tick_hash == want.tick_hash
+        proj = got.projection
+        assert proj.keyframe == (t % 10 == 0), t  # projected before the tick counter moves
+        if proj.keyframe:
+            view = {bid: dict(e) for bid, e in proj.bodies.items()}
+        else:
+            assert "r0" not in proj.bodies and "floor" not in proj.bodies
+            for bid, e in proj.bodies.items():
+                view[bid].update(e)
+        assert view == want.projection.bodies, t
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_epsilon_holds_back_small_moves(backend: str) -> None:
+    if backend == "soa":
+        pytest.importorskip("numpy")
+    k = _kernel(backend=backend, projection_mode="delta", projection_epsilon=0.5, keyframe_every=0)
+    k.enqueue_event(PiEvent("impulse", "b1", {"impulse": [0.0, 6.0, 0.0]}))
+    sent: List[float] = [k.tick_once().projection.bodies["b1"]["position"][1]]
+    for _ in range(60):
+        proj = k.tick_once().projection
+        assert not proj.keyframe
+        if "b1" in proj.bodies:
+            y = proj.bodies["b1"]["position"][1]
+            assert abs(y - sent[-1]) > 0.5
+            sent.append(y)
+    assert len(sent) > 2 and abs(k._bodies_by_id["b1"].position[1] - sent[-1]) <= 0.5
+
+def test_request_keyframe_and_full_projection() -> None:
+    k = _kernel(projection_mode="delta", keyframe_every=0)
+    k.tick_once()
+    assert not k.tick_once().projection.keyframe
+    assert k.full_projection().bodies.keys() == {b.id for b in k.bodies}
+    assert not k.tick_once().projection.keyframe  # full_projection leaves delta tracking alone
+    k.request_keyframe()
+    assert k.tick_once().projection.keyframe
+
+def test_none_mode_projects_nothing() -> None:
+    k = _kernel(projection_mode="none")
+    assert k.tick_once().projection.bodies == {}
+    with pytest.raises(ValueError):
+        _kernel(projection_mode="partial")
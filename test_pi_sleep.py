@@ -0,0 +1,61 @@
+from __future__ import annotations
+from typing import Any, List
+
+import pytest
+
+from pi_types import PiBody, PiConstraint, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+from pi_sleep import PiSleepManager
+
+def _bodies() -> List[PiBody]:
+    out = [PiBody("anchor", flags=["static"])]
+    out += [PiBody(f"a{i}", position=(float(i), 0.0, 0.0)) for i in range(3)]  # one island via springs
+    out += [PiBody(f"r{i}", position=(10.0 + i, 0.0, 0.0)) for i in range(2)]  # lone bodies
+    out.append(PiBody("m", position=(0.0, 5.0, 0.0), velocity=(1.0, 0.0, 0.0)))  # keeps moving
+    return out
+
+def _constraints() -> List[PiConstraint]:
+    return ([PiConstraint("hold", "spring", "anchor", "a0", {"rest_length": 0.0})]
+            + [PiConstraint(f"s{i}", "spring", f"a{i}", f"a{i + 1}", {"rest_length": 1.0}) for i in range(2)])
+
+def test_islands_follow_springs_but_not_static_anchors() -> None:
+    bodies = _bodies()
+    bodies.append(PiBody("a9", position=(0.0, 1.0, 0.0)))
+    sm = PiSleepManager(bodies, _constraints() + [PiConstraint("x", "spring", "anchor", "a9", {})], 5)
+    assert sm.island_of[0] == -1
+    assert sm.members[0] == [1, 2, 3]
+    assert len({sm.island_of[i] for i in range(1, len(bodies))}) == len(sm.members) == 5
+
+def _kernel(**cfg: Any) -> PiKernel:
+    world = PiWorldSpec(gravity=(0.0, 0.0, 0.0))
+    return PiKernel(world, _bodies(), _constraints(), {}, PiKernelConfig(sleep_ticks=5, **cfg))
+
+@pytest.mark.parametrize("backend", ["python", "soa"])
+def test_resting_islands_sleep_and_wake_as_a_unit(backend: str) -> None:
+    if backend == "soa":
+        pytest.importorskip("numpy")
+    k = _kernel(sleep=True, backend=backend)
+    for _ in range(8):
+        k.tick_once()
+    sm = k._sleep
+    rows = k._rows
+    assert sm.is_asleep(rows["a1"]) and sm.is_asleep(rows["r0"]) and not sm.is_asleep(rows["m"])
+
+    k.enqueue_event(PiEvent("impulse", "a2", {"impulse": [0.0, 1.0, 0.0]}))
+    k.tick_once()
+    assert not any(sm.is_asleep(rows[i]) for i in ("a0", "a1", "a2"))
+    assert sm.is_asleep(rows["r0"])
+    assert k._bodies_by_id["a2"].velocity[1] > 0.0
+
+    k.wake()
+    assert not any(sm.asleep)
+
+@pytest.mark.parametrize("backend", ["python", "soa"])
+def test_sleeping_bodies_at_rest_keep_the_chain(backend: str) -> None:
+    if backend == "soa":
+        pytest.importorskip("numpy")
+    chains = []
+    for sleep in (False, True):
+        k = _kernel(sleep=sleep, backend=backend)
+        chains.append([k.tick_once().tick_hash for _ in range(40)])
+    assert chains[0] == chains[1]
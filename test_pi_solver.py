@@ -0,0 +1,79 @@
+from __future__ import annotations
+import random
+from typing import Any, List
+
+import pytest
+
+from pi_types import PiBody, PiConstraint, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+from pi_constraints import PiSpringGraph, compile_springs, solve_compiled_springs
+from pi_fields import calc_attraction_well, calc_attraction_well_batch, parse_attraction_well
+
+# The PiBody path keeps the reference arithmetic (x ** 0.5, nd ** power); numpy paths must reproduce it.
+
+def _random_bodies(n: int, seed: int) -> List[PiBody]:
+    rnd = random.Random(seed)
+    return [PiBody(f"b{i}", mass=rnd.uniform(0.5, 3.0),
+                   position=tuple(rnd.uniform(-6.0, 6.0) for _ in range(3)),
+                   velocity=tuple(rnd.uniform(-2.0, 2.0) for _ in range(3)),
+                   flags=["static"] if i % 17 == 0 else [])
+            for i in range(n)]
+
+def test_pow_array_matches_scalar_pow() -> None:
+    np = pytest.importorskip("numpy")
+    from pi_soa import pow_array
+    x = np.random.default_rng(5).random(20000) * 50.0
+    for power in (0.5, 1.0, 1.5, 2.0, 3.0):
+        assert pow_array(x, power).tolist() == [v ** power for v in x.tolist()]
+
+@pytest.mark.parametrize("power", [1.0, 1.5, 2.0, 3.0])
+def test_batch_well_matches_per_body(power: float) -> None:
+    pytest.importorskip("numpy")
+    from pi_soa import PiBodyArrays
+    bodies = [b for b in _random_bodies(2000, 11) if not b.is_static()]
+    params = {"position": [0.5, -0.25, 1.0], "strength": 2.5, "radius": 7.0, "falloff_power": power}
+    got = calc_attraction_well_batch(parse_attraction_well(params), PiBodyArrays(bodies)).tolist()
+    assert [tuple(r) for r in got] == [calc_attraction_well(params, b) for b in bodies]
+
+def test_spring_graph_matches_per_body() -> None:
+    pytest.importorskip("numpy")
+    from pi_soa import PiBodyArrays
+    rnd = random.Random(3)
+    bodies = _random_bodies(400, 3)
+    constraints = [PiConstraint(f"s{k}", "spring", f"b{rnd.randrange(400)}", f"b{rnd.randrange(400)}",
+                                {"rest_length": rnd.uniform(0.5, 2.0), "stiffness": 20.0, "damping": 0.5})
+                   for k in range(1200)]
+    arrays = PiBodyArrays(bodies)
+    PiSpringGraph(arrays, constraints).apply(arrays)
+    solve_compiled_springs(compile_springs({b.id: b for b in bodies}, constraints))
+    assert [tuple(r) for r in arrays.force.tolist()] == [b.force for b in bodies]
+
+def _chain_kernel(solver_mode: str, substeps: int = 1, **cfg: Any) -> PiKernel:
+    world = PiWorldSpec(gravity=(0.0, -9.81, 0.0), substeps=substeps, solver_mode=solver_mode)
+    bodies = [PiBody("p0", flags=["static"])] + [PiBody(f"p{i}", position=(float(i), 0.0, 0.0)) for i in range(1, 21)]
+    constraints = [PiConstraint(f"c{i}", "spring", f"p{i - 1}", f"p{i}",
+                                {"rest_length": 1.0, "stiffness": 1e5, "damping": 1.0}) for i in range(1, 21)]
+    return PiKernel(world, bodies, constraints, {}, PiKernelConfig(**cfg))
+
+def _run(k: PiKernel, ticks: int) -> List[str]:
+    return [k.tick_once().tick_hash for _ in range(ticks)]
+
+def test_pbd_holds_stiff_chain_where_force_mode_diverges() -> None:
+    pbd = _chain_kernel("pbd")
+    _run(pbd, 120)
+    tip = pbd._bodies_by_id["p20"].position
+    assert all(abs(v) < 25.0 for v in tip)
+
+    force = _chain_kernel("force")
+    _run(force, 120)
+    tip = force._bodies_by_id["p20"].position
+    assert not all(abs(v) < 25.0 for v in tip)
+
+def test_pbd_chain_is_backend_independent() -> None:
+    pytest.importorskip("numpy")
+    ref = _run(_chain_kernel("pbd", substeps=2), 60)
+    assert _run(_chain_kernel("pbd", substeps=2, backend="soa"), 60) == ref
+
+def test_unknown_solver_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        _chain_kernel("implicit")
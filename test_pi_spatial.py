@@ -0,0 +1,64 @@
+from __future__ import annotations
+import random
+from typing import Any, List
+
+import pytest
+
+from pi_types import PiBody, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+
+np = pytest.importorskip("numpy")
+
+from pi_spatial import PiSpatialGrid  # noqa: E402
+
+def test_query_is_a_superset_of_the_support() -> None:
+    rnd = np.random.default_rng(4)
+    pos = rnd.uniform(-20.0, 20.0, size=(3000, 3))
+    pos[7] = (np.nan, 0.0, 0.0)
+    grid = PiSpatialGrid(2.5, list(range(3000)))
+    grid.update(pos)
+    pos[:50] += 3.0  # incremental re-bucket
+    grid.update(pos)
+    lo, hi = (-3.0, 1.0, -2.0), (2.0, 4.0, 3.0)
+    got = set(grid.query_aabb(lo, hi).tolist())
+    inside = ((pos >= lo) & (pos <= hi)).all(axis=1)
+    assert set(np.flatnonzero(inside).tolist()) <= got and 7 in got
+    assert grid.query_aabb((0.0, 0.0, 0.0), (float("inf"), 1.0, 1.0)) is None
+
+def _world() -> PiWorldSpec:
+    rnd = random.Random(1)
+    fields: List[Any] = [{"field_type": "attraction_well", "parameters": {
+        "position": [rnd.uniform(-12.0, 12.0) for _ in range(3)], "strength": 0.2, "radius": 3.0, "falloff_power": 1.0}}
+        for _ in range(12)]
+    fields.append({"field_type": "wind", "parameters": {"direction": [1, 0, 0], "strength": 0.3,
+                                                        "bounds": {"origin": [-4, -4, -4], "size": [8, 8, 8]}}})
+    fields.append({"field_type": "attraction_well", "parameters": {"position": [0, 0, 0], "strength": 1e-6,
+                                                                   "radius": float("inf")}})
+    return PiWorldSpec(gravity=(0.0, -1.0, 0.0), fields=fields)
+
+def _bodies() -> List[PiBody]:
+    rnd = random.Random(2)
+    return [PiBody(f"b{i}", position=tuple(rnd.uniform(-12.0, 12.0) for _ in range(3)),
+                   flags=["static"] if i % 11 == 0 else [])
+            for i in range(300)]
+
+def _chain(**cfg: Any) -> List[str]:
+    k = PiKernel(_world(), _bodies(), [], {}, PiKernelConfig(**cfg))
+    out = []
+    for t in range(30):
+        if t % 5 == 0:
+            k.enqueue_event(PiEvent("impulse", f"b{t}", {"impulse": [2.0, 0.5, -1.0]}))
+        out.append(k.tick_once().tick_hash)
+    return out
+
+@pytest.mark.parametrize("cfg", [{}, {"sleep": True}, {"backend": "soa"}, {"backend": "soa", "sleep": True}])
+def test_grid_leaves_the_chain_unchanged(cfg: Any) -> None:
+    assert _chain(spatial_index=True, **cfg) == _chain(spatial_index=False, **cfg)
+
+def test_python_path_uses_the_grid() -> None:
+    k = PiKernel(_world(), _bodies(), [], {}, PiKernelConfig())
+    k.tick_once()
+    assert k._grid is not None and len(k._grid.rows) == len(k.bodies)
+    k = PiKernel(_world(), _bodies(), [], {}, PiKernelConfig(spatial_index=False))
+    k.tick_once()
+    assert k._grid is None
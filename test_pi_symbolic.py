@@ -0,0 +1,83 @@
+from __future__ import annotations
+import itertools, random
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from pi_types import PiEvent
+from pi_symbolic import PiSymbolicIndex, extract_symbolic_intents, iter_nodes
+
+def _key(evs: List[PiEvent]) -> List[Tuple[Any, ...]]:
+    return [(e.type, e.target, e.payload["href"]) for e in evs]
+
+def _scan(node: Any, out: List[PiEvent]) -> List[PiEvent]:
+    # the original recursive walk, as the reference
+    if isinstance(node, dict):
+        if node.get("⟁role") == "ui.action" and node.get("@href"):
+            out.append(PiEvent("route_intent", node.get("⟁id"), {"href": node["@href"]}))
+        for ch in node.get("⟁children", []) or []:
+            _scan(ch, out)
+    return out
+
+_ids = itertools.count()
+
+def _node(rnd: random.Random, depth: int) -> Dict[str, Any]:
+    n = next(_ids)
+    node: Dict[str, Any] = {"⟁node": "div", "⟁id": f"n{n}"}
+    if rnd.random() < 0.4:
+        node.update({"⟁role": "ui.action", "@href": f"/p{n}"})
+    if depth:
+        node["⟁children"] = [_node(rnd, depth - 1) for _ in range(rnd.randrange(3))] + ["text"]
+    return node
+
+def test_matches_recursive_scan_under_random_edits() -> None:
+    rnd = random.Random(4)
+    tree = _node(rnd, 5)
+    idx = PiSymbolicIndex(tree)
+    live = _key(idx.intents())
+    for _ in range(300):
+        ids = [n["⟁id"] for n in iter_nodes(tree)]
+        target = rnd.choice(ids)
+        op = rnd.randrange(4)
+        if op == 0:
+            added, removed = idx.insert(target, _node(rnd, 2), rnd.choice([None, 0]))
+        elif op == 1 and target != tree["⟁id"]:
+            added, removed = idx.remove(target)
+        elif op == 2:
+            added, removed = idx.replace(target, _node(rnd, 2))
+        else:
+            node = idx.get(target)
+            node["@href"] = None if node.get("@href") else "/edited"
+            node["⟁role"] = "ui.action"
+            added, removed = idx.refresh(target)
+        want = _key(_scan(tree, []))
+        assert _key(idx.intents()) == want == _key(extract_symbolic_intents(tree))
+        # returned deltas keep a consumer's multiset current
+        for k in _key(removed):
+            live.remove(k)
+        live += _key(added)
+        assert sorted(live) == sorted(want)
+        assert set(idx.nodes) == {n["⟁id"] for n in iter_nodes(tree)}
+
+def test_deep_tree_does_not_recurse() -> None:
+    tree: Dict[str, Any] = {"⟁id": "root"}
+    node = tree
+    for i in range(20000):
+        child = {"⟁id": f"d{i}", "⟁role": "ui.action", "@href": f"/{i}"} if i % 1000 == 0 else {"⟁id": f"d{i}"}
+        node["⟁children"] = [child]
+        node = child
+    idx = PiSymbolicIndex(tree)
+    assert len(idx.intents()) == 20
+    added, removed = idx.remove("d10000")
+    assert not added and len(removed) == 10 and len(idx.intents()) == 10
+
+def test_root_edits_and_unknown_ids() -> None:
+    tree = {"⟁id": "root", "⟁children": [{"⟁id": "a", "⟁role": "ui.action", "@href": "/a"}]}
+    idx = PiSymbolicIndex(tree)
+    with pytest.raises(ValueError):
+        idx.remove("root")
+    with pytest.raises(ValueError):
+        idx.insert("missing", {"⟁id": "x"})
+    added, removed = idx.replace("root", {"⟁id": "root2", "⟁role": "ui.action", "@href": "/r"})
+    assert idx.tree is tree and _key(added) == [("route_intent", "root2", "/r")]
+    assert _key(removed) == [("route_intent", "a", "/a")] and set(idx.nodes) == {"root2"}
@@ -0,0 +1,94 @@
+from __future__ import annotations
+import copy, pickle
+from dataclasses import asdict, fields, is_dataclass, replace
+from typing import Any, Callable, List
+
+import pytest
+
+from pi_types import PiBody, PiBodyEdits, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+
+def test_body_is_a_slotted_dataclass() -> None:
+    b = PiBody("a", 2.0, flags=["x"])
+    assert is_dataclass(b) and not hasattr(b, "__dict__")
+    assert [f.name for f in fields(PiBody)] == [
+        "id", "mass", "position", "velocity", "rotation", "shape", "size", "friction", "restitution",
+        "drag", "flags", "role", "bind_dom", "dom_key", "force"]
+    assert asdict(b)["flags"] == ["x"] and asdict(b)["mass"] == 2.0
+    assert replace(b, mass=0.0).is_static() and not b.is_static()
+    assert PiBody("a", 2.0, flags=["x"]) == b
+
+def test_ids_and_flag_tuples_are_interned() -> None:
+    a, b = PiBody("".join(["bo", "dy"]), flags=["x", "y"]), PiBody("body", flags=["x", "y"])
+    assert a.id is b.id
+    assert a.flag_names is b.flag_names
+
+@pytest.mark.parametrize("edit", [
+    lambda f: f.append("static"),
+    lambda f: f.extend(["static"]),
+    lambda f: f.insert(0, "static"),
+    lambda f: f.__setitem__(0, "static"),
+    lambda f: f.__setitem__(slice(0, 1), ["static"]),
+    lambda f: f.__iadd__(["static"]),
+])
+def test_in_place_flag_edits_make_static(edit: Callable[[List[str]], Any]) -> None:
+    b = PiBody("a", flags=["x"])
+    edit(b.flags)
+    assert b.is_static() and b.has_flag("static") and "static" in b.flags
+
+@pytest.mark.parametrize("edit", [
+    lambda f: f.remove("static"),
+    lambda f: f.pop(),
+    lambda f: f.clear(),
+    lambda f: f.__delitem__(-1),
+    lambda f: f.__imul__(0),
+])
+def test_in_place_flag_edits_clear_static(edit: Callable[[List[str]], Any]) -> None:
+    b = PiBody("a", flags=["x", "static"])
+    edit(b.flags)
+    assert not b.is_static() and not b.has_flag("static")
+
+def test_order_edits_write_back() -> None:
+    b = PiBody("a", flags=["b", "a"])
+    b.flags.sort()
+    assert b.flags == ["a", "b"]
+    b.flags.reverse()
+    assert b.flags == ["b", "a"]
+
+def test_mass_edits_toggle_static() -> None:
+    b = PiBody("a")
+    b.mass = 0.0
+    assert b.is_static()
+    b.mass = 1.5
+    assert not b.is_static()
+
+def test_copies_are_plain_and_unowned() -> None:
+    b = PiBody("a", 3.0, flags=["x"])
+    edits = PiBodyEdits([b])
+    for c in (copy.copy(b), copy.deepcopy(b), pickle.loads(pickle.dumps(b))):
+        assert c == b and c._edits is None
+        c.mass = 1.0
+    assert not edits.pending
+    assert type(pickle.loads(pickle.dumps(b.flags))) is list
+
+def test_edits_are_logged_once_per_body() -> None:
+    a, b = PiBody("a"), PiBody("b")
+    edits = PiBodyEdits([a, b])
+    a.mass = 2.0
+    a.flags.append("x")
+    assert edits.version == 2 and edits.static_version == 0
+    b.flags = ["static"]
+    assert edits.static_version == 1
+    assert edits.drain() == [a, b] and not edits.pending
+
+def _kernel() -> PiKernel:
+    return PiKernel(PiWorldSpec(), [PiBody(f"b{i}", position=(float(i), 0.0, 0.0)) for i in range(4)],
+                    [], {}, PiKernelConfig())
+
+def test_static_version_is_per_kernel() -> None:
+    k1, k2 = _kernel(), _kernel()
+    k1._bodies_by_id["b1"].flags.append("static")
+    assert k1.body_edits.pending and not k2.body_edits.pending
+    k1.tick_once()
+    assert not k1.body_edits.pending and k1._static == [False, True, False, False]
+    assert k2._static == [False] * 4
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import json
+from typing import Any, Callable, Dict
+
+import pytest
+
+from pi_types import PiBody, PiConstraint, PiEvent, PiKernelConfig, PiWorldSpec
+from pi_kernel import PiKernel
+from pi_verify import PiSessionRecorder, verify_session
+
+def _kernel(**cfg: Any) -> PiKernel:
+    world = PiWorldSpec(fields=[
+        {"field_type": "attraction_well", "parameters": {"position": [0, 10, 0], "strength": 1.0, "radius": 30.0}}])
+    bodies = [PiBody("anchor", flags=["static"])] + [PiBody(f"b{i}", position=(i, 1.0, 0.0)) for i in range(5)]
+    constraints = [PiConstraint(f"s{i}", "spring", f"b{i}", f"b{i + 1}", {"rest_length": 1.0}) for i in range(4)]
+    return PiKernel(world, bodies, constraints, {}, PiKernelConfig(**cfg))
+
+def _record(path: str, ticks: int = 35, **cfg: Any) -> None:
+    k = _kernel(**cfg)
+    rec = PiSessionRecorder(k, path, checkpoint_every=10)
+    for t in range(ticks):
+        if t % 6 == 0:
+            rec.enqueue_event(PiEvent("impulse", f"b{t % 5}", {"impulse": [0.2, 0.5, 0.0]}))
+        if t % 9 == 4:
+            rec.enqueue_actions([{"target": "b3", "action": {"type": "attract", "direction": [0, 1, 0]}}])
+        if t == 7:
+            k._bodies_by_id["b2"].flags.append("static")  # host edits straight on the bodies
+            rec.enqueue_event(PiEvent("impulse", "b2", {"impulse": [5.0, 0.0, 0.0]}))  # dropped: b2 is static now
+        if t == 16:
+            k._bodies_by_id["b4"].mass = 3
+        if t == 23:
+            k._bodies_by_id["b2"].flags = ["tagged"]
+        rec.tick_once()
+    rec.close()
+
+def _rewrite(path: str, edit: Callable[[Dict[str, Any]], bool]) -> None:
+    with open(path, encoding="utf-8") as f:
+        recs = [json.loads(line) for line in f]
+    with open(path, "w", encoding="utf-8") as f:
+        for r in recs:
+            if edit(r):
+                f.write(json.dumps(r) + "\n")
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("cfg", [{}, {"seal_mode": "merkle", "hash_encoding": "binary"}])
+def test_recorded_session_verifies(tmp_path: Any, workers: int, cfg: Any) -> None:
+    path = str(tmp_path / "s.ndjson")
+    _record(path, **cfg)
+    rep = verify_session(path, workers)
+    assert rep.ok and rep.ticks == 35 and rep.segments == 4 and rep.missing == 0, rep.detail
+
+def test_host_edits_are_session_inputs(tmp_path: Any) -> None:
+    path = str(tmp_path / "s.ndjson")
+    _record(path)
+    with open(path, encoding="utf-8") as f:
+        edits = [i for line in f for i in json.loads(line).get("inputs", []) if i[0] == "body"]
+    assert edits == [["body", "b2", 1.0, ["static"]], ["body", "b4", 3, []], ["body", "b2", 1.0, ["tagged"]]]
+
+    def drop_edits(r: Dict[str, Any]) -> bool:
+        if r["kind"] == "input":
+            r["inputs"] = [i for i in r["inputs"] if i[0] != "body"]
+        return True
+
+    _rewrite(path, drop_edits)
+    rep = verify_session(path, 1)
+    assert not rep.ok and rep.divergent_tick == 8
+
+def test_tampered_or_missing_hashes_fail(tmp_path: Any) -> None:
+    path = str(tmp_path / "s.ndjson")
+    _record(path)
+
+    def tamper(r: Dict[str, Any]) -> bool:
+        if r["kind"] == "tick" and r["tick"] == 14:
+            r["hash"] = "0" * 64
+        return not (r["kind"] == "tick" and r["tick"] == 27)
+
+    _rewrite(path, tamper)
+    rep = verify_session(path, 2)
+    assert not rep.ok and rep.divergent_tick == 14 and rep.missing == 1